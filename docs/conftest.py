@@ -1,13 +1,14 @@
 from os import chdir, getcwd
 from pathlib import Path
-from typing import Dict, Iterator, List, Optional, Tuple, cast
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple, cast
 
 import pytest
 from requests_mock import Mocker
 
 from sdkite import Client
-from sdkite.http import HTTPRequest, HTTPResponse
+from sdkite.http import HTTPAsyncResponse, HTTPHeaderDict, HTTPRequest, HTTPResponse
 import sdkite.http.adapter as adapter_module
+from sdkite.http.engine_requests import HTTPEngineRequests
 
 
 @pytest.fixture(scope="module", autouse=True)
@@ -118,6 +119,24 @@ def _patch_http(requests_mock: Mocker) -> None:
         "https://api.example.com/user/2",
         json={"name": "Bob"},
     )
+    requests_mock.register_uri(
+        "GET",
+        "https://api.example.com/user/404",
+        status_code=404,
+    )
+    requests_mock.register_uri(
+        "GET",
+        "https://api.example.com/users",
+        json={"data": {"users": [{"name": "Alice", "age": 42}, {"name": "Bob"}]}},
+    )
+    requests_mock.register_uri(
+        "GET",
+        "https://api.example.com/events",
+        text=(
+            '{"type": "login", "name": "Alice"}\n'
+            '{"type": "logout", "name": "Alice"}\n'
+        ),
+    )
 
 
 @pytest.fixture(autouse=True)
@@ -153,8 +172,59 @@ def _change_directory(tmp_path: Path) -> Iterator[None]:
         chdir(cwd)
 
 
+class _MockedAsyncResponse(HTTPAsyncResponse):
+    def __init__(self, response: HTTPResponse) -> None:
+        self._response = response
+
+    @property
+    def raw(self) -> object:
+        return self._response.raw
+
+    @property
+    def status_code(self) -> int:
+        return self._response.status_code
+
+    @property
+    def reason(self) -> str:
+        return self._response.reason
+
+    @property
+    def headers(self) -> HTTPHeaderDict:
+        return self._response.headers
+
+    @property
+    def data_stream(self) -> AsyncIterator[bytes]:
+        async def stream() -> AsyncIterator[bytes]:
+            for chunk in self._response.data_stream:
+                yield chunk
+
+        return stream()
+
+    async def data_bytes(self) -> bytes:
+        return self._response.data_bytes
+
+    async def data_str(self) -> str:
+        return self._response.data_str
+
+    async def data_json(self) -> object:
+        return self._response.data_json
+
+
+class _MockedAsyncEngine:
+    # use the requests engine, which is mocked with requests_mock
+    def __init__(self) -> None:
+        self._engine = HTTPEngineRequests()
+
+    async def __call__(self, request: HTTPRequest) -> HTTPAsyncResponse:
+        return _MockedAsyncResponse(self._engine(request))
+
+
 @pytest.fixture(autouse=True)
 def _patched_adapter(monkeypatch: pytest.MonkeyPatch) -> None:
     # change default value for faster tests
     monkeypatch.setattr(adapter_module, "_DEFAULT_WAIT_INITIAL", 0)
     monkeypatch.setattr(adapter_module, "_DEFAULT_WAIT_JITTER", 0)
+    # no network access
+    monkeypatch.setattr(
+        adapter_module, "_create_default_async_engine", _MockedAsyncEngine
+    )
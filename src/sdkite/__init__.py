@@ -1,7 +1,12 @@
+from typing import TYPE_CHECKING, Any
+
 from sdkite.adapter import Adapter, AdapterSpec
 from sdkite.client import Client
 from sdkite.exceptions import SDKiteError
-from sdkite.pagination import Pagination, paginated
+
+if TYPE_CHECKING:  # pragma: no cover
+    # imported on first access, see __getattr__ below
+    from sdkite.pagination import Pagination, paginated  # noqa: TCH004
 
 try:
     from sdkite._version import __version__
@@ -23,3 +28,14 @@ __all__ = (
     "Pagination",
     "paginated",
 )
+
+
+def __getattr__(name: str) -> Any:
+    # rarely used names are imported on first access, to reduce the import time
+    if name in ("Pagination", "paginated"):
+        from sdkite import pagination  # pylint: disable=import-outside-toplevel
+
+        value = getattr(pagination, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
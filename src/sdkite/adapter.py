@@ -12,11 +12,11 @@ from typing import (
     TypeVar,
     Union,
     cast,
-    get_type_hints,
     overload,
 )
 
 from sdkite.client import Client
+from sdkite.utils import LockResetAfterFork
 
 if sys.version_info < (3, 11):  # pragma: no cover
     from typing_extensions import Self
@@ -26,6 +26,42 @@ else:  # pragma: no cover
 A = TypeVar("A")
 
 
+class _AdapterCreation(LockResetAfterFork):
+    # serialize the creation of adapters (rare) so that each real adapter is only
+    # created once, even when first used from several threads at the same time
+    _lock_reentrant = True
+
+    def __init__(self) -> None:
+        self._init_lock()
+
+    def __enter__(self) -> None:
+        self._lock.acquire()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._lock.release()
+
+
+_adapter_creation = _AdapterCreation()
+
+
+# walking the class hierarchy is slow, so it is only done once per adapter class
+_public_attr_names_cache: Dict[type, Tuple[str, ...]] = {}
+
+
+def _public_attr_names(klass: type) -> Tuple[str, ...]:
+    try:
+        return _public_attr_names_cache[klass]
+    except KeyError:
+        # only the names of the annotations are needed: they are not evaluated, as
+        # they may refer to types which are only imported when type checking
+        annotations: Dict[str, object] = {}
+        for base in reversed(klass.__mro__):
+            annotations.update(base.__dict__.get("__annotations__", {}))
+        names = tuple(name for name in annotations if not name.startswith("_"))
+        _public_attr_names_cache[klass] = names
+        return names
+
+
 class Adapter:
     _attr_name: str
     _clients: Tuple[Client, ...]
@@ -37,6 +73,11 @@ class Adapter:
     def _from_adapter_hierarchy(self, attr_name: str, *values: Any) -> Tuple[Any, ...]:
         return tuple(getattr(adapter, attr_name) for adapter in self._adapters) + values
 
+    def warmup(self, connections: int = 1) -> None:
+        """
+        Prepare the adapter to be used, e.g. by opening connections in advance.
+        """
+
 
 def create_adapter_proxy(
     adapter: A,
@@ -111,8 +152,15 @@ class AdapterSpec(Generic[A], ABC):
 
         # in cache
         adapter: Optional[A] = getattr(client, _attr_name_adapter, None)
+        if adapter is not None:
+            return adapter
+
+        with _adapter_creation:
+            # check again: may have been created by another thread in the meantime
+            adapter = cast(Optional[A], getattr(client, _attr_name_adapter, None))
+            if adapter is not None:
+                return adapter
 
-        if adapter is None:
             # walk up clients chain
             current_client = client
             last_descriptor_type: Optional[Type[AdapterSpec[Any]]] = None
@@ -169,8 +217,7 @@ class AdapterSpec(Generic[A], ABC):
                     tuple(clients),
                     {
                         attr_name: deepcopy(getattr(self, attr_name))
-                        for attr_name in get_type_hints(real_adapter.__class__)
-                        if not attr_name.startswith("_")
+                        for attr_name in _public_attr_names(real_adapter.__class__)
                     },
                 )
                 adapter = cast(A, adapter_proxy)
@@ -25,3 +25,22 @@ class Client:
                     ) from ex
                 client._parent = self  # noqa: SLF001
                 setattr(self, attr_name, client)
+
+    def warmup(self, connections: int = 1) -> None:
+        """
+        Prepare the adapters of the client and of its sub-clients to be used.
+
+        For HTTP adapters, up to 'connections' connections are opened to their URL.
+        """
+        cls = type(self)
+        for attr_name in dir(cls):
+            # adapter specs (not imported here to avoid a circular import) are returned
+            # as is when accessed on the class
+            if hasattr(getattr(cls, attr_name, None), "_create_adapter"):
+                warmup = getattr(getattr(self, attr_name), "warmup", None)
+                if warmup is not None:
+                    warmup(connections)
+        for value in vars(self).values():
+            # pylint: disable-next=protected-access
+            if isinstance(value, Client) and value._parent is self:  # noqa: SLF001
+                value.warmup(connections)
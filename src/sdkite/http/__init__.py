@@ -1,13 +1,26 @@
-from sdkite.http.adapter import HTTPAdapter, HTTPAdapterSendRequest, HTTPAdapterSpec
+from typing import TYPE_CHECKING, Any
+
+from sdkite.http.adapter import (
+    HTTPAdapter,
+    HTTPAdapterAsyncSendRequest,
+    HTTPAdapterSendRequest,
+    HTTPAdapterSpec,
+)
 from sdkite.http.auth import BasicAuth, NoAuth
 from sdkite.http.exceptions import (
+    HTTPBulkheadFullError,
+    HTTPCircuitOpenError,
+    HTTPConcurrencyLimitError,
     HTTPConnectionError,
     HTTPContextError,
+    HTTPDataTooLargeError,
     HTTPError,
     HTTPStatusCodeError,
     HTTPTimeoutError,
 )
 from sdkite.http.model import (
+    HTTPAsyncResponse,
+    HTTPBatchResult,
     HTTPBodyEncoding,
     HTTPHeaderDict,
     HTTPRequest,
@@ -15,24 +28,83 @@ from sdkite.http.model import (
     HTTPResponse,
 )
 
+if TYPE_CHECKING:  # pragma: no cover
+    # imported on first access, see __getattr__ below
+    from sdkite.http.circuit import HTTPCircuitBreaker, HTTPCircuitState  # noqa: TCH004
+    from sdkite.http.concurrency import (
+        HTTPBulkhead,  # noqa: TCH004
+        HTTPConcurrencyLimiter,  # noqa: TCH004
+        HTTPConcurrencyStats,  # noqa: TCH004
+    )
+    from sdkite.http.hedging import HTTPHedging, HTTPHedgingStats  # noqa: TCH004
+    from sdkite.http.ratelimit import HTTPRateLimiter  # noqa: TCH004
+    from sdkite.http.retrybudget import HTTPRetryBudget  # noqa: TCH004
+
 __all__ = (
     # sdkite.http.adapter
     "HTTPAdapter",
+    "HTTPAdapterAsyncSendRequest",
     "HTTPAdapterSendRequest",
     "HTTPAdapterSpec",
     # sdkite.http.auth
     "BasicAuth",
     "NoAuth",
+    # sdkite.http.circuit
+    "HTTPCircuitBreaker",
+    "HTTPCircuitState",
+    # sdkite.http.concurrency
+    "HTTPBulkhead",
+    "HTTPConcurrencyLimiter",
+    "HTTPConcurrencyStats",
     # sdkite.http.exceptions
+    "HTTPBulkheadFullError",
+    "HTTPCircuitOpenError",
+    "HTTPConcurrencyLimitError",
     "HTTPConnectionError",
     "HTTPContextError",
+    "HTTPDataTooLargeError",
     "HTTPError",
     "HTTPStatusCodeError",
     "HTTPTimeoutError",
+    # sdkite.http.hedging
+    "HTTPHedging",
+    "HTTPHedgingStats",
     # sdkite.http.model
+    "HTTPAsyncResponse",
+    "HTTPBatchResult",
     "HTTPBodyEncoding",
     "HTTPHeaderDict",
     "HTTPRequest",
     "HTTPRequestAttemptInfo",
     "HTTPResponse",
+    # sdkite.http.ratelimit
+    "HTTPRateLimiter",
+    # sdkite.http.retrybudget
+    "HTTPRetryBudget",
 )
+
+
+# modules of the rarely used names, imported on first access
+_lazy_names = {
+    "HTTPCircuitBreaker": "circuit",
+    "HTTPCircuitState": "circuit",
+    "HTTPBulkhead": "concurrency",
+    "HTTPConcurrencyLimiter": "concurrency",
+    "HTTPConcurrencyStats": "concurrency",
+    "HTTPHedging": "hedging",
+    "HTTPHedgingStats": "hedging",
+    "HTTPRateLimiter": "ratelimit",
+    "HTTPRetryBudget": "retrybudget",
+}
+
+
+def __getattr__(name: str) -> Any:
+    # rarely used names are imported on first access, to reduce the import time
+    if name in _lazy_names:
+        from importlib import import_module  # pylint: disable=import-outside-toplevel
+
+        module = import_module(f"{__name__}.{_lazy_names[name]}")
+        value = getattr(module, name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
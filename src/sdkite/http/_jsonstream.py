@@ -0,0 +1,156 @@
+import json
+import re
+import sys
+
+if sys.version_info < (3, 9):  # pragma: no cover
+    from typing import Iterable, Iterator, Sequence
+else:  # pragma: no cover
+    from collections.abc import Iterable, Iterator, Sequence
+
+# incremental decoding of the items of a JSON array
+#
+# the stream is only scanned to find the boundaries of each array item;
+# each item is then decoded on its own with the json module,
+# so that memory usage is bounded by the size of the largest item
+
+_WHITESPACES = re.compile(rb"[ \t\n\r]*")
+_STRING_SPECIAL = re.compile(rb'["\\]')
+_CONTAINER_SPECIAL = re.compile(rb'["{}\[\]]')
+_SCALAR_END = re.compile(rb"[,\]} \t\n\r]")
+
+# drop consumed data from the buffer once it gets bigger than this
+_COMPACT_THRESHOLD = 64 * 1024
+
+
+class _Reader:
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._buf = bytearray()
+        self._pos = 0
+
+    def _fill(self) -> bool:
+        for chunk in self._chunks:
+            if chunk:
+                self._buf += chunk
+                return True
+        return False
+
+    def _fill_or_fail(self) -> None:
+        if not self._fill():
+            raise ValueError("Unexpected end of JSON data")
+
+    def _compact(self) -> None:
+        if self._pos > _COMPACT_THRESHOLD and self._pos * 2 > len(self._buf):
+            del self._buf[: self._pos]
+            self._pos = 0
+
+    def peek(self) -> int:
+        while True:
+            match = _WHITESPACES.match(self._buf, self._pos)
+            self._pos = match.end()  # type: ignore[union-attr]
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            self._fill_or_fail()
+
+    def expect(self, char: bytes) -> None:
+        if self.peek() != ord(char):
+            found = chr(self._buf[self._pos])
+            raise ValueError(f"Expected {char.decode()!r} in JSON data, got {found!r}")
+        self._pos += 1
+
+    def _scan_string(self, i: int) -> int:
+        # i is the position right after the opening quote
+        while True:
+            match = _STRING_SPECIAL.search(self._buf, i)
+            if match is None:
+                i = len(self._buf)
+                self._fill_or_fail()
+                continue
+            i = match.end()
+            if match.group() == b'"':
+                return i
+            # skip escaped character
+            i += 1
+            while i > len(self._buf):
+                self._fill_or_fail()
+
+    def _scan_container(self, i: int) -> int:
+        # i is the position of the opening bracket
+        depth = 0
+        while True:
+            match = _CONTAINER_SPECIAL.search(self._buf, i)
+            if match is None:
+                i = len(self._buf)
+                self._fill_or_fail()
+                continue
+            i = match.end()
+            char = match.group()
+            if char == b'"':
+                i = self._scan_string(i)
+            elif char in b"{[":
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return i
+
+    def _scan_scalar(self, i: int) -> int:
+        while True:
+            match = _SCALAR_END.search(self._buf, i)
+            if match is not None:
+                return match.start()
+            i = len(self._buf)
+            if not self._fill():
+                return i
+
+    def read_raw_value(self) -> bytearray:
+        self._compact()
+        char = self.peek()
+        start = self._pos
+        if char == ord('"'):
+            end = self._scan_string(start + 1)
+        elif char in b"{[":
+            end = self._scan_container(start)
+        else:
+            end = self._scan_scalar(start)
+        self._pos = end
+        return self._buf[start:end]
+
+    def read_value(self) -> object:
+        return json.loads(self.read_raw_value())
+
+    def read_key(self) -> object:
+        if self.peek() != ord('"'):
+            found = chr(self._buf[self._pos])
+            raise ValueError(f"Expected object key in JSON data, got {found!r}")
+        key = self.read_value()
+        self.expect(b":")
+        return key
+
+
+def iter_json_items(chunks: Iterable[bytes], path: Sequence[str]) -> Iterator[object]:
+    reader = _Reader(chunks)
+
+    # walk to the array
+    for depth, key in enumerate(path):
+        reader.expect(b"{")
+        while True:
+            if reader.peek() == ord("}"):
+                raise ValueError(
+                    f"Key {'.'.join(path[: depth + 1])!r} not found in JSON data"
+                )
+            if reader.read_key() == key:
+                break
+            reader.read_raw_value()  # skip value
+            if reader.peek() != ord("}"):
+                reader.expect(b",")
+
+    # yield array items
+    reader.expect(b"[")
+    if reader.peek() == ord("]"):
+        return
+    while True:
+        yield reader.read_value()
+        if reader.peek() == ord("]"):
+            return
+        reader.expect(b",")
@@ -0,0 +1,191 @@
+from dataclasses import dataclass, field, replace
+import sys
+from time import monotonic, time
+from typing import TYPE_CHECKING, Optional, Tuple, Union
+
+from sdkite.http.exceptions import (
+    HTTPConnectionError,
+    HTTPStatusCodeError,
+    HTTPTimeoutError,
+)
+from sdkite.http.model import HTTPRequest, HTTPRequestAttemptInfo
+from sdkite.http.utils import build_status_code_check
+from sdkite.utils import last_not_none
+
+if TYPE_CHECKING:  # pragma: no cover
+    # imported when needed, to reduce the import time
+    from tenacity import RetryCallState
+
+    from sdkite.http.retrybudget import HTTPRetryBudget
+
+if sys.version_info < (3, 9):  # pragma: no cover
+    from typing import Callable, Iterable
+else:  # pragma: no cover
+    from collections.abc import Callable, Iterable
+
+
+# status codes meaning that the request has not been processed by the server
+_NOT_PROCESSED_STATUS_CODES = frozenset((429, 503))
+
+
+@dataclass
+class _BeforeSleep:
+    retry_callback: Optional[Callable[[HTTPRequestAttemptInfo], None]]
+    initial_request: HTTPRequest
+
+    def __call__(
+        self,
+        retry_call_state: "RetryCallState",
+        *,
+        retry_budget_exhausted: bool = False,
+    ) -> None:
+        if self.retry_callback is None:
+            return
+        exception: BaseException = (
+            retry_call_state.outcome.exception()  # type: ignore[union-attr, assignment]
+        )
+        seconds_since_start: float = (
+            retry_call_state.seconds_since_start  # type: ignore[assignment]
+        )
+        self.retry_callback(
+            HTTPRequestAttemptInfo(
+                attempt_number=retry_call_state.attempt_number,
+                initial_request=self.initial_request,
+                exception=exception,
+                seconds_since_start=seconds_since_start,
+                retry_budget_exhausted=retry_budget_exhausted,
+            )
+        )
+
+
+@dataclass
+class _RetryBudgetStop:
+    stop: Callable[["RetryCallState"], bool]
+    retry_budget: "HTTPRetryBudget"
+    before_sleep: _BeforeSleep
+
+    def __call__(self, retry_call_state: "RetryCallState") -> bool:
+        if self.stop(retry_call_state):
+            return True
+        if self.retry_budget.withdraw():
+            return False
+        # stop early, and tell the retry callback why
+        self.before_sleep(retry_call_state, retry_budget_exhausted=True)
+        return True
+
+
+@dataclass
+class _RetryCondition:
+    status_codes: Union[int, str, Iterable[Union[int, str]]]
+    idempotent: bool
+    check_status_code: Callable[[int], bool] = field(
+        init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self.check_status_code = build_status_code_check(self.status_codes)
+
+    def __call__(self, retry_call_state: "RetryCallState") -> bool:
+        exception = retry_call_state.outcome.exception()  # type: ignore[union-attr]
+        if isinstance(exception, HTTPStatusCodeError):
+            return self.check_status_code(exception.status_code) and (
+                self.idempotent or exception.status_code in _NOT_PROCESSED_STATUS_CODES
+            )
+        if isinstance(exception, (HTTPConnectionError, HTTPTimeoutError)):
+            # the request may have been processed
+            return self.idempotent
+        # e.g. a rejection by the concurrency limits, or a bug in an interceptor
+        return False
+
+
+def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    # imported here, to reduce the import time
+    from email.utils import (  # pylint: disable=import-outside-toplevel
+        parsedate_to_datetime,
+    )
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class _RetryAfterWait:
+    wait: Callable[["RetryCallState"], float]
+    wait_max: float
+
+    def __call__(self, retry_call_state: "RetryCallState") -> float:
+        exception = retry_call_state.outcome.exception()  # type: ignore[union-attr]
+        if isinstance(exception, HTTPStatusCodeError) and exception.response:
+            retry_after = _parse_retry_after(
+                exception.response.headers.get("retry-after")
+            )
+            if retry_after is not None:
+                return min(retry_after, self.wait_max)
+        return self.wait(retry_call_state)
+
+
+@dataclass
+class _Deadline:
+    timeout: float
+    end: float = field(init=False)
+    next_wait: float = field(init=False, default=0.0)
+    exceeded: bool = field(init=False, default=False)
+
+    def __post_init__(self) -> None:
+        self.end = monotonic() + self.timeout
+
+    def remaining(self) -> float:
+        return self.end - monotonic()
+
+    def error(
+        self, initial_request: HTTPRequest, reason: str = "exceeded"
+    ) -> HTTPTimeoutError:
+        # no more attempts once the deadline is known to be exceeded
+        self.exceeded = True
+        return HTTPTimeoutError(
+            msg=f"Total timeout of {self.timeout}s {reason}",
+            request=initial_request,
+        )
+
+    def wrap_retrying(
+        self,
+        stop: Callable[["RetryCallState"], bool],
+        wait: Callable[["RetryCallState"], float],
+    ) -> Tuple[Callable[["RetryCallState"], bool], Callable[["RetryCallState"], float]]:
+        def deadline_stop(retry_call_state: "RetryCallState") -> bool:
+            # compute the wait time beforehand, to stop if the next attempt
+            # would start after the deadline
+            self.next_wait = wait(retry_call_state)
+            return (
+                self.exceeded
+                or stop(retry_call_state)
+                or monotonic() + self.next_wait >= self.end
+            )
+
+        def deadline_wait(_: "RetryCallState") -> float:
+            return self.next_wait
+
+        return (deadline_stop, deadline_wait)
+
+    def apply(self, request: HTTPRequest, initial_request: HTTPRequest) -> HTTPRequest:
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise self.error(initial_request)
+        # the attempt must not last longer than the remaining time
+        return replace(
+            request,
+            timeout_connect=min(
+                last_not_none((request.timeout_connect,), remaining), remaining
+            ),
+            timeout_read=min(
+                last_not_none((request.timeout_read,), remaining), remaining
+            ),
+        )
@@ -1,22 +1,36 @@
+from contextlib import suppress
 from copy import deepcopy
-from dataclasses import dataclass
+from dataclasses import replace
 from functools import partial
-from inspect import BoundArguments, signature
 import sys
-from typing import Any, Dict, List, Optional, Set, Tuple, TypeVar, Union
-import warnings
-
-from tenacity import (
-    RetryCallState,
-    Retrying,
-    stop_after_attempt,
-    wait_exponential_jitter,
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
 )
+import warnings
 
 from sdkite import Adapter, AdapterSpec
-from sdkite.http.engine_requests import HTTPEngineRequests
+from sdkite.http._retry import (
+    _BeforeSleep,
+    _Deadline,
+    _RetryAfterWait,
+    _RetryBudgetStop,
+    _RetryCondition,
+)
 from sdkite.http.exceptions import HTTPStatusCodeError
 from sdkite.http.model import (
+    _IDEMPOTENT_METHODS,
+    _READ_TIMEOUT,
+    HTTPAsyncResponse,
+    HTTPBatchResult,
     HTTPBodyEncoding,
     HTTPHeaderDict,
     HTTPRequest,
@@ -24,7 +38,19 @@ from sdkite.http.model import (
     HTTPResponse,
 )
 from sdkite.http.utils import build_status_code_check, encode_request_body, urlsjoin
-from sdkite.utils import last_not_none, zip_reverse
+from sdkite.utils import LockResetAfterFork, last_not_none, zip_reverse
+
+if TYPE_CHECKING:  # pragma: no cover
+    # imported when needed, to reduce the import time
+    from concurrent.futures import Future
+
+    from tenacity import RetryCallState
+
+    from sdkite.http.circuit import HTTPCircuitBreaker
+    from sdkite.http.concurrency import HTTPBulkhead, HTTPConcurrencyLimiter
+    from sdkite.http.hedging import HTTPHedging
+    from sdkite.http.ratelimit import HTTPRateLimiter
+    from sdkite.http.retrybudget import HTTPRetryBudget
 
 if sys.version_info < (3, 8):  # pragma: no cover
     from typing_extensions import Literal, Protocol
@@ -32,9 +58,23 @@ else:  # pragma: no cover
     from typing import Literal, Protocol
 
 if sys.version_info < (3, 9):  # pragma: no cover
-    from typing import Callable, Iterable, Mapping
+    from typing import (
+        Awaitable,
+        Callable,
+        Coroutine,
+        Iterable,
+        Iterator,
+        Mapping,
+    )
 else:  # pragma: no cover
-    from collections.abc import Callable, Iterable, Mapping
+    from collections.abc import (
+        Awaitable,
+        Callable,
+        Coroutine,
+        Iterable,
+        Iterator,
+        Mapping,
+    )
 
 if sys.version_info < (3, 10):  # pragma: no cover
     from typing_extensions import ParamSpec
@@ -44,14 +84,19 @@ else:  # pragma: no cover
 
 P = ParamSpec("P")
 T = TypeVar("T")
+R = TypeVar("R", HTTPResponse, HTTPAsyncResponse)
 
 HTTPAdapterSendRequest = Callable[[HTTPRequest], HTTPResponse]
+HTTPAdapterAsyncSendRequest = Callable[[HTTPRequest], Awaitable[HTTPAsyncResponse]]
 
 
 _DEFAULT_RETRY_NB_ATTEMPTS = 3
 _DEFAULT_WAIT_INITIAL = 1.0
 _DEFAULT_WAIT_MAX = 60.0
 _DEFAULT_WAIT_JITTER = 1.0
+_DEFAULT_RETRY_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+
+# methods of requests which can be sent again safely (RFC 9110 section 9.2.2)
 
 
 class _HTTPAdapterRequestWithoutMethodReturn(Protocol):
@@ -64,6 +109,11 @@ class _HTTPAdapterRequestWithoutMethodReturn(Protocol):
         headers: Optional[Mapping[str, str]] = None,
         stream_response: bool = False,
         expected_status_codes: Union[int, str, Iterable[Union[int, str]]] = 200,
+        timeout_connect: Optional[float] = None,
+        timeout_read: Optional[float] = None,
+        timeout_total: Optional[float] = None,
+        data_memory_limit: Optional[int] = None,
+        decode_content: Optional[bool] = None,
     ) -> HTTPResponse:
         ...
 
@@ -80,31 +130,38 @@ class _HTTPAdapterRequestWithoutMethod:
         return partial(instance.request, self.name)
 
 
-@dataclass
-class _BeforeSleep:
-    retry_callback: Optional[Callable[[HTTPRequestAttemptInfo], None]]
-    initial_request: HTTPRequest
+class _HTTPAdapterAsyncRequestWithoutMethodReturn(Protocol):
+    def __call__(
+        self,
+        url: Optional[str] = None,
+        *,
+        body: object = None,
+        body_encoding: HTTPBodyEncoding = HTTPBodyEncoding.AUTO,
+        headers: Optional[Mapping[str, str]] = None,
+        stream_response: bool = False,
+        expected_status_codes: Union[int, str, Iterable[Union[int, str]]] = 200,
+        timeout_connect: Optional[float] = None,
+        timeout_read: Optional[float] = None,
+        timeout_total: Optional[float] = None,
+        data_memory_limit: Optional[int] = None,
+        decode_content: Optional[bool] = None,
+    ) -> Coroutine[Any, Any, HTTPAsyncResponse]:
+        ...
 
-    def __call__(self, retry_call_state: RetryCallState) -> None:
-        if self.retry_callback is None:
-            return
-        exception: BaseException = (
-            retry_call_state.outcome.exception()  # type: ignore[union-attr, assignment]
-        )
-        seconds_since_start: float = (
-            retry_call_state.seconds_since_start  # type: ignore[assignment]
-        )
-        self.retry_callback(
-            HTTPRequestAttemptInfo(
-                attempt_number=retry_call_state.attempt_number,
-                initial_request=self.initial_request,
-                exception=exception,
-                seconds_since_start=seconds_since_start,
-            )
-        )
 
+class _HTTPAdapterAsyncRequestWithoutMethod:
+    name: str
+
+    def __set_name__(self, klass: Any, name: str) -> None:
+        self.name = name[1:]  # remove leading 'a'
 
-class HTTPAdapter(Adapter):
+    def __get__(
+        self, instance: "HTTPAdapter", klass: Any
+    ) -> _HTTPAdapterAsyncRequestWithoutMethodReturn:
+        return partial(instance.arequest, self.name)
+
+
+class HTTPAdapter(LockResetAfterFork, Adapter):
     url: Optional[str]
     headers: HTTPHeaderDict
 
@@ -113,12 +170,63 @@ class HTTPAdapter(Adapter):
     retry_wait_initial: Optional[float]
     retry_wait_max: Optional[float]
     retry_wait_jitter: Optional[float]
+    retry_status_codes: Optional[Union[int, str, Iterable[Union[int, str]]]]
+    retry_non_idempotent: Optional[bool]
+    idempotency_key_header: Optional[str]
+
+    timeout_connect: Optional[float]
+    timeout_read: Optional[float]
+    timeout_total: Optional[float]
+
+    data_memory_limit: Optional[int]
+    decode_content: Optional[bool]
+
+    rate_limiter: Optional["HTTPRateLimiter"]
+    retry_budget: Optional["HTTPRetryBudget"]
+    circuit_breaker: Optional["HTTPCircuitBreaker"]
+    hedging: Optional["HTTPHedging"]
+    concurrency_limiter: Optional["HTTPConcurrencyLimiter"]
+    bulkhead: Optional["HTTPBulkhead"]
 
     request_interceptor: Dict[str, int]
     response_interceptor: Dict[str, int]
 
-    def __init__(self, send_request: Callable[[HTTPRequest], HTTPResponse]) -> None:
+    def __init__(
+        self,
+        send_request: HTTPAdapterSendRequest,
+        async_send_request: Optional[HTTPAdapterAsyncSendRequest] = None,
+        *,
+        async_engine_factory: Optional[
+            Callable[[], HTTPAdapterAsyncSendRequest]
+        ] = None,
+    ) -> None:
         self._send_request = send_request
+        self._async_send_request = async_send_request
+        # the async engine is created on first use, as most clients never need it
+        self._async_engine_factory = async_engine_factory
+        self._init_lock()  # of the creation of the async engine
+
+    @property
+    def engine(self) -> HTTPAdapterSendRequest:
+        return self._send_request
+
+    @property
+    def async_engine(self) -> Optional[HTTPAdapterAsyncSendRequest]:
+        if self._async_send_request is None and self._async_engine_factory:
+            with self._lock:
+                # check again: may have been created by another thread in the meantime
+                if self._async_send_request is None:
+                    self._async_send_request = self._async_engine_factory()
+        return self._async_send_request
+
+    def warmup(self, connections: int = 1) -> None:
+        """
+        Open connections to the URL of the adapter, when supported by the engine.
+        """
+        url = urlsjoin(self._from_adapter_hierarchy("url"))
+        warmup = getattr(self.engine, "warmup", None)
+        if url is not None and warmup is not None:
+            warmup(url, connections)
 
     get = _HTTPAdapterRequestWithoutMethod()
     options = _HTTPAdapterRequestWithoutMethod()
@@ -128,6 +236,14 @@ class HTTPAdapter(Adapter):
     patch = _HTTPAdapterRequestWithoutMethod()
     delete = _HTTPAdapterRequestWithoutMethod()
 
+    aget = _HTTPAdapterAsyncRequestWithoutMethod()
+    aoptions = _HTTPAdapterAsyncRequestWithoutMethod()
+    ahead = _HTTPAdapterAsyncRequestWithoutMethod()
+    apost = _HTTPAdapterAsyncRequestWithoutMethod()
+    aput = _HTTPAdapterAsyncRequestWithoutMethod()
+    apatch = _HTTPAdapterAsyncRequestWithoutMethod()
+    adelete = _HTTPAdapterAsyncRequestWithoutMethod()
+
     def request(
         self,
         method: str,
@@ -143,13 +259,234 @@ class HTTPAdapter(Adapter):
         retry_wait_initial: Optional[float] = None,
         retry_wait_max: Optional[float] = None,
         retry_wait_jitter: Optional[float] = None,
+        retry_status_codes: Optional[Union[int, str, Iterable[Union[int, str]]]] = None,
+        retry_non_idempotent: Optional[bool] = None,
+        timeout_connect: Optional[float] = None,
+        timeout_read: Optional[float] = None,
+        timeout_total: Optional[float] = None,
+        data_memory_limit: Optional[int] = None,
+        decode_content: Optional[bool] = None,
     ) -> HTTPResponse:
         check_status_code = build_status_code_check(expected_status_codes)
+        initial_request = self._create_request(
+            method,
+            url,
+            body=body,
+            body_encoding=body_encoding,
+            headers=headers,
+            stream_response=stream_response,
+            decode_content=decode_content,
+            timeout_connect=timeout_connect,
+            timeout_read=timeout_read,
+        )
+        deadline = self._create_deadline(timeout_total)
+        retrying_kwargs = self._retrying_kwargs(
+            initial_request,
+            retry_nb_attempts=retry_nb_attempts,
+            retry_callback=retry_callback,
+            retry_wait_initial=retry_wait_initial,
+            retry_wait_max=retry_wait_max,
+            retry_wait_jitter=retry_wait_jitter,
+            retry_status_codes=retry_status_codes,
+            retry_non_idempotent=retry_non_idempotent,
+            deadline=deadline,
+        )
+        data_memory_limit = last_not_none(
+            self._from_adapter_hierarchy("data_memory_limit", data_memory_limit)
+        )
+        rate_limiter = last_not_none(self._from_adapter_hierarchy("rate_limiter"))
+        send_request = self._send_request
+        circuit_breaker = last_not_none(self._from_adapter_hierarchy("circuit_breaker"))
+        if circuit_breaker is not None:
+            send_request = partial(circuit_breaker.send, send_request)
+        # the requests do not wait for the concurrency limits past the total timeout
+        end = None if deadline is None else deadline.end
+        concurrency_limiter = last_not_none(
+            self._from_adapter_hierarchy("concurrency_limiter")
+        )
+        if concurrency_limiter is not None:
+            send_request = partial(concurrency_limiter.send, send_request, deadline=end)
+        bulkhead = last_not_none(self._from_adapter_hierarchy("bulkhead"))
+        if bulkhead is not None:
+            send_request = partial(bulkhead.send, send_request, deadline=end)
+        # a hedged request goes through the circuit breaker and the concurrency
+        # limits on its own, like the first request
+        hedging = last_not_none(self._from_adapter_hierarchy("hedging"))
+        if hedging is not None:
+            send_request = partial(hedging.send, send_request)
+
+        from tenacity import Retrying  # pylint: disable=import-outside-toplevel
+
+        for attempt in Retrying(**retrying_kwargs):
+            request = deepcopy(initial_request)
+            with attempt:
+                if rate_limiter is not None:
+                    max_wait = None if deadline is None else deadline.remaining()
+                    if not rate_limiter.acquire(initial_request, max_wait):
+                        raise cast(_Deadline, deadline).error(
+                            initial_request, "would be exceeded by the rate limit"
+                        )
+                request = self._intercept_request(
+                    request, initial_request, data_memory_limit, deadline
+                )
+                response = send_request(request)
+                if rate_limiter is not None:
+                    rate_limiter.update(initial_request, response)
+                response = self._process_response(
+                    response, initial_request, check_status_code, data_memory_limit
+                )
 
-        #
-        # create request
-        #
+        return response
 
+    def request_many(
+        self,
+        requests: Iterable[Mapping[str, Any]],
+        *,
+        max_workers: int = 10,
+        ordered: bool = True,
+    ) -> Iterator[HTTPBatchResult]:
+        # pylint: disable-next=import-outside-toplevel
+        from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures: Dict["Future[HTTPResponse]", int] = {
+                executor.submit(self.request, **kwargs): index
+                for index, kwargs in enumerate(requests)
+            }
+            try:
+                for future in list(futures) if ordered else as_completed(futures):
+                    index = futures.pop(future)  # only the futures not yielded remain
+                    try:
+                        result = HTTPBatchResult(index, future.result(), None)
+                    # pylint: disable-next=broad-exception-caught
+                    except Exception as ex:  # noqa: BLE001
+                        result = HTTPBatchResult(index, None, ex)
+                    yield result
+            finally:
+                # when the iteration is stopped early
+                for future in futures:
+                    future.cancel()
+                # the responses not yielded may hold connections (e.g. when streamed)
+                wait(futures)
+                for future in futures:
+                    if not future.cancelled() and future.exception() is None:
+                        with suppress(Exception):
+                            future.result()._close()  # pylint: disable=protected-access  # noqa: SLF001
+
+    async def arequest(
+        self,
+        method: str,
+        url: Optional[str] = None,
+        *,
+        body: object = None,
+        body_encoding: HTTPBodyEncoding = HTTPBodyEncoding.AUTO,
+        headers: Optional[Mapping[str, str]] = None,
+        stream_response: bool = False,
+        expected_status_codes: Union[int, str, Iterable[Union[int, str]]] = 200,
+        retry_nb_attempts: Optional[int] = None,
+        retry_callback: Optional[Callable[[HTTPRequestAttemptInfo], None]] = None,
+        retry_wait_initial: Optional[float] = None,
+        retry_wait_max: Optional[float] = None,
+        retry_wait_jitter: Optional[float] = None,
+        retry_status_codes: Optional[Union[int, str, Iterable[Union[int, str]]]] = None,
+        retry_non_idempotent: Optional[bool] = None,
+        timeout_connect: Optional[float] = None,
+        timeout_read: Optional[float] = None,
+        timeout_total: Optional[float] = None,
+        data_memory_limit: Optional[int] = None,
+        decode_content: Optional[bool] = None,
+    ) -> HTTPAsyncResponse:
+        async_send_request = self.async_engine
+        if async_send_request is None:
+            raise ValueError("No async engine set")
+
+        check_status_code = build_status_code_check(expected_status_codes)
+        initial_request = self._create_request(
+            method,
+            url,
+            body=body,
+            body_encoding=body_encoding,
+            headers=headers,
+            stream_response=stream_response,
+            decode_content=decode_content,
+            timeout_connect=timeout_connect,
+            timeout_read=timeout_read,
+        )
+        deadline = self._create_deadline(timeout_total)
+        retrying_kwargs = self._retrying_kwargs(
+            initial_request,
+            retry_nb_attempts=retry_nb_attempts,
+            retry_callback=retry_callback,
+            retry_wait_initial=retry_wait_initial,
+            retry_wait_max=retry_wait_max,
+            retry_wait_jitter=retry_wait_jitter,
+            retry_status_codes=retry_status_codes,
+            retry_non_idempotent=retry_non_idempotent,
+            deadline=deadline,
+        )
+        data_memory_limit = last_not_none(
+            self._from_adapter_hierarchy("data_memory_limit", data_memory_limit)
+        )
+        rate_limiter = last_not_none(self._from_adapter_hierarchy("rate_limiter"))
+        circuit_breaker = last_not_none(self._from_adapter_hierarchy("circuit_breaker"))
+        if circuit_breaker is not None:
+            async_send_request = partial(circuit_breaker.asend, async_send_request)
+        # the requests do not wait for the concurrency limits past the total timeout
+        end = None if deadline is None else deadline.end
+        concurrency_limiter = last_not_none(
+            self._from_adapter_hierarchy("concurrency_limiter")
+        )
+        if concurrency_limiter is not None:
+            async_send_request = partial(
+                concurrency_limiter.asend, async_send_request, deadline=end
+            )
+        bulkhead = last_not_none(self._from_adapter_hierarchy("bulkhead"))
+        if bulkhead is not None:
+            async_send_request = partial(
+                bulkhead.asend, async_send_request, deadline=end
+            )
+        # a hedged request goes through the circuit breaker and the concurrency
+        # limits on its own, like the first request
+        hedging = last_not_none(self._from_adapter_hierarchy("hedging"))
+        if hedging is not None:
+            async_send_request = partial(hedging.asend, async_send_request)
+
+        from tenacity import AsyncRetrying  # pylint: disable=import-outside-toplevel
+
+        async for attempt in AsyncRetrying(**retrying_kwargs):
+            request = deepcopy(initial_request)
+            with attempt:
+                if rate_limiter is not None:
+                    max_wait = None if deadline is None else deadline.remaining()
+                    if not await rate_limiter.aacquire(initial_request, max_wait):
+                        raise cast(_Deadline, deadline).error(
+                            initial_request, "would be exceeded by the rate limit"
+                        )
+                request = self._intercept_request(
+                    request, initial_request, data_memory_limit, deadline
+                )
+                response = await async_send_request(request)
+                if rate_limiter is not None:
+                    rate_limiter.update(initial_request, response)
+                response = self._process_response(
+                    response, initial_request, check_status_code, data_memory_limit
+                )
+
+        return response
+
+    def _create_request(
+        self,
+        method: str,
+        url: Optional[str],
+        *,
+        body: object,
+        body_encoding: HTTPBodyEncoding,
+        headers: Optional[Mapping[str, str]],
+        stream_response: bool,
+        decode_content: Optional[bool],
+        timeout_connect: Optional[float],
+        timeout_read: Optional[float],
+    ) -> HTTPRequest:
         # method
         method = method.upper()
 
@@ -166,6 +503,20 @@ class HTTPAdapter(Adapter):
                 headers.update(headers_part)
         del _headers
 
+        # idempotency key, the same for all the attempts of the request
+        idempotency_key_header = last_not_none(
+            self._from_adapter_hierarchy("idempotency_key_header")
+        )
+        if (
+            idempotency_key_header is not None
+            and method not in _IDEMPOTENT_METHODS
+            and idempotency_key_header not in headers
+        ):
+            # imported here, to reduce the import time
+            from uuid import uuid4  # pylint: disable=import-outside-toplevel
+
+            headers[idempotency_key_header] = str(uuid4())
+
         # body
         body, content_type = encode_request_body(body, body_encoding)
         if content_type:
@@ -179,19 +530,51 @@ class HTTPAdapter(Adapter):
                 )
             headers["content-type"] = content_type
 
+        # content decoding
+        decode_content = last_not_none(
+            self._from_adapter_hierarchy("decode_content", decode_content),
+            default=True,
+        )
+
+        # timeouts (engine defaults if None)
+        timeout_connect = last_not_none(
+            self._from_adapter_hierarchy("timeout_connect", timeout_connect)
+        )
+        timeout_read = last_not_none(
+            self._from_adapter_hierarchy("timeout_read", timeout_read)
+        )
+
         # create request object
-        initial_request = HTTPRequest(
+        return HTTPRequest(
             method=method,
             url=url,
             headers=headers,
             body=body,
             stream_response=stream_response,
+            decode_content=decode_content,
+            timeout_connect=timeout_connect,
+            timeout_read=timeout_read,
         )
 
-        #
-        # send request
-        #
+    def _create_deadline(self, timeout_total: Optional[float]) -> Optional[_Deadline]:
+        timeout_total = last_not_none(
+            self._from_adapter_hierarchy("timeout_total", timeout_total)
+        )
+        return None if timeout_total is None else _Deadline(timeout_total)
 
+    def _retrying_kwargs(
+        self,
+        initial_request: HTTPRequest,
+        *,
+        retry_nb_attempts: Optional[int],
+        retry_callback: Optional[Callable[[HTTPRequestAttemptInfo], None]],
+        retry_wait_initial: Optional[float],
+        retry_wait_max: Optional[float],
+        retry_wait_jitter: Optional[float],
+        retry_status_codes: Optional[Union[int, str, Iterable[Union[int, str]]]],
+        retry_non_idempotent: Optional[bool],
+        deadline: Optional[_Deadline],
+    ) -> Dict[str, Any]:
         # get values from parent adapters if None, or use default
         retry_nb_attempts = last_not_none(
             self._from_adapter_hierarchy("retry_nb_attempts", retry_nb_attempts),
@@ -212,43 +595,107 @@ class HTTPAdapter(Adapter):
             self._from_adapter_hierarchy("retry_wait_jitter", retry_wait_jitter),
             _DEFAULT_WAIT_JITTER,
         )
+        retry_status_codes = last_not_none(
+            self._from_adapter_hierarchy("retry_status_codes", retry_status_codes),
+            _DEFAULT_RETRY_STATUS_CODES,
+        )
+        retry_non_idempotent = last_not_none(
+            self._from_adapter_hierarchy("retry_non_idempotent", retry_non_idempotent),
+            default=False,
+        )
+        idempotency_key_header = last_not_none(
+            self._from_adapter_hierarchy("idempotency_key_header")
+        )
 
-        before_sleep = _BeforeSleep(retry_callback, initial_request)
+        # pylint: disable-next=import-outside-toplevel
+        from tenacity import stop_after_attempt, wait_exponential_jitter
 
-        for attempt in Retrying(
-            stop=stop_after_attempt(retry_nb_attempts),
-            wait=wait_exponential_jitter(
+        stop: Callable[[RetryCallState], bool] = stop_after_attempt(retry_nb_attempts)
+        wait: Callable[[RetryCallState], float] = _RetryAfterWait(
+            wait_exponential_jitter(
                 initial=retry_wait_initial,
                 max=retry_wait_max,
                 jitter=retry_wait_jitter,
             ),
-            before_sleep=before_sleep,
-            reraise=True,
-        ):
-            request = deepcopy(initial_request)
-            with attempt:
-                # request interceptors
-                for interceptor in self._get_interceptors("request_interceptor"):
-                    request = interceptor(request, self)
-
-                # send request
-                response = self._send_request(request)
-
-                # response interceptors
-                for interceptor in self._get_interceptors("response_interceptor"):
-                    response = interceptor(response, self)
-
-                # status code check
-                if not check_status_code(response.status_code):
-                    raise HTTPStatusCodeError(
-                        status_code=response.status_code,
-                        request=initial_request,
-                        response=response,
-                    )
-
-        response._set_context(  # pylint: disable=protected-access)  # noqa: SLF001
-            initial_request
+            retry_wait_max,
         )
+        if deadline is not None:
+            stop, wait = deadline.wrap_retrying(stop, wait)
+        before_sleep = _BeforeSleep(retry_callback, initial_request)
+        retry_budget = last_not_none(self._from_adapter_hierarchy("retry_budget"))
+        if retry_budget is not None:
+            retry_budget.deposit()  # this method is called once per request
+            stop = _RetryBudgetStop(stop, retry_budget, before_sleep)
+
+        return {
+            "stop": stop,
+            "wait": wait,
+            "retry": _RetryCondition(
+                retry_status_codes,
+                retry_non_idempotent or initial_request.method in _IDEMPOTENT_METHODS
+                # the server does not process the request twice
+                or (
+                    idempotency_key_header is not None
+                    and idempotency_key_header in initial_request.headers
+                ),
+            ),
+            "before_sleep": before_sleep,
+            "reraise": True,
+        }
+
+    def _intercept_request(
+        self,
+        request: HTTPRequest,
+        initial_request: HTTPRequest,
+        data_memory_limit: Optional[int],
+        deadline: Optional[_Deadline],
+    ) -> HTTPRequest:
+        for interceptor in self._get_interceptors("request_interceptor"):
+            request = interceptor(request, self)
+        if data_memory_limit is not None and not request.stream_response:
+            # the body is read by the response within the memory limit, but the read
+            # timeout stays the one of the responses which are not streamed
+            request = replace(
+                request,
+                stream_response=True,
+                timeout_read=last_not_none((request.timeout_read,), _READ_TIMEOUT),
+            )
+        if deadline is not None:
+            request = deadline.apply(request, initial_request)
+        return request
+
+    def _process_response(
+        self,
+        response: R,
+        initial_request: HTTPRequest,
+        check_status_code: Callable[[int], bool],
+        data_memory_limit: Optional[int],
+    ) -> R:
+        engine_response = response
+        response._set_context(  # pylint: disable=protected-access  # noqa: SLF001
+            initial_request, data_memory_limit=data_memory_limit
+        )
+
+        # response interceptors
+        for interceptor in self._get_interceptors("response_interceptor"):
+            response = interceptor(response, self)
+        if response is not engine_response:
+            response._set_context(  # pylint: disable=protected-access  # noqa: SLF001
+                initial_request, data_memory_limit=data_memory_limit
+            )
+
+        # status code check
+        if not check_status_code(response.status_code):
+            # a streamed response would otherwise keep its connection
+            response._close()  # pylint: disable=protected-access  # noqa: SLF001
+            if response is not engine_response:
+                engine_response._close()  # pylint: disable=protected-access  # noqa: SLF001
+            raise HTTPStatusCodeError(
+                status_code=response.status_code,
+                request=initial_request,
+                response=response,
+            )
+
         return response
 
     def _get_interceptors(
@@ -266,9 +713,41 @@ class HTTPAdapter(Adapter):
         return [interceptor for _, interceptor in interceptors]
 
 
+def _create_default_engine() -> HTTPAdapterSendRequest:
+    # imported here so that 'requests' is only imported when actually used
+    from sdkite.http.engine_requests import (  # pylint: disable=import-outside-toplevel
+        HTTPEngineRequests,
+    )
+
+    return HTTPEngineRequests()
+
+
+def _create_default_async_engine() -> HTTPAdapterAsyncSendRequest:
+    # imported here so that 'asyncio' is only imported when actually used
+    from sdkite.http.engine_asyncio import (  # pylint: disable=import-outside-toplevel
+        HTTPEngineAsyncio,
+    )
+
+    return HTTPEngineAsyncio()
+
+
+def _bind_arguments(
+    fct: Callable[..., object], args: Tuple[Any, ...], kwargs: Dict[str, Any]
+) -> None:
+    from inspect import signature  # pylint: disable=import-outside-toplevel
+
+    # raise TypeError before the first use if the arguments do not match
+    signature(fct).bind(*args, **kwargs)
+
+
 class HTTPAdapterSpec(AdapterSpec[HTTPAdapter]):
     _engine_callable: Callable[..., HTTPAdapterSendRequest]
-    _engine_arguments: BoundArguments
+    _engine_args: Tuple[Any, ...]
+    _engine_kwargs: Dict[str, Any]
+    _async_engine_callable: Callable[..., HTTPAdapterAsyncSendRequest]
+    _async_engine_args: Tuple[Any, ...]
+    _async_engine_kwargs: Dict[str, Any]
+    _async_engine_checked: bool
 
     def __init__(
         self,
@@ -280,6 +759,20 @@ class HTTPAdapterSpec(AdapterSpec[HTTPAdapter]):
         retry_wait_initial: Optional[float] = None,
         retry_wait_max: Optional[float] = None,
         retry_wait_jitter: Optional[float] = None,
+        retry_status_codes: Optional[Union[int, str, Iterable[Union[int, str]]]] = None,
+        retry_non_idempotent: Optional[bool] = None,
+        idempotency_key_header: Optional[str] = None,
+        timeout_connect: Optional[float] = None,
+        timeout_read: Optional[float] = None,
+        timeout_total: Optional[float] = None,
+        data_memory_limit: Optional[int] = None,
+        decode_content: Optional[bool] = None,
+        rate_limiter: Optional["HTTPRateLimiter"] = None,
+        retry_budget: Optional["HTTPRetryBudget"] = None,
+        circuit_breaker: Optional["HTTPCircuitBreaker"] = None,
+        hedging: Optional["HTTPHedging"] = None,
+        concurrency_limiter: Optional["HTTPConcurrencyLimiter"] = None,
+        bulkhead: Optional["HTTPBulkhead"] = None,
     ) -> None:
         self.url = url
         self.headers = HTTPHeaderDict(headers)
@@ -289,12 +782,36 @@ class HTTPAdapterSpec(AdapterSpec[HTTPAdapter]):
         self.retry_wait_initial = retry_wait_initial
         self.retry_wait_max = retry_wait_max
         self.retry_wait_jitter = retry_wait_jitter
+        self.retry_status_codes = retry_status_codes
+        self.retry_non_idempotent = retry_non_idempotent
+        self.idempotency_key_header = idempotency_key_header
+
+        self.timeout_connect = timeout_connect
+        self.timeout_read = timeout_read
+        self.timeout_total = timeout_total
+
+        self.data_memory_limit = data_memory_limit
+        self.decode_content = decode_content
+
+        self.rate_limiter = rate_limiter
+        self.retry_budget = retry_budget
+        self.circuit_breaker = circuit_breaker
+        self.hedging = hedging
+        self.concurrency_limiter = concurrency_limiter
+        self.bulkhead = bulkhead
 
         self.request_interceptor: Dict[str, int] = {}
         self.response_interceptor: Dict[str, int] = {}
 
-        # defaults to engine based on 'requests'
-        self.set_engine(HTTPEngineRequests)
+        # defaults to engines based on 'requests' and 'asyncio'
+        # the arguments are not checked to keep the creation of specs fast
+        self._engine_callable = _create_default_engine
+        self._engine_args = ()
+        self._engine_kwargs = {}
+        self._async_engine_callable = _create_default_async_engine
+        self._async_engine_args = ()
+        self._async_engine_kwargs = {}
+        self._async_engine_checked = True
 
     def set_engine(
         self,
@@ -302,16 +819,39 @@ class HTTPAdapterSpec(AdapterSpec[HTTPAdapter]):
         *engine_args: P.args,
         **engine_kwargs: P.kwargs,
     ) -> None:
-        arguments = signature(engine_callable).bind(*engine_args, **engine_kwargs)
         self._engine_callable = engine_callable
-        self._engine_arguments = arguments
+        self._engine_args = engine_args
+        self._engine_kwargs = engine_kwargs
+
+    def set_async_engine(
+        self,
+        engine_callable: Callable[P, HTTPAdapterAsyncSendRequest],
+        *engine_args: P.args,
+        **engine_kwargs: P.kwargs,
+    ) -> None:
+        self._async_engine_callable = engine_callable
+        self._async_engine_args = engine_args
+        self._async_engine_kwargs = engine_kwargs
+        self._async_engine_checked = False
 
     def _create_adapter(self) -> HTTPAdapter:
-        send_request = self._engine_callable(
-            *self._engine_arguments.args,
-            **self._engine_arguments.kwargs,
+        # calling the engine raises TypeError if its arguments do not match, but the
+        # async engine is only created on first use: its arguments are checked now
+        # rather than in set_async_engine, which usually runs at import time
+        if not self._async_engine_checked:
+            _bind_arguments(
+                self._async_engine_callable,
+                self._async_engine_args,
+                self._async_engine_kwargs,
+            )
+            self._async_engine_checked = True
+        send_request = self._engine_callable(*self._engine_args, **self._engine_kwargs)
+        async_engine_factory = partial(
+            self._async_engine_callable,
+            *self._async_engine_args,
+            **self._async_engine_kwargs,
         )
-        return HTTPAdapter(send_request)
+        return HTTPAdapter(send_request, async_engine_factory=async_engine_factory)
 
     def register_interceptor(
         self,
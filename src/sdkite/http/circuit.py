@@ -0,0 +1,207 @@
+from collections import deque
+from enum import Enum, auto, unique
+import sys
+from time import monotonic
+from typing import Deque, Dict, Optional, Tuple, TypeVar, Union
+from urllib.parse import urlsplit
+
+from sdkite.http.exceptions import HTTPCircuitOpenError
+from sdkite.http.model import HTTPAsyncResponse, HTTPRequest, HTTPResponse
+from sdkite.http.utils import SharedWhenCopied, build_status_code_check
+from sdkite.utils import LockResetAfterFork
+
+if sys.version_info < (3, 9):  # pragma: no cover
+    from typing import Awaitable, Callable, Iterable
+else:  # pragma: no cover
+    from collections.abc import Awaitable, Callable, Iterable
+
+R = TypeVar("R", HTTPResponse, HTTPAsyncResponse)
+
+_DEFAULT_FAILURE_STATUS_CODES = (500, 502, 503, 504)
+
+
+@unique
+class HTTPCircuitState(Enum):
+    CLOSED = auto()  # requests are sent
+    OPEN = auto()  # requests fail fast
+    HALF_OPEN = auto()  # a limited number of requests are sent to probe the host
+
+
+class _Circuit:
+    __slots__ = ["state", "outcomes", "opened_at", "probes", "successes"]
+
+    def __init__(self, window_size: int) -> None:
+        self.state = HTTPCircuitState.CLOSED
+        self.outcomes: Deque[bool] = deque(maxlen=window_size)  # True on success
+        self.opened_at = 0.0
+        self.probes = 0  # sent while half-open
+        self.successes = 0  # of the probes
+
+
+class HTTPCircuitBreaker(LockResetAfterFork, SharedWhenCopied):
+    def __init__(
+        self,
+        *,
+        failure_rate: float = 0.5,
+        window_size: int = 20,
+        min_calls: int = 10,
+        open_duration: float = 30.0,
+        half_open_calls: int = 1,
+        failure_status_codes: Union[
+            int, str, Iterable[Union[int, str]]
+        ] = _DEFAULT_FAILURE_STATUS_CODES,
+        on_state_change: Optional[
+            Callable[[str, HTTPCircuitState, HTTPCircuitState], None]
+        ] = None,
+    ) -> None:
+        if not 0 < failure_rate <= 1:
+            raise ValueError(f"Invalid failure rate: {failure_rate}")
+        if window_size < 1:
+            raise ValueError(f"Invalid window size: {window_size}")
+        if not 1 <= min_calls <= window_size:
+            raise ValueError(f"Invalid min calls: {min_calls}")
+        if half_open_calls < 1:
+            raise ValueError(f"Invalid half-open calls: {half_open_calls}")
+        self.failure_rate = failure_rate
+        self.window_size = window_size
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.half_open_calls = half_open_calls
+        self.failure_status_codes = failure_status_codes
+        self.on_state_change = on_state_change
+        self._is_failure_status_code = build_status_code_check(failure_status_codes)
+        self._circuits: Dict[str, _Circuit] = {}
+        self._init_lock()
+
+    def _after_fork(self) -> None:
+        # in the child process: the probes in flight will never be recorded
+        super()._after_fork()
+        for circuit in self._circuits.values():
+            circuit.probes = circuit.successes
+
+    def state(self, host: str) -> HTTPCircuitState:
+        """
+        The state of the circuit of the host (e.g. 'www.example.com').
+
+        An open circuit becomes half-open on the next request after the open duration.
+        """
+        with self._lock:
+            circuit = self._circuits.get(host)
+            return HTTPCircuitState.CLOSED if circuit is None else circuit.state
+
+    def _notify(
+        self, host: str, old_state: HTTPCircuitState, new_state: HTTPCircuitState
+    ) -> None:
+        # called outside of the lock, so that the callback can use the breaker
+        if old_state is not new_state and self.on_state_change is not None:
+            self.on_state_change(host, old_state, new_state)
+
+    def _open(self, circuit: _Circuit) -> None:
+        circuit.state = HTTPCircuitState.OPEN
+        circuit.opened_at = monotonic()
+        circuit.outcomes.clear()
+
+    def _acquire(self, request: HTTPRequest) -> Tuple[str, bool]:
+        host = urlsplit(request.url).netloc
+        with self._lock:
+            try:
+                circuit = self._circuits[host]
+            except KeyError:
+                circuit = self._circuits[host] = _Circuit(self.window_size)
+            old_state = circuit.state
+            if (
+                circuit.state is HTTPCircuitState.OPEN
+                and monotonic() - circuit.opened_at >= self.open_duration
+            ):
+                circuit.state = HTTPCircuitState.HALF_OPEN
+                circuit.probes = circuit.successes = 0
+            is_probe = circuit.state is HTTPCircuitState.HALF_OPEN
+            allowed = circuit.state is HTTPCircuitState.CLOSED or (
+                is_probe and circuit.probes < self.half_open_calls
+            )
+            if allowed and is_probe:
+                circuit.probes += 1
+            new_state = circuit.state
+        self._notify(host, old_state, new_state)
+        if not allowed:
+            raise HTTPCircuitOpenError(host=host, request=request)
+        return host, is_probe
+
+    def _cancel(self, host: str, *, is_probe: bool) -> None:
+        with self._lock:
+            circuit = self._circuits[host]
+            if (
+                is_probe
+                and circuit.state is HTTPCircuitState.HALF_OPEN
+                and circuit.probes > circuit.successes
+            ):
+                # the probe can be sent by another request
+                circuit.probes -= 1
+
+    def _record(self, host: str, *, is_probe: bool, success: bool) -> None:
+        with self._lock:
+            circuit = self._circuits[host]
+            old_state = circuit.state
+            if is_probe:
+                if circuit.state is HTTPCircuitState.HALF_OPEN:
+                    if not success:
+                        self._open(circuit)
+                    else:
+                        circuit.successes += 1
+                        if circuit.successes >= self.half_open_calls:
+                            circuit.state = HTTPCircuitState.CLOSED
+            elif circuit.state is HTTPCircuitState.CLOSED:
+                # outcomes of requests sent before the circuit opened are ignored
+                circuit.outcomes.append(success)
+                nb_calls = len(circuit.outcomes)
+                nb_failures = nb_calls - sum(circuit.outcomes)
+                if (
+                    nb_calls >= self.min_calls
+                    and nb_failures >= self.failure_rate * nb_calls
+                ):
+                    self._open(circuit)
+            new_state = circuit.state
+        self._notify(host, old_state, new_state)
+
+    def send(self, send_request: Callable[[HTTPRequest], R], request: HTTPRequest) -> R:
+        """
+        Send the request through the circuit of its host.
+
+        Raise HTTPCircuitOpenError without sending it if the circuit is open.
+        """
+        host, is_probe = self._acquire(request)
+        success = False
+        try:
+            response = send_request(request)
+            success = not self._is_failure_status_code(response.status_code)
+        finally:
+            self._record(host, is_probe=is_probe, success=success)
+        return response
+
+    async def asend(
+        self,
+        async_send_request: Callable[[HTTPRequest], Awaitable[HTTPAsyncResponse]],
+        request: HTTPRequest,
+    ) -> HTTPAsyncResponse:
+        """
+        Send the request through the circuit of its host, asynchronously.
+
+        Raise HTTPCircuitOpenError without sending it if the circuit is open.
+        """
+        # imported here so that 'asyncio' is only imported when actually used
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        host, is_probe = self._acquire(request)
+        success = False
+        try:
+            response = await async_send_request(request)
+            success = not self._is_failure_status_code(response.status_code)
+        except asyncio.CancelledError:
+            # e.g. the losing request of a hedged request: says nothing of the host
+            self._cancel(host, is_probe=is_probe)
+            raise
+        except BaseException:
+            self._record(host, is_probe=is_probe, success=False)
+            raise
+        self._record(host, is_probe=is_probe, success=success)
+        return response
@@ -0,0 +1,260 @@
+from collections import deque
+from dataclasses import dataclass
+import sys
+from threading import Event
+from time import monotonic
+from typing import TYPE_CHECKING, Deque, Optional, TypeVar, Union
+
+from sdkite.http.exceptions import (
+    HTTPBulkheadFullError,
+    HTTPConcurrencyLimitError,
+    HTTPError,
+    HTTPTimeoutError,
+)
+from sdkite.http.model import HTTPAsyncResponse, HTTPRequest, HTTPResponse
+from sdkite.http.utils import SharedWhenCopied, build_status_code_check
+from sdkite.utils import LockResetAfterFork
+
+if sys.version_info < (3, 9):  # pragma: no cover
+    from typing import Awaitable, Callable, Iterable
+else:  # pragma: no cover
+    from collections.abc import Awaitable, Callable, Iterable
+
+if TYPE_CHECKING:  # pragma: no cover
+    from asyncio import Future
+
+R = TypeVar("R", HTTPResponse, HTTPAsyncResponse)
+
+_DEFAULT_OVERLOAD_STATUS_CODES = (429, 503)
+
+# weight of the latest latency in the average latency
+_LATENCY_SMOOTHING = 0.1
+
+
+@dataclass(frozen=True)
+class HTTPConcurrencyStats:
+    limit: int  # maximum number of requests in flight
+    in_flight: int  # requests being sent
+    queued: int  # requests waiting to be sent
+
+
+class _Waiter:
+    __slots__ = ["granted", "wake"]
+
+    def __init__(self, wake: Callable[[], object]) -> None:
+        self.granted = False  # set when the waiter has been given a slot
+        self.wake = wake
+
+
+class HTTPConcurrencyLimiter(LockResetAfterFork, SharedWhenCopied):
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        *,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff_ratio: float = 0.5,
+        latency_tolerance: float = 2.0,
+        max_wait: float = 60.0,
+        overload_status_codes: Union[
+            int, str, Iterable[Union[int, str]]
+        ] = _DEFAULT_OVERLOAD_STATUS_CODES,
+    ) -> None:
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                f"Invalid limits: {min_limit} <= {initial_limit} <= {max_limit}"
+            )
+        if not 0 < backoff_ratio < 1:
+            raise ValueError(f"Invalid backoff ratio: {backoff_ratio}")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.backoff_ratio = backoff_ratio
+        self.latency_tolerance = latency_tolerance
+        self.max_wait = max_wait
+        self.overload_status_codes = overload_status_codes
+        self._is_overload_status_code = build_status_code_check(overload_status_codes)
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._latency: Optional[float] = None  # average
+        self._waiters: Deque[_Waiter] = deque()
+        self._init_lock()
+
+    def _after_fork(self) -> None:
+        # in the child process: the requests in flight and waiting belong to threads
+        # of the parent
+        super()._after_fork()
+        self._in_flight = 0
+        self._waiters = deque()
+
+    def stats(self) -> HTTPConcurrencyStats:
+        with self._lock:
+            return HTTPConcurrencyStats(
+                limit=int(self._limit),
+                in_flight=self._in_flight,
+                queued=len(self._waiters),
+            )
+
+    def _try_acquire(self, wake: Callable[[], object]) -> Optional[_Waiter]:
+        # lock must be held
+        if not self._waiters and self._in_flight < int(self._limit):
+            self._in_flight += 1
+            return None
+        waiter = _Waiter(wake)
+        self._waiters.append(waiter)
+        return waiter
+
+    def _wake_waiters(self) -> None:
+        # lock must be held
+        while self._waiters and self._in_flight < int(self._limit):
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            self._in_flight += 1
+            waiter.wake()
+
+    def _max_wait(self, deadline: Optional[float]) -> float:
+        if deadline is None:
+            return self.max_wait
+        return max(0.0, min(self.max_wait, deadline - monotonic()))
+
+    def _wait_error(self, request: HTTPRequest, max_wait: float) -> HTTPError:
+        return HTTPConcurrencyLimitError(
+            limit=int(self._limit), max_wait=max_wait, request=request
+        )
+
+    def _give_up(self, waiter: _Waiter, request: HTTPRequest, max_wait: float) -> None:
+        with self._lock:
+            if waiter.granted:
+                return  # given a slot in the meantime
+            self._waiters.remove(waiter)
+        raise self._wait_error(request, max_wait)
+
+    def _release(self, *, overloaded: bool, latency: Optional[float]) -> None:
+        with self._lock:
+            in_flight = self._in_flight
+            self._in_flight -= 1
+            if overloaded:
+                # multiplicative decrease
+                self._limit = max(self.min_limit, self._limit * self.backoff_ratio)
+            elif latency is not None:
+                if (
+                    self._latency is None
+                    or latency <= self._latency * self.latency_tolerance
+                ) and in_flight * 2 >= self._limit:
+                    # additive increase: by one when 'limit' requests succeeded, and
+                    # only when the limit is actually used
+                    self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+                self._latency = (
+                    latency
+                    if self._latency is None
+                    else self._latency + _LATENCY_SMOOTHING * (latency - self._latency)
+                )
+            self._wake_waiters()
+
+    def send(
+        self,
+        send_request: Callable[[HTTPRequest], R],
+        request: HTTPRequest,
+        *,
+        deadline: Optional[float] = None,
+    ) -> R:
+        """
+        Send the request once the number of requests in flight is below the limit.
+
+        Raise HTTPConcurrencyLimitError if that takes more than 'max_wait' seconds, or
+        lasts after 'deadline' (a 'time.monotonic' value).
+        """
+        event = Event()
+        with self._lock:
+            waiter = self._try_acquire(event.set)
+        if waiter is not None:
+            max_wait = self._max_wait(deadline)
+            if not event.wait(max_wait):
+                self._give_up(waiter, request, max_wait)
+
+        overloaded = False
+        latency = None
+        start = monotonic()
+        try:
+            response = send_request(request)
+        except HTTPTimeoutError:
+            overloaded = True
+            raise
+        else:
+            overloaded = self._is_overload_status_code(response.status_code)
+            latency = monotonic() - start
+        finally:
+            self._release(overloaded=overloaded, latency=latency)
+        return response
+
+    async def asend(
+        self,
+        async_send_request: Callable[[HTTPRequest], Awaitable[HTTPAsyncResponse]],
+        request: HTTPRequest,
+        *,
+        deadline: Optional[float] = None,
+    ) -> HTTPAsyncResponse:
+        """
+        Send the request once the number of requests in flight is below the limit,
+        asynchronously.
+
+        Raise HTTPConcurrencyLimitError if that takes more than 'max_wait' seconds, or
+        lasts after 'deadline' (a 'time.monotonic' value).
+        """
+        # imported here so that 'asyncio' is only imported when actually used
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        loop = asyncio.get_running_loop()
+        future: "Future[None]" = loop.create_future()
+        with self._lock:
+            # the waiter may be woken up from another thread
+            waiter = self._try_acquire(
+                lambda: loop.call_soon_threadsafe(future.set_result, None)
+            )
+        if waiter is not None:
+            max_wait = self._max_wait(deadline)
+            try:
+                await asyncio.wait({future}, timeout=max_wait)
+            except BaseException:
+                # e.g. cancelled: give back the slot if it was given
+                with self._lock:
+                    if waiter.granted:
+                        self._in_flight -= 1
+                        self._wake_waiters()
+                    else:
+                        self._waiters.remove(waiter)
+                raise
+            if not future.done():
+                self._give_up(waiter, request, max_wait)
+
+        overloaded = False
+        latency = None
+        start = monotonic()
+        try:
+            response = await async_send_request(request)
+        except HTTPTimeoutError:
+            overloaded = True
+            raise
+        else:
+            overloaded = self._is_overload_status_code(response.status_code)
+            latency = monotonic() - start
+        finally:
+            self._release(overloaded=overloaded, latency=latency)
+        return response
+
+
+class HTTPBulkhead(HTTPConcurrencyLimiter):
+    # a concurrency limiter whose limit never changes, and which rejects the requests
+    # that cannot be sent in time with a dedicated exception
+    def __init__(self, max_concurrent: int = 10, *, max_wait: float = 0.0) -> None:
+        super().__init__(
+            max_concurrent,
+            min_limit=max_concurrent,
+            max_limit=max_concurrent,
+            max_wait=max_wait,
+        )
+        self.max_concurrent = max_concurrent
+
+    def _wait_error(self, request: HTTPRequest, max_wait: float) -> HTTPError:
+        return HTTPBulkheadFullError(
+            max_concurrent=self.max_concurrent, max_wait=max_wait, request=request
+        )
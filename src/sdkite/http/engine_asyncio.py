@@ -0,0 +1,400 @@
+import asyncio
+from contextlib import suppress
+import json
+import re
+import ssl
+import sys
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import SplitResult, urlsplit
+
+from sdkite.http.exceptions import HTTPConnectionError, HTTPError, HTTPTimeoutError
+from sdkite.http.model import (
+    _CONNECT_TIMEOUT,
+    _DATA_CHUNK_SIZE,
+    _IDEMPOTENT_METHODS,
+    _READ_TIMEOUT,
+    _READ_TIMEOUT_STREAM,
+    HTTPAsyncResponse,
+    HTTPHeaderDict,
+    HTTPRequest,
+    _decode_text,
+)
+from sdkite.http.utils import create_decoders
+from sdkite.utils import LockResetAfterFork, last_not_none
+
+if sys.version_info < (3, 9):  # pragma: no cover
+    from typing import AsyncIterator, Callable, Iterable
+else:  # pragma: no cover
+    from collections.abc import AsyncIterator, Callable, Iterable
+
+
+# same checks as http.client, to prevent injecting headers or requests
+_LEGAL_HEADER_NAME = re.compile(r"[^:\s][^:\r\n\0]*")
+_ILLEGAL_HEADER_VALUE = re.compile(r"[\r\n\0]")
+_ILLEGAL_TARGET = re.compile(r"[\x00-\x20\x7f]")
+
+_ConnectionKey = Tuple[str, str, int]
+
+
+class _Connection:
+    __slots__ = ["key", "loop", "reader", "writer"]
+
+    def __init__(
+        self,
+        key: _ConnectionKey,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        self.key = key
+        self.loop = asyncio.get_running_loop()
+        self.reader = reader
+        self.writer = writer
+
+    @property
+    def usable(self) -> bool:
+        return not self.writer.is_closing() and not self.reader.at_eof()
+
+    def close(self) -> None:
+        # the event loop of the connection may already be closed
+        with suppress(Exception):
+            self.writer.close()
+
+
+class HTTPResponseAsyncio(HTTPAsyncResponse):
+    def __init__(
+        self,
+        connection: _Connection,
+        *,
+        status_code: int,
+        reason: str,
+        headers: HTTPHeaderDict,
+        body: AsyncIterator[bytes],
+        on_complete: Callable[[], None],
+        decode_content: bool = True,
+    ) -> None:
+        self._connection = connection
+        self._status_code = status_code
+        self._reason = reason
+        self._headers = headers
+        self._body = body
+        self._on_complete = on_complete
+        self._decode_content = decode_content
+        self._complete = False
+        self._content: Optional[bytes] = None
+
+    @property
+    def raw(self) -> asyncio.StreamReader:
+        return self._connection.reader
+
+    @property
+    def status_code(self) -> int:
+        return self._status_code
+
+    @property
+    def reason(self) -> str:
+        return self._reason
+
+    @property
+    def headers(self) -> HTTPHeaderDict:
+        return self._headers
+
+    @property
+    def data_stream(self) -> AsyncIterator[bytes]:
+        if self._content is not None:
+            return _iter_chunks((self._content,))
+        return self._iter_body()
+
+    async def data_bytes(self) -> bytes:
+        if self._content is None:
+            self._content = await self._join_data(self._iter_body())
+        return self._content
+
+    async def data_str(self) -> str:
+        return _decode_text(await self.data_bytes(), self._headers)
+
+    async def data_json(self) -> object:
+        return json.loads(await self.data_bytes())
+
+    async def _iter_body(self) -> AsyncIterator[bytes]:
+        decoders = []
+        if self._decode_content:
+            decoders = create_decoders(self._headers.get("content-encoding", ""))
+        # without a maximal length, the decoders never keep output data pending
+        async for chunk in self._body:
+            for decoder in decoders:
+                chunk = decoder.decompress(chunk)  # noqa: PLW2901
+            if chunk:
+                yield chunk
+        self._complete = True
+        self._on_complete()
+
+    def _close(self) -> None:
+        if not self._complete:
+            # the connection cannot be reused if the body has not been read entirely
+            self._complete = True
+            self._connection.close()
+
+
+async def _read_with_length(
+    reader: asyncio.StreamReader, length: int, timeout: float
+) -> AsyncIterator[bytes]:
+    while length > 0:
+        data = await asyncio.wait_for(
+            reader.read(min(length, _DATA_CHUNK_SIZE)), timeout
+        )
+        if not data:
+            raise asyncio.IncompleteReadError(b"", length)
+        length -= len(data)
+        yield data
+
+
+async def _read_chunked(
+    reader: asyncio.StreamReader, timeout: float
+) -> AsyncIterator[bytes]:
+    while True:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+        try:
+            size = int(line.split(b";", 1)[0], 16)
+        except ValueError:
+            raise ValueError(f"Invalid chunk size: {line!r}") from None
+        if size == 0:
+            break
+        yield await asyncio.wait_for(reader.readexactly(size), timeout)
+        await asyncio.wait_for(reader.readexactly(2), timeout)  # CRLF
+    # skip trailers
+    while (await asyncio.wait_for(reader.readline(), timeout)).strip():
+        pass
+
+
+async def _read_until_eof(
+    reader: asyncio.StreamReader, timeout: float
+) -> AsyncIterator[bytes]:
+    while True:
+        data = await asyncio.wait_for(reader.read(_DATA_CHUNK_SIZE), timeout)
+        if not data:
+            return
+        yield data
+
+
+async def _iter_chunks(chunks: Iterable[bytes]) -> AsyncIterator[bytes]:
+    for chunk in chunks:
+        yield chunk
+
+
+class HTTPEngineAsyncio(LockResetAfterFork):
+    def __init__(
+        self,
+        *,
+        max_idle_connections: int = 10,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> None:
+        self.max_idle_connections = max_idle_connections
+        # the connections can only be used by the event loop which opened them
+        self._idle_connections: Dict[
+            Tuple[asyncio.AbstractEventLoop, _ConnectionKey], List[_Connection]
+        ] = {}
+        self._ssl_context = ssl_context  # created on first use if None
+        self._init_lock()  # the event loops may run in different threads
+
+    def _after_fork(self) -> None:
+        # in the child process: the connections of the parent must not be shared
+        # (they are dropped without being closed, which would affect the parent)
+        super()._after_fork()
+        self._idle_connections = {}
+
+    async def __call__(self, request: HTTPRequest) -> HTTPAsyncResponse:
+        try:
+            url = urlsplit(request.url)
+            if url.scheme not in ("http", "https") or not url.hostname:
+                raise ValueError(f"Unsupported URL: {request.url!r}")
+            key = (url.scheme, url.hostname, url.port or _default_port(url.scheme))
+            data = self._serialize_request(request, url)
+            timeout = last_not_none(
+                (request.timeout_read,),
+                _READ_TIMEOUT_STREAM if request.stream_response else _READ_TIMEOUT,
+            )
+
+            connection = self._get_idle_connection(key)
+            response = None
+            if connection is not None:
+                # the server may have closed the idle connection: send the request
+                # again on a new one, unless it may have been processed
+                try:
+                    response = await self._exchange(connection, request, data, timeout)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    if request.method not in _IDEMPOTENT_METHODS:
+                        raise
+            if response is None:
+                connection = await self._connect(
+                    key, last_not_none((request.timeout_connect,), _CONNECT_TIMEOUT)
+                )
+                response = await self._exchange(connection, request, data, timeout)
+
+            if not request.stream_response:
+                try:
+                    await response.data_bytes()
+                except BaseException:
+                    response._close()  # noqa: SLF001
+                    raise
+        except asyncio.TimeoutError as ex:
+            raise HTTPTimeoutError.from_exception(ex, request=request) from ex
+        except (OSError, asyncio.IncompleteReadError) as ex:
+            raise HTTPConnectionError.from_exception(ex, request=request) from ex
+        except Exception as ex:  # noqa: BLE001
+            raise HTTPError.from_exception(ex, request=request) from ex
+
+        return response
+
+    def close(self) -> None:
+        with self._lock:
+            for connections in self._idle_connections.values():
+                for connection in connections:
+                    connection.close()
+            self._idle_connections.clear()
+
+    def _get_idle_connection(self, key: _ConnectionKey) -> Optional[_Connection]:
+        with self._lock:
+            connections = self._idle_connections.get(
+                (asyncio.get_running_loop(), key), []
+            )
+            while connections:
+                connection = connections.pop()
+                if connection.usable:
+                    return connection
+                connection.close()
+        return None
+
+    def _release_connection(self, connection: _Connection) -> None:
+        with self._lock:
+            # the connections of the closed event loops cannot be used anymore
+            for loop_key in [
+                key for key in self._idle_connections if key[0].is_closed()
+            ]:
+                del self._idle_connections[loop_key]
+            connections = self._idle_connections.setdefault(
+                (connection.loop, connection.key), []
+            )
+            if len(connections) < self.max_idle_connections and connection.usable:
+                connections.append(connection)
+                return
+        connection.close()
+
+    async def _connect(self, key: _ConnectionKey, timeout: float) -> _Connection:
+        scheme, host, port = key
+        ssl_context = None
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            ssl_context = self._ssl_context
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=ssl_context),
+            timeout,
+        )
+        return _Connection(key, reader, writer)
+
+    @staticmethod
+    def _serialize_request(request: HTTPRequest, url: SplitResult) -> bytes:
+        body = (
+            request.body if isinstance(request.body, bytes) else b"".join(request.body)
+        )
+
+        headers = HTTPHeaderDict(request.headers)  # copy
+        if "host" not in headers:
+            headers["Host"] = url.netloc.rsplit("@", 1)[-1]
+        if body or request.method in ("POST", "PUT", "PATCH"):
+            headers["Content-Length"] = str(len(body))
+        if request.decode_content and "accept-encoding" not in headers:
+            headers["Accept-Encoding"] = "gzip, deflate"
+
+        target = url.path or "/"
+        if url.query:
+            target = f"{target}?{url.query}"
+        if _ILLEGAL_TARGET.search(target):
+            raise ValueError(f"URL can't contain control characters: {target!r}")
+        lines = [f"{request.method} {target} HTTP/1.1"]
+        for name in headers:
+            value = headers[name]
+            if not _LEGAL_HEADER_NAME.fullmatch(name):
+                raise ValueError(f"Invalid header name: {name!r}")
+            if _ILLEGAL_HEADER_VALUE.search(value):
+                raise ValueError(f"Invalid header value: {value!r}")
+            lines.append(f"{name}: {value}")
+        return "\r\n".join([*lines, "", ""]).encode("latin-1") + body
+
+    async def _exchange(
+        self,
+        connection: _Connection,
+        request: HTTPRequest,
+        data: bytes,
+        timeout: float,
+    ) -> HTTPResponseAsyncio:
+        try:
+            return await self._exchange_head(connection, request, data, timeout)
+        except BaseException:
+            connection.close()
+            raise
+
+    async def _exchange_head(
+        self,
+        connection: _Connection,
+        request: HTTPRequest,
+        data: bytes,
+        timeout: float,
+    ) -> HTTPResponseAsyncio:
+        # send the request and read the response up to the end of the headers
+        reader = connection.reader
+        connection.writer.write(data)
+        await asyncio.wait_for(connection.writer.drain(), timeout)
+
+        while True:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            if not line:
+                raise asyncio.IncompleteReadError(b"", None)
+            version, status, *reason = line.decode("latin-1").split(None, 2)
+            status_code = int(status)
+            headers = HTTPHeaderDict()
+            while True:
+                line = await asyncio.wait_for(reader.readline(), timeout)
+                if not line:
+                    raise asyncio.IncompleteReadError(b"", None)
+                if not line.strip():
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers.add(name.strip(), value.strip())
+            # skip informational responses such as '100 Continue'
+            if not 100 <= status_code < 200:  # noqa: PLR2004
+                break
+
+        keep_alive = (
+            version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        )
+        body: AsyncIterator[bytes]
+        if request.method == "HEAD" or status_code in (204, 304):
+            body = _iter_chunks(())
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            body = _read_chunked(reader, timeout)
+        elif "content-length" in headers:
+            body = _read_with_length(reader, int(headers["content-length"]), timeout)
+        else:
+            body = _read_until_eof(reader, timeout)
+            keep_alive = False
+
+        def on_complete() -> None:
+            if keep_alive:
+                self._release_connection(connection)
+            else:
+                connection.close()
+
+        return HTTPResponseAsyncio(
+            connection,
+            status_code=status_code,
+            reason=reason[0].strip() if reason else "",
+            headers=headers,
+            body=body,
+            on_complete=on_complete,
+            decode_content=request.decode_content,
+        )
+
+
+def _default_port(scheme: str) -> int:
+    return 443 if scheme == "https" else 80
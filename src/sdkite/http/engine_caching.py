@@ -0,0 +1,379 @@
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import dataclass, replace
+from email.utils import parsedate_to_datetime
+from hashlib import sha256
+from http import HTTPStatus
+import json
+from pathlib import Path
+import sys
+from tempfile import NamedTemporaryFile
+from time import time
+from typing import TYPE_CHECKING, Dict, Optional, Union
+
+from sdkite.http._stringescape import stringescape_dumps, stringescape_loads
+from sdkite.http.engine_coalescing import HTTPResponseCoalesced
+from sdkite.http.model import HTTPHeaderDict, HTTPRequest, HTTPResponse
+from sdkite.utils import LockResetAfterFork
+
+if sys.version_info < (3, 9):  # pragma: no cover
+    from typing import Callable
+else:  # pragma: no cover
+    from collections.abc import Callable
+
+if TYPE_CHECKING:  # pragma: no cover
+    from os import PathLike
+
+# status codes whose responses can be stored (RFC 9110 section 15.1)
+_CACHEABLE_STATUS_CODES = frozenset((200, 203, 204, 300, 301, 308, 404, 405, 410, 414))
+
+# headers of a 304 response not used to update the stored response
+_NOT_UPDATED_HEADERS = frozenset(
+    ("content-encoding", "content-length", "transfer-encoding")
+)
+
+
+@dataclass
+class HTTPCacheEntry:
+    status_code: int
+    reason: str
+    headers: HTTPHeaderDict
+    body: bytes
+    stored_at: float  # timestamp, taking into account the age of the response
+    vary: Dict[str, Optional[str]]  # values of the request headers listed in Vary
+
+
+@dataclass(frozen=True)
+class HTTPCacheStats:
+    hits: int  # served from the cache
+    revalidations: int  # served from the cache after a 304 response
+    misses: int  # served from the wrapped engine
+
+
+class HTTPCacheStorage(ABC):
+    @abstractmethod
+    def load(self, key: str) -> Optional[HTTPCacheEntry]:
+        """
+        The entry stored for that key, or None
+        """
+
+    @abstractmethod
+    def save(self, key: str, entry: HTTPCacheEntry) -> None:
+        """
+        Store the entry for that key, replacing any previous one
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Remove the entry stored for that key, if any
+        """
+
+
+class HTTPCacheMemoryStorage(LockResetAfterFork, HTTPCacheStorage):
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, HTTPCacheEntry]" = OrderedDict()
+        self._init_lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self, key: str) -> Optional[HTTPCacheEntry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def save(self, key: str, entry: HTTPCacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)  # least recently used
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+
+class HTTPCacheDirectoryStorage(HTTPCacheStorage):
+    def __init__(self, path: Union[str, "PathLike[str]"]) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, key: str) -> Path:
+        return self.path / f"{sha256(key.encode()).hexdigest()}.json"
+
+    def load(self, key: str) -> Optional[HTTPCacheEntry]:
+        try:
+            with self._entry_path(key).open() as entry_fp:
+                item = json.load(entry_fp)
+            return HTTPCacheEntry(
+                status_code=item["status_code"],
+                reason=item["reason"],
+                headers=HTTPHeaderDict(item["headers"]),
+                body=stringescape_loads(item["body"]),
+                stored_at=item["stored_at"],
+                vary=item["vary"],
+            )
+        except (OSError, ValueError, LookupError, TypeError):
+            # missing entry, or corrupted file
+            return None
+
+    def save(self, key: str, entry: HTTPCacheEntry) -> None:
+        # write to a temporary file first, so that other readers never see a
+        # partially-written entry
+        with NamedTemporaryFile(
+            "w", dir=self.path, suffix=".tmp", delete=False
+        ) as entry_fp:
+            json.dump(
+                {
+                    "status_code": entry.status_code,
+                    "reason": entry.reason,
+                    "headers": dict(entry.headers),
+                    "body": stringescape_dumps(entry.body),
+                    "stored_at": entry.stored_at,
+                    "vary": entry.vary,
+                },
+                entry_fp,
+            )
+        Path(entry_fp.name).replace(self._entry_path(key))
+
+    def delete(self, key: str) -> None:
+        with suppress(FileNotFoundError):
+            self._entry_path(key).unlink()
+
+
+class HTTPResponseCached(HTTPResponseCoalesced):
+    def __init__(
+        self, entry: HTTPCacheEntry, *, raw: object, cache_status: str
+    ) -> None:
+        super().__init__(
+            raw=raw,
+            status_code=entry.status_code,
+            reason=entry.reason,
+            headers=entry.headers,
+            body=entry.body,
+        )
+        self.cache_status = cache_status  # "hit", "revalidated" or "miss"
+
+
+def _parse_cache_control(headers: HTTPHeaderDict) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for directive in headers.get("cache-control", "").split(","):
+        name, sep, value = directive.partition("=")
+        name = name.strip().lower()
+        if name:
+            directives[name] = value.strip().strip('"') if sep else None
+    return directives
+
+
+def _parse_seconds(value: Optional[str]) -> int:
+    try:
+        return max(0, int(value or ""))
+    except ValueError:
+        return 0
+
+
+def _freshness_lifetime(entry: HTTPCacheEntry, *, shared: bool) -> float:
+    cache_control = _parse_cache_control(entry.headers)
+    if shared and "s-maxage" in cache_control:
+        return _parse_seconds(cache_control["s-maxage"])
+    if "max-age" in cache_control:
+        return _parse_seconds(cache_control["max-age"])
+    if "expires" in entry.headers:
+        try:
+            expires = parsedate_to_datetime(entry.headers["expires"]).timestamp()
+            date = (
+                parsedate_to_datetime(entry.headers["date"]).timestamp()
+                if "date" in entry.headers
+                else entry.stored_at
+            )
+        except (TypeError, ValueError):
+            return 0  # invalid dates mean already expired
+        return max(0.0, expires - date)
+    return 0
+
+
+def cache_key(request: HTTPRequest) -> str:
+    """
+    Default key of HTTPEngineCaching: the URL of the request, whether the content of
+    the response is decoded, and a hash of the Authorization header of the request,
+    so that a response is not returned to other credentials.
+    """
+    key = f"{request.url} decode_content={request.decode_content}"
+    authorization = request.headers.get("authorization")
+    if authorization is not None:
+        key += f" authorization={sha256(authorization.encode()).hexdigest()}"
+    return key
+
+
+class HTTPEngineCaching(LockResetAfterFork):
+    def __init__(
+        self,
+        engine: Optional[Callable[[HTTPRequest], HTTPResponse]] = None,
+        *,
+        storage: Optional[HTTPCacheStorage] = None,
+        shared: bool = False,
+        key: Callable[[HTTPRequest], str] = cache_key,
+    ) -> None:
+        if engine is None:
+            # imported here so that 'requests' is only imported when actually used
+            from sdkite.http.engine_requests import (  # pylint: disable=import-outside-toplevel
+                HTTPEngineRequests,
+            )
+
+            engine = HTTPEngineRequests()
+        self.engine = engine
+        self.storage = HTTPCacheMemoryStorage() if storage is None else storage
+        self.shared = shared
+        self.key = key
+        self._hits = self._revalidations = self._misses = 0
+        self._init_lock()  # of the statistics
+
+    def stats(self) -> HTTPCacheStats:
+        with self._lock:
+            return HTTPCacheStats(
+                hits=self._hits,
+                revalidations=self._revalidations,
+                misses=self._misses,
+            )
+
+    def _count(self, cache_status: str) -> None:
+        with self._lock:
+            if cache_status == "hit":
+                self._hits += 1
+            elif cache_status == "revalidated":
+                self._revalidations += 1
+            else:
+                self._misses += 1
+
+    def _is_storable(self, request: HTTPRequest, response: HTTPResponse) -> bool:
+        cache_control = _parse_cache_control(response.headers)
+        return (
+            response.status_code in _CACHEABLE_STATUS_CODES
+            and "no-store" not in cache_control
+            and "no-store" not in _parse_cache_control(request.headers)
+            and response.headers.get("vary", "").strip() != "*"
+            # useless to store if it can neither be fresh nor be revalidated
+            and (
+                "max-age" in cache_control
+                or "s-maxage" in cache_control
+                or any(
+                    name in response.headers
+                    for name in ("expires", "etag", "last-modified")
+                )
+            )
+            and not (
+                self.shared
+                and (
+                    "private" in cache_control
+                    or (
+                        "authorization" in request.headers
+                        and "public" not in cache_control
+                        and "s-maxage" not in cache_control
+                    )
+                )
+            )
+        )
+
+    def _can_use_without_revalidation(
+        self, request: HTTPRequest, entry: HTTPCacheEntry
+    ) -> bool:
+        request_cache_control = _parse_cache_control(request.headers)
+        if "no-cache" in request_cache_control or "no-cache" in _parse_cache_control(
+            entry.headers
+        ):
+            return False
+        age = time() - entry.stored_at
+        lifetime = _freshness_lifetime(entry, shared=self.shared)
+        if "max-age" in request_cache_control:
+            lifetime = min(lifetime, _parse_seconds(request_cache_control["max-age"]))
+        return age < lifetime
+
+    def __call__(self, request: HTTPRequest) -> HTTPResponse:
+        if request.method != "GET":
+            response = self.engine(request)
+            if (
+                request.method not in ("HEAD", "OPTIONS")
+                and response.status_code < HTTPStatus.BAD_REQUEST
+            ):
+                # unsafe methods invalidate the stored response (RFC 9111 section 4.4)
+                self.storage.delete(self.key(replace(request, method="GET")))
+            return response
+
+        if (
+            request.stream_response
+            or "no-store" in _parse_cache_control(request.headers)
+            or any(
+                name in request.headers
+                for name in ("if-none-match", "if-modified-since", "range")
+            )
+        ):
+            # not handled by the cache
+            return self.engine(request)
+
+        key = self.key(request)
+        entry = self.storage.load(key)
+        if entry is not None and any(
+            request.headers.get(name) != value for name, value in entry.vary.items()
+        ):
+            entry = None  # stored for a different variant
+
+        if entry is not None and self._can_use_without_revalidation(request, entry):
+            self._count("hit")
+            return HTTPResponseCached(entry, raw=entry, cache_status="hit")
+        if entry is not None and not any(
+            name in entry.headers for name in ("etag", "last-modified")
+        ):
+            entry = None  # stale, and cannot be revalidated
+
+        real_request = request
+        if entry is not None:
+            # conditional request (RFC 9111 section 4.3.1)
+            headers = HTTPHeaderDict(request.headers)  # copy
+            if "etag" in entry.headers:
+                headers["If-None-Match"] = entry.headers["etag"]
+            if "last-modified" in entry.headers:
+                headers["If-Modified-Since"] = entry.headers["last-modified"]
+            real_request = replace(request, headers=headers)
+
+        response = self.engine(real_request)
+
+        if entry is not None and response.status_code == HTTPStatus.NOT_MODIFIED:
+            with response:
+                headers = HTTPHeaderDict(entry.headers)  # copy
+                for name, value in response.headers.items():
+                    if name.lower() not in _NOT_UPDATED_HEADERS:
+                        headers[name] = value
+                entry = replace(
+                    entry,
+                    headers=headers,
+                    stored_at=time() - _parse_seconds(response.headers.get("age")),
+                )
+            self.storage.save(key, entry)
+            self._count("revalidated")
+            return HTTPResponseCached(entry, raw=response, cache_status="revalidated")
+
+        self._count("miss")
+        if not self._is_storable(request, response):
+            return response
+
+        with response:
+            entry = HTTPCacheEntry(
+                status_code=response.status_code,
+                reason=response.reason,
+                headers=HTTPHeaderDict(response.headers),  # copy
+                body=response.data_bytes,
+                stored_at=time() - _parse_seconds(response.headers.get("age")),
+                vary={
+                    name.strip().lower(): request.headers.get(name.strip())
+                    for name in response.headers.get("vary", "").split(",")
+                    if name.strip()
+                },
+            )
+        self.storage.save(key, entry)
+        return HTTPResponseCached(entry, raw=response, cache_status="miss")
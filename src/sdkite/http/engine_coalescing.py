@@ -0,0 +1,189 @@
+import json
+import sys
+from threading import Event
+from typing import Any, Dict, Optional
+
+from sdkite.http.exceptions import HTTPConnectionError, HTTPError, HTTPTimeoutError
+from sdkite.http.model import (
+    _CONNECT_TIMEOUT,
+    _READ_TIMEOUT,
+    HTTPHeaderDict,
+    HTTPRequest,
+    HTTPResponse,
+    _decode_text,
+)
+from sdkite.utils import LockResetAfterFork, last_not_none
+
+if sys.version_info < (3, 8):  # pragma: no cover
+    from backports.cached_property import cached_property
+else:  # pragma: no cover
+    from functools import cached_property
+
+if sys.version_info < (3, 9):  # pragma: no cover
+    from typing import Callable, Hashable, Iterator
+else:  # pragma: no cover
+    from collections.abc import Callable, Hashable, Iterator
+
+
+class HTTPResponseCoalesced(HTTPResponse):
+    def __init__(
+        self,
+        *,
+        raw: object,
+        status_code: int,
+        reason: str,
+        headers: HTTPHeaderDict,
+        body: bytes,
+    ) -> None:
+        self._raw = raw
+        self._status_code = status_code
+        self._reason = reason
+        self._headers = HTTPHeaderDict(headers)  # copy
+        self._body = body
+
+    @property
+    def raw(self) -> object:
+        return self._raw
+
+    @property
+    def status_code(self) -> int:
+        return self._status_code
+
+    @property
+    def reason(self) -> str:
+        return self._reason
+
+    @property
+    def headers(self) -> HTTPHeaderDict:
+        return self._headers
+
+    @cached_property
+    def data_stream(self) -> Iterator[bytes]:
+        return self._iter_data(0)
+
+    @property
+    def data_bytes(self) -> bytes:
+        return self._join_data(self._iter_data(0))
+
+    @property
+    def data_str(self) -> str:
+        return _decode_text(self.data_bytes, self._headers)
+
+    @cached_property
+    def data_json(self) -> object:
+        return json.loads(self.data_bytes)
+
+    def _iter_data(self, _: int) -> Iterator[bytes]:
+        return iter((self._body,) if self._body else ())
+
+
+class _InFlight:
+    __slots__ = ["done", "response_kwargs", "exception"]
+
+    def __init__(self) -> None:
+        self.done = Event()
+        self.response_kwargs: Dict[str, Any] = {}
+        self.exception: Optional[BaseException] = None
+
+
+def coalescing_key(request: HTTPRequest) -> Optional[Hashable]:
+    """
+    Default key of HTTPEngineCoalescing: GET and HEAD requests without body are
+    coalesced when their URL, headers and content decoding are the same.
+
+    Requests with stream_response set (e.g. when data_memory_limit is used) are not
+    coalesced, as the body of the response would be loaded in memory.
+    """
+    if (
+        request.method not in ("GET", "HEAD")
+        or request.body != b""
+        or request.stream_response
+    ):
+        return None
+    return (
+        request.method,
+        request.url,
+        tuple(sorted((name.lower(), value) for name, value in request.headers.items())),
+        request.decode_content,
+    )
+
+
+def _follower_error(exception: BaseException, request: HTTPRequest) -> HTTPError:
+    # each caller gets its own exception, as raising the same one from several threads
+    # would mix up its traceback and context
+    if isinstance(exception, (HTTPConnectionError, HTTPTimeoutError)):
+        return type(exception)(msg=str(exception), request=request)
+    return HTTPError.from_exception(exception, request=request)
+
+
+class HTTPEngineCoalescing(LockResetAfterFork):
+    def __init__(
+        self,
+        engine: Optional[Callable[[HTTPRequest], HTTPResponse]] = None,
+        *,
+        key: Callable[[HTTPRequest], Optional[Hashable]] = coalescing_key,
+    ) -> None:
+        if engine is None:
+            # imported here so that 'requests' is only imported when actually used
+            from sdkite.http.engine_requests import (  # pylint: disable=import-outside-toplevel
+                HTTPEngineRequests,
+            )
+
+            engine = HTTPEngineRequests()
+        self.engine = engine
+        self.key = key
+        self._in_flight: Dict[Hashable, _InFlight] = {}
+        self._init_lock()
+
+    def _after_fork(self) -> None:
+        # in the child process: the requests in flight are sent by threads of the
+        # parent, so their responses would never be received
+        super()._after_fork()
+        self._in_flight = {}
+
+    def __call__(self, request: HTTPRequest) -> HTTPResponse:
+        key = self.key(request)
+        if key is None:
+            return self.engine(request)
+
+        with self._lock:
+            in_flight = self._in_flight.get(key)
+            leader = in_flight is None
+            if in_flight is None:
+                in_flight = self._in_flight[key] = _InFlight()
+
+        if leader:
+            try:
+                with self.engine(request) as response:
+                    in_flight.response_kwargs = {
+                        # response of the wrapped engine
+                        "raw": response,
+                        "status_code": response.status_code,
+                        "reason": response.reason,
+                        "headers": response.headers,
+                        "body": response.data_bytes,
+                    }
+            except BaseException as ex:
+                in_flight.exception = ex
+                raise
+            finally:
+                # next identical requests are sent again
+                with self._lock:
+                    del self._in_flight[key]
+                in_flight.done.set()
+        else:
+            # not longer than the request would take if it was sent
+            timeout = last_not_none((request.timeout_connect,), _CONNECT_TIMEOUT)
+            timeout += last_not_none((request.timeout_read,), _READ_TIMEOUT)
+            if not in_flight.done.wait(timeout):
+                raise HTTPTimeoutError(
+                    msg=f"Waited more than {timeout}s for an identical request",
+                    request=request,
+                )
+            if in_flight.exception is not None:
+                raise _follower_error(
+                    in_flight.exception, request
+                ) from in_flight.exception
+
+        # each caller gets its own response object
+        return HTTPResponseCoalesced(**in_flight.response_kwargs)
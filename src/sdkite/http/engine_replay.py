@@ -1,11 +1,13 @@
 from copy import deepcopy
 from dataclasses import replace
+from itertools import chain
 import json
 from pathlib import Path
 import re
 import sys
 import time
 from typing import Callable, Dict, List, Optional, Tuple, Union, cast
+import zlib
 
 from sdkite.http._stringescape import stringescape_dumps, stringescape_loads
 from sdkite.http.engine_requests import HTTPEngineRequests
@@ -32,13 +34,18 @@ class _RecordedRequest(TypedDict):
     body: bytes
 
 
-class _RecordedResponse(TypedDict):
+class _RecordedResponseBase(TypedDict):
     status_code: int
     reason: str
     headers: Dict[str, str]
     body: List[bytes]
 
 
+class _RecordedResponse(_RecordedResponseBase, total=False):
+    # whether the body has been recorded without decoding the content
+    body_encoded: bool
+
+
 class HTTPResponseReplay(HTTPResponse):
     def __init__(self, recorded_response: _RecordedResponse) -> None:
         self.recorded_response = recorded_response
@@ -66,13 +73,12 @@ class HTTPResponseReplay(HTTPResponse):
     @property
     def data_bytes(self) -> bytes:
         try:
-            parts = [next(self.data_stream)]
+            first_part = next(self.data_stream)
         except StopIteration:
             raise ValueError(
                 "The data_xxx attributes can be only accessed once with the replay engine"
             ) from None
-        parts.extend(self.data_stream)
-        return b"".join(parts)
+        return self._join_data(chain((first_part,), self.data_stream))
 
     @property
     def data_str(self) -> str:
@@ -104,6 +110,46 @@ class HTTPResponseReplay(HTTPResponse):
         return HTTPResponseReplay(recorded_response)
 
 
+def _decode_body(body: List[bytes], content_encoding: str) -> List[bytes]:
+    for encoding in reversed(content_encoding.split(",")):
+        encoding = encoding.strip().lower()  # noqa: PLW2901
+        if encoding in ("gzip", "x-gzip"):
+            decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        elif encoding == "deflate":
+            decompressor = zlib.decompressobj()
+        elif encoding == "identity":
+            continue
+        else:
+            raise ValueError(
+                f"Content encoding {encoding!r} is not supported by the replay engine"
+            )
+        body = [decompressor.decompress(part) for part in body]
+        body.append(decompressor.flush())
+    return body
+
+
+def _adapt_recorded_response(
+    recorded_response: _RecordedResponse, *, decode_content: bool
+) -> _RecordedResponse:
+    body_encoded = recorded_response.get("body_encoded", False)
+    if decode_content == (not body_encoded):
+        return recorded_response
+    recorded_response = cast(_RecordedResponse, deepcopy(recorded_response))
+    headers = HTTPHeaderDict(recorded_response["headers"])
+    if decode_content:
+        # keep headers like the requests engine does
+        recorded_response["body"] = _decode_body(
+            recorded_response["body"], headers.get("content-encoding", "")
+        )
+        del recorded_response["body_encoded"]
+    else:
+        # the body is already decoded, so it is sent without encoding
+        headers.pop("content-encoding", None)
+        recorded_response["headers"] = dict(headers)
+        recorded_response["body_encoded"] = True
+    return recorded_response
+
+
 def _default_recording_compute_basename(request: HTTPRequest, _: HTTPResponse) -> str:
     return re.sub(
         "[^a-zA-Z0-9]", "_", f"{time.time():.0f} {request.method.lower()} {request.url}"
@@ -194,16 +240,17 @@ class HTTPEngineReplay:
 
             real_request = self.recording_request_modifier(deepcopy(request))
             with self.engine(real_request) as real_response:
-                received_response = HTTPResponseReplay(
-                    _RecordedResponse(
-                        status_code=real_response.status_code,
-                        reason=real_response.reason,
-                        headers=dict(real_response.headers),
-                        body=list(real_response.data_stream)
-                        if real_request.stream_response
-                        else [real_response.data_bytes],
-                    )
+                recorded_response = _RecordedResponse(
+                    status_code=real_response.status_code,
+                    reason=real_response.reason,
+                    headers=dict(real_response.headers),
+                    body=list(real_response.data_stream)
+                    if real_request.stream_response
+                    else [real_response.data_bytes],
                 )
+                if not real_request.decode_content:
+                    recorded_response["body_encoded"] = True
+                received_response = HTTPResponseReplay(recorded_response)
             response = self.recording_response_modifier(received_response)
 
             # save recorded response
@@ -233,7 +280,11 @@ class HTTPEngineReplay:
         else:
             for req, resp in self.recorded:
                 if req == recorded_request:
-                    response = HTTPResponseReplay(resp)
+                    response = HTTPResponseReplay(
+                        _adapt_recorded_response(
+                            resp, decode_content=request.decode_content
+                        )
+                    )
                     break
             else:
                 raise ValueError(
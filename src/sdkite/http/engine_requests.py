@@ -1,11 +1,28 @@
+from dataclasses import dataclass
+from mmap import mmap
 import sys
+from threading import local
+from typing import TYPE_CHECKING, Any, List, Optional, Union, cast
 
 import requests
 import urllib3
 
+from sdkite.http.engine_urllib3 import _open_connections
 from sdkite.http.exceptions import HTTPConnectionError, HTTPError, HTTPTimeoutError
-from sdkite.http.model import HTTPHeaderDict, HTTPRequest, HTTPResponse
-from sdkite.utils import walk_exception_context
+from sdkite.http.model import (
+    _CONNECT_TIMEOUT,
+    _DATA_CHUNK_SIZE,
+    _READ_TIMEOUT,
+    _READ_TIMEOUT_STREAM,
+    HTTPHeaderDict,
+    HTTPRequest,
+    HTTPResponse,
+)
+from sdkite.utils import (
+    last_not_none,
+    register_after_fork,
+    walk_exception_context,
+)
 
 if sys.version_info < (3, 8):  # pragma: no cover
     from backports.cached_property import cached_property
@@ -17,10 +34,18 @@ if sys.version_info < (3, 9):  # pragma: no cover
 else:  # pragma: no cover
     from collections.abc import Iterator
 
+if TYPE_CHECKING:  # pragma: no cover
+    import ssl
+
 
 class HTTPResponseRequests(HTTPResponse):
-    def __init__(self, response: requests.Response) -> None:
+    # pylint: disable=protected-access
+
+    def __init__(
+        self, response: requests.Response, *, decode_content: bool = True
+    ) -> None:
         self._response = response
+        self._decode_content = decode_content
 
     @property
     def raw(self) -> requests.Response:
@@ -40,20 +65,55 @@ class HTTPResponseRequests(HTTPResponse):
 
     @cached_property
     def data_stream(self) -> Iterator[bytes]:
-        return self._response.iter_content()
+        return self._iter_data(1)
 
     @property
     def data_bytes(self) -> bytes:
+        self._load_content()
         return self._response.content
 
     @property
     def data_str(self) -> str:
+        self._load_content()
         return self._response.text
 
     @cached_property
     def data_json(self) -> object:
+        self._load_content()
         return self._response.json()
 
+    @property
+    def data_buffer(self) -> Union[bytes, mmap]:
+        if self._data_memory_limit is None or self._content_loaded:
+            return self.data_bytes
+        data = super().data_buffer
+        if isinstance(data, bytes):
+            self._response._content = data  # noqa: SLF001
+        return data
+
+    @property
+    def _content_loaded(self) -> bool:
+        # requests uses False for content not yet loaded, unlike its type hints
+        return self._response._content is not False  # type: ignore[comparison-overlap]  # noqa: SLF001
+
+    def _load_content(self) -> None:
+        # make requests aware of the content when it has been loaded by us
+        # so that the memory limit and the content decoding are taken into account
+        if self._content_loaded:
+            return
+        if self._data_memory_limit is not None or not self._decode_content:
+            self._response._content = self._join_data(  # noqa: SLF001
+                self._iter_data(_DATA_CHUNK_SIZE)
+            )
+
+    def _iter_data(self, chunk_size: int) -> Iterator[bytes]:
+        if self._decode_content or self._content_loaded:
+            return self._response.iter_content(chunk_size)
+        return cast(
+            Iterator[bytes],
+            self._response.raw.stream(chunk_size, decode_content=False),
+        )
+
     def _close(self) -> None:
         self._response.close()
 
@@ -65,9 +125,135 @@ def _extract_exception(exception: BaseException) -> BaseException:
     return exception if wanted_exception is None else wanted_exception
 
 
+@dataclass(frozen=True)
+class HTTPPoolStats:
+    scheme: str
+    host: str
+    port: int
+    maxsize: int
+    num_connections: int
+    num_requests: int
+    idle_connections: int
+
+
+class _TransportAdapter(requests.adapters.HTTPAdapter):
+    def __init__(
+        self, *, ssl_context: Optional["ssl.SSLContext"], **kwargs: Any
+    ) -> None:
+        # set before calling super, as it creates the pool manager
+        self._ssl_context = ssl_context
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args: Any, **pool_kwargs: Any) -> None:
+        if self._ssl_context is not None:
+            pool_kwargs["ssl_context"] = self._ssl_context
+        super().init_poolmanager(*args, **pool_kwargs)
+
+    def cert_verify(
+        self, conn: Any, url: str, verify: Union[bool, str], cert: Any
+    ) -> None:
+        super().cert_verify(conn, url, verify, cert)  # type: ignore[no-untyped-call]
+        if verify is True and self._ssl_context is not None:
+            # the certificates are already loaded in the shared context, so avoid
+            # loading them again for each connection
+            conn.ca_certs = conn.ca_cert_dir = None
+
+
 class HTTPEngineRequests:
-    def __init__(self) -> None:
-        self.session = requests.Session()
+    def __init__(
+        self,
+        *,
+        pool_connections: int = requests.adapters.DEFAULT_POOLSIZE,
+        pool_maxsize: int = requests.adapters.DEFAULT_POOLSIZE,
+        pool_block: bool = requests.adapters.DEFAULT_POOLBLOCK,
+        max_retries: int = requests.adapters.DEFAULT_RETRIES,
+        session_per_thread: bool = False,
+        ssl_context: Optional["ssl.SSLContext"] = None,
+    ) -> None:
+        # the connection pools are thread-safe, and shared by all sessions
+        self._transport_adapter = _TransportAdapter(
+            ssl_context=ssl_context,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            pool_block=pool_block,
+        )
+        self._pool_settings = (pool_connections, pool_maxsize, pool_block)
+        self._thread_local = local()
+        self._shared_session = None if session_per_thread else self._create_session()
+        register_after_fork(self)
+
+    def _after_fork(self) -> None:
+        # in the child process: the connections of the parent must not be shared,
+        # so new pools are created (the sessions, with their cookies, are kept)
+        pool_connections, pool_maxsize, pool_block = self._pool_settings
+        self._transport_adapter.init_poolmanager(
+            pool_connections, pool_maxsize, block=pool_block
+        )
+        self._transport_adapter.proxy_manager = {}
+
+    @property
+    def session(self) -> requests.Session:
+        if self._shared_session is not None:
+            return self._shared_session
+        session: Optional[requests.Session] = getattr(
+            self._thread_local, "session", None
+        )
+        if session is None:
+            session = self._create_session()
+            self._thread_local.session = session
+        return session
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        for prefix in ("http://", "https://"):
+            session.mount(prefix, self._transport_adapter)
+        return session
+
+    def pool_stats(self) -> List[HTTPPoolStats]:
+        pools = self._transport_adapter.poolmanager.pools
+        stats = []
+        for key in pools.keys():  # noqa: SIM118
+            pool = pools.get(key)
+            if pool is None or pool.pool is None:  # pragma: no cover
+                # evicted or closed by another thread in the meantime
+                continue
+            stats.append(
+                HTTPPoolStats(
+                    scheme=key.key_scheme,
+                    host=key.key_host,
+                    port=key.key_port,
+                    maxsize=pool.pool.maxsize,
+                    num_connections=pool.num_connections,
+                    num_requests=pool.num_requests,
+                    # the pool queue is pre-filled with None placeholders
+                    idle_connections=sum(
+                        connection is not None for connection in list(pool.pool.queue)
+                    ),
+                )
+            )
+        return sorted(stats, key=lambda stat: (stat.scheme, stat.host, stat.port))
+
+    def warmup(self, url: str, connections: int = 1) -> None:
+        """
+        Open connections to the host of the URL, up to the size of its pool.
+
+        Connection errors are ignored: they are raised by the next request instead.
+        """
+        adapter = self._transport_adapter
+        # same pool as the requests, which depends on the proxy and TLS settings
+        settings = self.session.merge_environment_settings(url, {}, None, None, None)
+        if hasattr(adapter, "get_connection_with_tls_context"):
+            pool = adapter.get_connection_with_tls_context(
+                requests.Request("GET", url).prepare(),
+                settings["verify"],
+                proxies=settings["proxies"],
+                cert=settings["cert"],
+            )
+        else:  # pragma: no cover
+            # requests < 2.32.2
+            pool = adapter.get_connection(url, settings["proxies"])
+        _open_connections(cast(urllib3.HTTPConnectionPool, pool), connections)
 
     def __call__(self, request: HTTPRequest) -> HTTPResponse:
         headers = request.headers
@@ -83,9 +269,18 @@ class HTTPEngineRequests:
                 url=request.url,
                 headers=headers,
                 data=request.body,
-                stream=request.stream_response,
+                # the content is read by the response in case of no decoding
+                stream=request.stream_response or not request.decode_content,
                 allow_redirects=False,
-                timeout=(40, 600 if request.stream_response else 30),
+                timeout=(
+                    last_not_none((request.timeout_connect,), _CONNECT_TIMEOUT),
+                    last_not_none(
+                        (request.timeout_read,),
+                        _READ_TIMEOUT_STREAM
+                        if request.stream_response
+                        else _READ_TIMEOUT,
+                    ),
+                ),
             )
         except (
             requests.exceptions.ConnectionError,
@@ -104,4 +299,4 @@ class HTTPEngineRequests:
                 _extract_exception(ex), request=request
             ) from ex
 
-        return HTTPResponseRequests(response)
+        return HTTPResponseRequests(response, decode_content=request.decode_content)
@@ -0,0 +1,243 @@
+from functools import partial
+import http.client
+import socket
+import ssl
+import sys
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from sdkite.http.exceptions import HTTPConnectionError, HTTPError, HTTPTimeoutError
+from sdkite.http.model import (
+    _CONNECT_TIMEOUT,
+    _IDEMPOTENT_METHODS,
+    _READ_TIMEOUT,
+    _READ_TIMEOUT_STREAM,
+    HTTPHeaderDict,
+    HTTPRequest,
+    HTTPResponse,
+    _HTTPResponseBuffered,
+)
+from sdkite.http.utils import create_decoders
+from sdkite.utils import LockResetAfterFork, last_not_none
+
+if sys.version_info < (3, 8):  # pragma: no cover
+    from backports.cached_property import cached_property
+else:  # pragma: no cover
+    from functools import cached_property
+
+if sys.version_info < (3, 9):  # pragma: no cover
+    from typing import Callable, Iterator
+else:  # pragma: no cover
+    from collections.abc import Callable, Iterator
+
+
+_ConnectionKey = Tuple[str, str, int]
+
+
+class HTTPResponseStdlib(_HTTPResponseBuffered):
+    def __init__(
+        self,
+        connection: http.client.HTTPConnection,
+        response: http.client.HTTPResponse,
+        *,
+        on_complete: Callable[[], None],
+        decode_content: bool = True,
+    ) -> None:
+        self._connection = connection
+        self._response = response
+        self._on_complete = on_complete
+        self._decode_content = decode_content
+        self._complete = False
+
+    @property
+    def raw(self) -> http.client.HTTPResponse:
+        return self._response
+
+    @property
+    def status_code(self) -> int:
+        return self._response.status
+
+    @property
+    def reason(self) -> str:
+        return self._response.reason
+
+    @cached_property
+    def headers(self) -> HTTPHeaderDict:
+        headers = HTTPHeaderDict()
+        for name, value in self._response.getheaders():
+            headers.add(name, value)
+        return headers
+
+    def _iter_body(self, chunk_size: int) -> Iterator[bytes]:
+        decoders = []
+        if self._decode_content:
+            decoders = create_decoders(self.headers.get("content-encoding", ""))
+        while True:
+            chunk = self._response.read(chunk_size)
+            if not chunk:
+                break
+            for decoder in decoders:
+                chunk = decoder.decompress(chunk)
+            if chunk:
+                yield chunk
+        if self._response.length:
+            # http.client does not report bodies shorter than their Content-Length
+            raise http.client.IncompleteRead(b"", self._response.length)
+        self._complete = True
+        if self._response.will_close:
+            self._connection.close()
+        else:
+            self._on_complete()
+
+    def _close(self) -> None:
+        if not self._complete:
+            # the connection cannot be reused if the body has not been read entirely
+            self._complete = True
+            self._connection.close()
+
+
+class HTTPEngineStdlib(LockResetAfterFork):
+    def __init__(
+        self,
+        *,
+        max_idle_connections: int = 10,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ) -> None:
+        self.max_idle_connections = max_idle_connections
+        self._idle_connections: Dict[_ConnectionKey, List[http.client.HTTPConnection]]
+        self._idle_connections = {}
+        self._ssl_context = ssl_context  # created on first use if None
+        self._init_lock()
+
+    def _after_fork(self) -> None:
+        # in the child process: the connections of the parent must not be shared
+        super()._after_fork()
+        self._idle_connections = {}
+
+    def __call__(self, request: HTTPRequest) -> HTTPResponse:
+        try:
+            url = urlsplit(request.url)
+            if url.scheme not in ("http", "https") or not url.hostname:
+                raise ValueError(f"Unsupported URL: {request.url!r}")
+            key = (url.scheme, url.hostname, url.port or _default_port(url.scheme))
+            target = url.path or "/"
+            if url.query:
+                target = f"{target}?{url.query}"
+            timeout = last_not_none(
+                (request.timeout_read,),
+                _READ_TIMEOUT_STREAM if request.stream_response else _READ_TIMEOUT,
+            )
+
+            connection = None
+            if isinstance(request.body, bytes):
+                # iterators cannot be sent again if the idle connection is unusable
+                connection = self._get_idle_connection(key)
+            raw_response = None
+            if connection is not None:
+                # the server may have closed the idle connection: send the request
+                # again on a new one, unless it may have been processed
+                try:
+                    raw_response = self._exchange(connection, request, target, timeout)
+                except (ConnectionError, http.client.BadStatusLine):
+                    if request.method not in _IDEMPOTENT_METHODS:
+                        raise
+            if connection is None or raw_response is None:
+                connection = self._connect(
+                    key, last_not_none((request.timeout_connect,), _CONNECT_TIMEOUT)
+                )
+                raw_response = self._exchange(connection, request, target, timeout)
+
+            response = HTTPResponseStdlib(
+                connection,
+                raw_response,
+                on_complete=partial(self._release_connection, key, connection),
+                decode_content=request.decode_content,
+            )
+
+            if not request.stream_response:
+                try:
+                    response.data_bytes  # noqa: B018
+                except BaseException:
+                    response._close()  # noqa: SLF001
+                    raise
+        except socket.timeout as ex:
+            raise HTTPTimeoutError.from_exception(ex, request=request) from ex
+        except (OSError, http.client.HTTPException) as ex:
+            raise HTTPConnectionError.from_exception(ex, request=request) from ex
+        except Exception as ex:  # noqa: BLE001
+            raise HTTPError.from_exception(ex, request=request) from ex
+
+        return response
+
+    def __del__(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            for connections in self._idle_connections.values():
+                for connection in connections:
+                    connection.close()
+            self._idle_connections.clear()
+
+    def _get_idle_connection(
+        self, key: _ConnectionKey
+    ) -> Optional[http.client.HTTPConnection]:
+        with self._lock:
+            connections = self._idle_connections.get(key)
+            return connections.pop() if connections else None
+
+    def _release_connection(
+        self, key: _ConnectionKey, connection: http.client.HTTPConnection
+    ) -> None:
+        with self._lock:
+            connections = self._idle_connections.setdefault(key, [])
+            if len(connections) < self.max_idle_connections:
+                connections.append(connection)
+                return
+        connection.close()
+
+    def _connect(
+        self, key: _ConnectionKey, timeout: float
+    ) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        connection: http.client.HTTPConnection
+        if scheme == "https":
+            if self._ssl_context is None:
+                self._ssl_context = ssl.create_default_context()
+            connection = http.client.HTTPSConnection(
+                host, port, timeout=timeout, context=self._ssl_context
+            )
+        else:
+            connection = http.client.HTTPConnection(host, port, timeout=timeout)
+        connection.connect()
+        # disable Nagle's algorithm, as done by other HTTP libraries
+        connection.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return connection
+
+    def _exchange(
+        self,
+        connection: http.client.HTTPConnection,
+        request: HTTPRequest,
+        target: str,
+        timeout: float,
+    ) -> http.client.HTTPResponse:
+        headers = dict(request.headers)
+        if "accept-encoding" not in request.headers:
+            headers["Accept-Encoding"] = "gzip, deflate"
+        try:
+            connection.sock.settimeout(timeout)
+            connection.request(
+                request.method,
+                target,
+                # no Content-Length header for empty bodies of GET requests & co
+                body=request.body or None,
+                headers=headers,
+            )
+            return connection.getresponse()
+        except BaseException:
+            connection.close()
+            raise
+
+
+def _default_port(scheme: str) -> int:
+    return 443 if scheme == "https" else 80
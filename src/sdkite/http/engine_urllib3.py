@@ -0,0 +1,185 @@
+import sys
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, cast
+
+import urllib3
+
+from sdkite.http.exceptions import HTTPConnectionError, HTTPError, HTTPTimeoutError
+from sdkite.http.model import (
+    _CONNECT_TIMEOUT,
+    _READ_TIMEOUT,
+    _READ_TIMEOUT_STREAM,
+    HTTPHeaderDict,
+    HTTPRequest,
+    HTTPResponse,
+    _HTTPResponseBuffered,
+)
+from sdkite.utils import last_not_none, register_after_fork
+
+if sys.version_info < (3, 8):  # pragma: no cover
+    from backports.cached_property import cached_property
+else:  # pragma: no cover
+    from functools import cached_property
+
+if sys.version_info < (3, 9):  # pragma: no cover
+    from typing import Iterator
+else:  # pragma: no cover
+    from collections.abc import Iterator
+
+
+if TYPE_CHECKING:  # pragma: no cover
+    import ssl
+
+_ACCEPT_ENCODING = urllib3.util.make_headers(accept_encoding=True)["accept-encoding"]
+
+
+class HTTPResponseUrllib3(_HTTPResponseBuffered):
+    def __init__(
+        self, response: urllib3.response.HTTPResponse, *, decode_content: bool = True
+    ) -> None:
+        self._response = response
+        self._decode_content = decode_content
+
+    @property
+    def raw(self) -> urllib3.response.HTTPResponse:
+        return self._response
+
+    @property
+    def status_code(self) -> int:
+        return self._response.status
+
+    @property
+    def reason(self) -> str:
+        return self._response.reason or ""
+
+    @cached_property
+    def headers(self) -> HTTPHeaderDict:
+        return HTTPHeaderDict(self._response.headers)
+
+    def _iter_body(self, chunk_size: int) -> Iterator[bytes]:
+        return cast(
+            Iterator[bytes],
+            self._response.stream(chunk_size, decode_content=self._decode_content),
+        )
+
+    def _close(self) -> None:
+        # the connection is closed if the body has not been read entirely,
+        # and given back to the pool in any case
+        if not self._response.isclosed():
+            self._response.close()
+        self._response.release_conn()
+
+
+def _open_connections(pool: urllib3.HTTPConnectionPool, connections: int) -> None:
+    # pylint: disable=protected-access
+    # the idle connections are taken first, so that calling it again has no effect
+    taken: List[urllib3.connection.HTTPConnection] = []
+    try:
+        for _ in range(min(connections, pool.pool.maxsize if pool.pool else 0)):
+            connection = pool._get_conn()  # noqa: SLF001
+            taken.append(connection)  # type: ignore[arg-type]
+            if connection.sock is None:  # type: ignore[attr-defined]
+                connection.timeout = _CONNECT_TIMEOUT
+                connection.connect()
+    except (OSError, urllib3.exceptions.HTTPError):
+        pass  # raised by the first request instead
+    finally:
+        for connection in taken:
+            pool._put_conn(connection)  # noqa: SLF001
+
+
+class HTTPEngineUrllib3:
+    def __init__(
+        self,
+        *,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        pool_block: bool = False,
+        max_retries: int = 0,
+        ssl_context: Optional["ssl.SSLContext"] = None,
+    ) -> None:
+        self._pool_kwargs: Dict[str, Any] = {
+            "num_pools": pool_connections,
+            "maxsize": pool_maxsize,
+            "block": pool_block,
+        }
+        if ssl_context is not None:
+            self._pool_kwargs["ssl_context"] = ssl_context
+        self.pool_manager = urllib3.PoolManager(**self._pool_kwargs)
+        self._retries = urllib3.Retry(
+            total=max_retries, redirect=False, raise_on_status=False
+        )
+        register_after_fork(self)
+
+    def _after_fork(self) -> None:
+        # in the child process: the connections of the parent must not be shared
+        self.pool_manager = urllib3.PoolManager(**self._pool_kwargs)
+
+    def warmup(self, url: str, connections: int = 1) -> None:
+        """
+        Open connections to the host of the URL, up to the size of its pool.
+
+        Connection errors are ignored: they are raised by the next request instead.
+        """
+        _open_connections(self.pool_manager.connection_from_url(url), connections)
+
+    def __call__(self, request: HTTPRequest) -> HTTPResponse:
+        headers = dict(request.headers)
+        # remove urllib3 User-Agent header
+        if "user-agent" not in request.headers:
+            headers["User-Agent"] = urllib3.util.SKIP_HEADER
+        if "accept-encoding" not in request.headers:
+            headers["Accept-Encoding"] = _ACCEPT_ENCODING
+
+        try:
+            response = self.pool_manager.urlopen(
+                request.method,
+                request.url,
+                body=request.body,
+                headers=headers,
+                retries=self._retries,
+                redirect=False,
+                timeout=urllib3.Timeout(
+                    connect=last_not_none((request.timeout_connect,), _CONNECT_TIMEOUT),
+                    read=last_not_none(
+                        (request.timeout_read,),
+                        _READ_TIMEOUT_STREAM
+                        if request.stream_response
+                        else _READ_TIMEOUT,
+                    ),
+                ),
+                chunked=not isinstance(request.body, bytes),
+                preload_content=False,
+                decode_content=request.decode_content,
+            )
+            http_response = HTTPResponseUrllib3(
+                cast(urllib3.response.HTTPResponse, response),
+                decode_content=request.decode_content,
+            )
+            if not request.stream_response:
+                try:
+                    http_response.data_bytes  # noqa: B018
+                except BaseException:
+                    http_response._close()  # noqa: SLF001
+                    raise
+        except Exception as ex:  # noqa: BLE001
+            raise _convert_exception(ex, request) from ex
+
+        return http_response
+
+
+def _convert_exception(exception: Exception, request: HTTPRequest) -> HTTPError:
+    if isinstance(exception, urllib3.exceptions.MaxRetryError):
+        exception = exception.reason or exception
+    if isinstance(
+        exception,
+        (
+            urllib3.exceptions.ConnectTimeoutError,
+            urllib3.exceptions.NewConnectionError,
+            urllib3.exceptions.ProtocolError,
+            urllib3.exceptions.ProxyError,
+        ),
+    ):
+        return HTTPConnectionError.from_exception(exception, request=request)
+    if isinstance(exception, urllib3.exceptions.TimeoutError):
+        return HTTPTimeoutError.from_exception(exception, request=request)
+    return HTTPError.from_exception(exception, request=request)
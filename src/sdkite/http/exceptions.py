@@ -1,28 +1,30 @@
 import sys
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Optional, Union
 
 from sdkite.exceptions import SDKiteError
 
 if TYPE_CHECKING:  # pragma: no cover
     # avoid circular references
-    from sdkite.http.model import HTTPRequest, HTTPResponse
+    from sdkite.http.model import HTTPAsyncResponse, HTTPRequest, HTTPResponse
 
 if sys.version_info < (3, 11):  # pragma: no cover
     from typing_extensions import Self
 else:  # pragma: no cover
     from typing import Self
 
+_HTTPAnyResponse = Union["HTTPResponse", "HTTPAsyncResponse"]
+
 
 class HTTPError(SDKiteError):
     request: "HTTPRequest"
-    response: Optional["HTTPResponse"]
+    response: Optional[_HTTPAnyResponse]
 
     def __init__(
         self,
         *,
         msg: str = "N/A",
         request: "HTTPRequest",
-        response: Optional["HTTPResponse"] = None,
+        response: Optional[_HTTPAnyResponse] = None,
     ) -> None:
         super().__init__(msg)
         self.request = request
@@ -34,7 +36,7 @@ class HTTPError(SDKiteError):
         exception: BaseException,
         *,
         request: "HTTPRequest",
-        response: Optional["HTTPResponse"] = None,
+        response: Optional[_HTTPAnyResponse] = None,
     ) -> Self:
         return cls(
             msg=f"{exception.__class__.__name__}: {exception}",
@@ -52,14 +54,14 @@ class HTTPTimeoutError(HTTPError):
 
 
 class HTTPStatusCodeError(HTTPError):
-    response: "HTTPResponse"
+    response: _HTTPAnyResponse
 
     def __init__(
         self,
         *,
         status_code: int,
         request: "HTTPRequest",
-        response: Optional["HTTPResponse"],
+        response: Optional[_HTTPAnyResponse],
     ) -> None:
         super().__init__(
             msg=f"Unexpected status code: {status_code}",
@@ -69,14 +71,81 @@ class HTTPStatusCodeError(HTTPError):
         self.status_code = status_code
 
 
+class HTTPBulkheadFullError(HTTPError):
+    def __init__(
+        self,
+        *,
+        max_concurrent: int,
+        max_wait: float,
+        request: "HTTPRequest",
+    ) -> None:
+        super().__init__(
+            msg=(
+                f"Bulkhead full: {max_concurrent} requests in flight"
+                f" for more than {max_wait}s"
+            ),
+            request=request,
+        )
+        self.max_concurrent = max_concurrent
+        self.max_wait = max_wait
+
+
+class HTTPConcurrencyLimitError(HTTPError):
+    def __init__(
+        self,
+        *,
+        limit: int,
+        max_wait: float,
+        request: "HTTPRequest",
+    ) -> None:
+        super().__init__(
+            msg=f"Waited more than {max_wait}s for the concurrency limit of {limit}",
+            request=request,
+        )
+        self.limit = limit
+        self.max_wait = max_wait
+
+
+class HTTPCircuitOpenError(HTTPError):
+    def __init__(
+        self,
+        *,
+        host: str,
+        request: "HTTPRequest",
+    ) -> None:
+        super().__init__(
+            msg=f"Circuit breaker open for host {host}",
+            request=request,
+        )
+        self.host = host
+
+
+class HTTPDataTooLargeError(HTTPError):
+    response: _HTTPAnyResponse
+
+    def __init__(
+        self,
+        *,
+        limit: int,
+        request: "HTTPRequest",
+        response: _HTTPAnyResponse,
+    ) -> None:
+        super().__init__(
+            msg=f"Response body larger than memory limit of {limit} bytes",
+            request=request,
+            response=response,
+        )
+        self.limit = limit
+
+
 class HTTPContextError(HTTPError):
-    response: "HTTPResponse"
+    response: _HTTPAnyResponse
 
     def __init__(
         self,
         *,
         msg: str = "N/A",
         request: "HTTPRequest",
-        response: "HTTPResponse",
+        response: _HTTPAnyResponse,
     ) -> None:
         super().__init__(msg=msg, request=request, response=response)
@@ -0,0 +1,284 @@
+from collections import deque
+from copy import deepcopy
+from dataclasses import dataclass
+import sys
+from threading import Event
+from time import monotonic
+from typing import TYPE_CHECKING, Deque, List, Optional, Set
+
+from sdkite.http.model import HTTPAsyncResponse, HTTPRequest, HTTPResponse
+from sdkite.http.utils import SharedWhenCopied
+from sdkite.utils import LockResetAfterFork
+
+if sys.version_info < (3, 9):  # pragma: no cover
+    from typing import Awaitable, Callable, Iterable
+else:  # pragma: no cover
+    from collections.abc import Awaitable, Callable, Iterable
+
+if TYPE_CHECKING:  # pragma: no cover
+    from asyncio import Task
+    from concurrent.futures import Future, ThreadPoolExecutor
+
+# number of latencies needed before using the percentile instead of the fixed delay
+_MIN_LATENCIES = 10
+
+
+@dataclass(frozen=True)
+class HTTPHedgingStats:
+    requests: int  # requests which could be hedged
+    hedges: int  # hedged requests sent
+    wins: int  # hedged requests whose response was used
+
+
+def _close_response(future: "Future[HTTPResponse]") -> None:
+    if future.exception() is None:
+        with future.result():
+            pass  # closed when exiting
+
+
+class HTTPHedging(LockResetAfterFork, SharedWhenCopied):
+    def __init__(
+        self,
+        delay: float = 1.0,
+        *,
+        percentile: Optional[float] = None,
+        max_ratio: float = 0.1,
+        methods: Iterable[str] = ("GET", "HEAD", "OPTIONS"),
+        window_size: int = 100,
+        max_workers: int = 64,
+    ) -> None:
+        if delay < 0:
+            raise ValueError(f"Invalid delay: {delay}")
+        if percentile is not None and not 0 < percentile < 100:  # noqa: PLR2004
+            raise ValueError(f"Invalid percentile: {percentile}")
+        if not 0 < max_ratio <= 1:
+            raise ValueError(f"Invalid max ratio: {max_ratio}")
+        self.delay = delay
+        self.percentile = percentile
+        self.max_ratio = max_ratio
+        self.methods = frozenset(method.upper() for method in methods)
+        self.window_size = window_size
+        self.max_workers = max_workers
+        self._latencies: Deque[float] = deque(maxlen=window_size)
+        self._budget = 1.0  # the first slow request can be hedged
+        self._requests = self._hedges = self._wins = 0
+        self._executor: Optional["ThreadPoolExecutor"] = None
+        self._busy_workers = 0
+        self._init_lock()
+
+    def stats(self) -> HTTPHedgingStats:
+        with self._lock:
+            return HTTPHedgingStats(
+                requests=self._requests, hedges=self._hedges, wins=self._wins
+            )
+
+    def current_delay(self) -> float:
+        """
+        The number of seconds to wait for a response before sending a hedged request.
+        """
+        with self._lock:
+            return self._current_delay()
+
+    def _current_delay(self) -> float:
+        if self.percentile is None or len(self._latencies) < _MIN_LATENCIES:
+            return self.delay
+        latencies = sorted(self._latencies)
+        return latencies[int(self.percentile / 100 * (len(latencies) - 1))]
+
+    def _is_hedgeable(self, request: HTTPRequest) -> bool:
+        # a body given as an iterator could not be sent twice
+        return request.method in self.methods and isinstance(request.body, bytes)
+
+    def _start(self) -> Optional[float]:
+        with self._lock:
+            self._requests += 1
+            # each request allows a fraction of an additional one
+            # (rounded so that e.g. ten times 0.1 gives exactly one)
+            self._budget = min(1.0, round(self._budget + self.max_ratio, 9))
+            if self._budget < 1:
+                return None  # no hedge can be sent for that request
+            return self._current_delay()
+
+    def _take_hedge(self, *, take_worker: bool) -> bool:
+        with self._lock:
+            if self._budget < 1 or (
+                take_worker and self._busy_workers >= self.max_workers
+            ):
+                return False
+            self._budget -= 1
+            self._hedges += 1
+            if take_worker:
+                self._busy_workers += 1
+            return True
+
+    def _record(self, latency: float, *, hedge_won: bool) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            if hedge_won:
+                self._wins += 1
+
+    def _after_fork(self) -> None:
+        # in the child process: the threads of the executor do not exist anymore
+        super()._after_fork()
+        self._executor = None
+        self._busy_workers = 0
+
+    def _get_executor(self) -> "ThreadPoolExecutor":
+        with self._lock:
+            if self._executor is None:
+                # imported here so that 'concurrent.futures' is only imported when
+                # actually used
+                # pylint: disable-next=import-outside-toplevel
+                from concurrent.futures import ThreadPoolExecutor
+
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="sdkite-hedging"
+                )
+            return self._executor
+
+    def _take_worker(self) -> bool:
+        with self._lock:
+            if self._busy_workers >= self.max_workers:
+                return False
+            self._busy_workers += 1
+            return True
+
+    def _release_worker(self) -> None:
+        with self._lock:
+            self._busy_workers -= 1
+
+    def _submit(
+        self,
+        send_request: Callable[[HTTPRequest], HTTPResponse],
+        request: HTTPRequest,
+        started: Optional[Event] = None,
+    ) -> "Future[HTTPResponse]":
+        # the worker has been taken beforehand, so that the request is sent right
+        # away instead of waiting in the queue of the executor
+        def run() -> HTTPResponse:
+            if started is not None:
+                started.set()
+            try:
+                return send_request(request)
+            finally:
+                self._release_worker()
+
+        return self._get_executor().submit(run)
+
+    def send(
+        self, send_request: Callable[[HTTPRequest], HTTPResponse], request: HTTPRequest
+    ) -> HTTPResponse:
+        """
+        Send the request, and send it again if no response has been received after
+        some delay; the first response received is returned.
+        """
+        if not self._is_hedgeable(request):
+            return send_request(request)
+        delay = self._start()
+        if delay is None or not self._take_worker():
+            # when no hedge can be sent (or when all the workers are busy), the
+            # request is sent from the calling thread
+            start = monotonic()
+            response = send_request(request)
+            self._record(monotonic() - start, hedge_won=False)
+            return response
+
+        # pylint: disable-next=import-outside-toplevel
+        from concurrent.futures import FIRST_COMPLETED, wait
+
+        started = Event()
+        futures: List["Future[HTTPResponse]"] = [
+            self._submit(send_request, request, started)
+        ]
+        started.wait()
+        # the delay starts when the request is actually sent
+        start = monotonic()
+        done, pending = wait(futures, timeout=delay)
+        if not done and self._take_hedge(take_worker=True):
+            futures.append(self._submit(send_request, deepcopy(request)))
+            pending.add(futures[-1])
+
+        while True:
+            winner = next(
+                (
+                    future
+                    for future in futures
+                    if future.done() and not future.exception()
+                ),
+                None,
+            )
+            if winner is not None or not pending:
+                break
+            _, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+        for future in futures:
+            if future is not winner:
+                # the losing response is closed to release its connection
+                future.add_done_callback(_close_response)
+        if winner is None:
+            # all failed: raise the exception of the first request
+            return futures[0].result()
+        self._record(monotonic() - start, hedge_won=winner is not futures[0])
+        return winner.result()
+
+    async def asend(
+        self,
+        async_send_request: Callable[[HTTPRequest], Awaitable[HTTPAsyncResponse]],
+        request: HTTPRequest,
+    ) -> HTTPAsyncResponse:
+        """
+        Send the request, and send it again if no response has been received after
+        some delay; the first response received is returned.
+        """
+        if not self._is_hedgeable(request):
+            return await async_send_request(request)
+        start = monotonic()
+        delay = self._start()
+        if delay is None:
+            response = await async_send_request(request)
+            self._record(monotonic() - start, hedge_won=False)
+            return response
+
+        # imported here so that 'asyncio' is only imported when actually used
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        async def send(request: HTTPRequest) -> HTTPAsyncResponse:
+            return await async_send_request(request)
+
+        tasks: List["Task[HTTPAsyncResponse]"] = [asyncio.ensure_future(send(request))]
+        pending: Set["Task[HTTPAsyncResponse]"] = set(tasks)
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done and self._take_hedge(take_worker=False):
+                tasks.append(asyncio.ensure_future(send(deepcopy(request))))
+                pending.add(tasks[-1])
+
+            while True:
+                winner = next(
+                    (task for task in tasks if task.done() and not task.exception()),
+                    None,
+                )
+                if winner is not None or not pending:
+                    break
+                _, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for task in pending:
+                # the losing request is cancelled to release its connection
+                task.cancel()
+
+        for task in tasks:
+            if (
+                task is not winner
+                and task.done()
+                and not task.cancelled()
+                and not task.exception()
+            ):
+                async with task.result():
+                    pass  # closed when exiting
+        if winner is None:
+            # all failed: raise the exception of the first request
+            return tasks[0].result()
+        self._record(monotonic() - start, hedge_won=winner is not tasks[0])
+        return winner.result()
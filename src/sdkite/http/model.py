@@ -2,16 +2,45 @@ from abc import ABC, abstractmethod
 from contextlib import suppress
 from dataclasses import dataclass
 from enum import Enum, auto, unique
+from itertools import chain
+from mmap import ACCESS_READ, mmap
+from os import PathLike
 import sys
 from types import TracebackType
-from typing import Dict, List, Optional, Tuple, Type, Union
+from typing import BinaryIO, Dict, List, Optional, Tuple, Type, Union, cast
 
-from sdkite.http.exceptions import HTTPContextError
+from sdkite.http.exceptions import HTTPContextError, HTTPDataTooLargeError
+
+if sys.version_info < (3, 8):  # pragma: no cover
+    from typing_extensions import Protocol
+else:  # pragma: no cover
+    from typing import Protocol
+
+if sys.version_info < (3, 8):  # pragma: no cover
+    from backports.cached_property import cached_property
+else:  # pragma: no cover
+    from functools import cached_property
 
 if sys.version_info < (3, 9):  # pragma: no cover
-    from typing import Iterable, Iterator, Mapping, MutableMapping
+    from typing import (
+        AsyncIterable,
+        AsyncIterator,
+        Iterable,
+        Iterator,
+        Mapping,
+        MutableMapping,
+        Sequence,
+    )
 else:  # pragma: no cover
-    from collections.abc import Iterable, Iterator, Mapping, MutableMapping
+    from collections.abc import (
+        AsyncIterable,
+        AsyncIterator,
+        Iterable,
+        Iterator,
+        Mapping,
+        MutableMapping,
+        Sequence,
+    )
 
 if sys.version_info < (3, 11):  # pragma: no cover
     from typing_extensions import Self
@@ -79,10 +108,68 @@ class HTTPRequest:
     headers: HTTPHeaderDict
     body: Union[bytes, Iterator[bytes]]
     stream_response: bool
+    decode_content: bool = True
+    timeout_connect: Optional[float] = None  # engine default if None
+    timeout_read: Optional[float] = None  # engine default if None
+
+
+# size of the chunks when going through the body of a response internally
+_DATA_CHUNK_SIZE = 64 * 1024
+_SAVE_CHUNK_SIZE = 1024 * 1024
+
+# default timeouts of the engines, in seconds
+_CONNECT_TIMEOUT = 40
+_READ_TIMEOUT = 30
+_READ_TIMEOUT_STREAM = 600
+
+# methods which do not change the state of the server when sent several times
+_IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"))
+
+
+def _decode_text(data: bytes, headers: HTTPHeaderDict) -> str:
+    # imported here, to reduce the import time
+    from email.message import Message  # pylint: disable=import-outside-toplevel
+
+    # charset of the Content-Type header, or UTF-8 by default
+    message = Message()
+    message["content-type"] = headers.get("content-type", "")
+    encoding = message.get_content_charset() or "utf-8"
+    return data.decode(encoding, errors="replace")
+
+
+def _split_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    # parts of the current line are only joined once the end of the line is found
+    # to avoid quadratic concatenations when lines span several chunks
+    pending: List[bytes] = []
+    for chunk in chunks:
+        start = 0
+        end = chunk.find(b"\n")
+        while end >= 0:
+            if pending:
+                pending.append(chunk[start:end])
+                line = b"".join(pending)
+                pending.clear()
+            else:
+                line = chunk[start:end]
+            yield line[:-1] if line.endswith(b"\r") else line
+            start = end + 1
+            end = chunk.find(b"\n", start)
+        if start < len(chunk):
+            pending.append(chunk[start:])
+    if pending:
+        line = b"".join(pending)
+        yield line[:-1] if line.endswith(b"\r") else line
+
+
+class _HTTPChecksum(Protocol):
+    # e.g. objects from hashlib
+    def update(self, __data: bytes) -> None:
+        ...
 
 
 class HTTPResponse(ABC):
     __context: Optional[HTTPRequest] = None
+    __data_memory_limit: Optional[int] = None
 
     @property
     @abstractmethod
@@ -140,11 +227,150 @@ class HTTPResponse(ABC):
         The body of the response JSON-decoded, for easier access.
         """
 
+    @property
+    def data_buffer(self) -> Union[bytes, mmap]:
+        """
+        The body of the response as bytes, or as a read-only memory-mapped temporary
+        file if it is larger than the memory limit.
+        """
+        if self.__data_memory_limit is None:
+            return self.data_bytes
+        return self._read_data_limited(self._iter_data(_DATA_CHUNK_SIZE), spill=True)
+
+    def iter_json_items(self, path: Union[str, Sequence[str]] = ()) -> Iterator[object]:
+        """
+        The items of a JSON array in the body of the response, decoded one at a time
+        while the body is being received.
+
+        The path is a sequence of keys (or a dot-separated string) to follow from the
+        top-level object to reach the array; by default the array is the top-level
+        value.
+        """
+        # imported here so that 'json' is only imported when actually used
+        from sdkite.http._jsonstream import (  # pylint: disable=import-outside-toplevel
+            iter_json_items,
+        )
+
+        if isinstance(path, str):
+            path = path.split(".") if path else ()
+        return iter_json_items(self._iter_data(_DATA_CHUNK_SIZE), path)
+
+    def iter_lines(self, encoding: str = "utf-8") -> Iterator[str]:
+        """
+        The lines in the body of the response, decoded one at a time while the body is
+        being received.
+
+        Lines are split on LF, and a trailing CR is removed.
+        """
+        for line in _split_lines(self._iter_data(_DATA_CHUNK_SIZE)):
+            yield line.decode(encoding)
+
+    def iter_ndjson(self) -> Iterator[object]:
+        """
+        The JSON-decoded lines in the body of the response (newline-delimited JSON),
+        decoded one at a time while the body is being received.
+
+        Empty lines are skipped.
+        """
+        import json  # pylint: disable=import-outside-toplevel
+
+        for line in _split_lines(self._iter_data(_DATA_CHUNK_SIZE)):
+            if line.strip():
+                yield json.loads(line)
+
+    def save_to(
+        self,
+        destination: Union[str, "PathLike[str]", BinaryIO],
+        *,
+        checksum: Optional[_HTTPChecksum] = None,
+    ) -> int:
+        """
+        Write the body of the response to a file (given as a path or a binary file
+        object), using large buffers.
+
+        The checksum object (e.g. from hashlib) is updated with the data written.
+
+        Returns the number of bytes written.
+        """
+        if isinstance(destination, (str, PathLike)):
+            with open(destination, "wb") as fileobj:  # noqa: PTH123
+                return self.save_to(fileobj, checksum=checksum)
+        size = 0
+        for chunk in self._iter_data(_SAVE_CHUNK_SIZE):
+            destination.write(chunk)
+            if checksum is not None:
+                checksum.update(chunk)
+            size += len(chunk)
+        return size
+
+    def _iter_data(
+        self, chunk_size: int  # pylint: disable=unused-argument # noqa: ARG002
+    ) -> Iterator[bytes]:
+        # engines can take the chunk size into account for better performance
+        return self.data_stream
+
+    @property
+    def _data_memory_limit(self) -> Optional[int]:
+        return self.__data_memory_limit
+
+    def _join_data(self, chunks: Iterable[bytes]) -> bytes:
+        # engines should use this to load the body in memory
+        # so that the memory limit is taken into account
+        if self.__data_memory_limit is None:
+            return b"".join(chunks)
+        return cast(bytes, self._read_data_limited(chunks, spill=False))
+
+    def _read_data_limited(
+        self, chunks: Iterable[bytes], *, spill: bool
+    ) -> Union[bytes, mmap]:
+        limit = cast(int, self.__data_memory_limit)
+
+        # fail early if possible
+        if not spill and "content-encoding" not in self.headers:
+            with suppress(KeyError, ValueError):
+                if int(self.headers["content-length"]) > limit:
+                    raise self.__data_too_large_error(limit)
+
+        chunks = iter(chunks)
+        parts: List[bytes] = []
+        size = 0
+        for chunk in chunks:
+            size += len(chunk)
+            parts.append(chunk)
+            if size > limit:
+                break
+        else:
+            return b"".join(parts)
+
+        if not spill:
+            raise self.__data_too_large_error(limit)
+
+        # imported here as rarely used, to reduce the import time
+        from tempfile import TemporaryFile  # pylint: disable=import-outside-toplevel
+
+        with TemporaryFile() as fileobj:
+            fileobj.writelines(chain(parts, chunks))
+            fileobj.flush()
+            return mmap(fileobj.fileno(), 0, access=ACCESS_READ)
+
+    def __data_too_large_error(self, limit: int) -> HTTPDataTooLargeError:
+        return HTTPDataTooLargeError(
+            limit=limit,
+            request=cast(HTTPRequest, self.__context),
+            response=self,
+        )
+
     def _close(self) -> None:  # noqa: B027
         pass
 
-    def _set_context(self, context: HTTPRequest) -> None:
+    def _set_context(
+        self,
+        context: HTTPRequest,
+        *,
+        data_memory_limit: Optional[int] = None,
+    ) -> None:
         self.__context = context
+        self.__data_memory_limit = data_memory_limit
 
     def __enter__(self) -> Self:
         return self
@@ -169,9 +395,162 @@ class HTTPResponse(ABC):
             self._close()
 
 
+class _HTTPResponseBuffered(HTTPResponse):
+    # base of the engines' responses: the body is read with '_iter_body', and kept in
+    # memory once loaded
+    _content: Optional[bytes] = None
+
+    @cached_property
+    def data_stream(self) -> Iterator[bytes]:
+        return self._iter_data(_DATA_CHUNK_SIZE)
+
+    @property
+    def data_bytes(self) -> bytes:
+        if self._content is None:
+            self._content = self._join_data(self._iter_data(_DATA_CHUNK_SIZE))
+        return self._content
+
+    @property
+    def data_str(self) -> str:
+        return _decode_text(self.data_bytes, self.headers)
+
+    @cached_property
+    def data_json(self) -> object:
+        import json  # pylint: disable=import-outside-toplevel
+
+        return json.loads(self.data_bytes)
+
+    def _iter_data(self, chunk_size: int) -> Iterator[bytes]:
+        if self._content is not None:
+            return iter((self._content,))
+        return self._iter_body(chunk_size)
+
+    @abstractmethod
+    def _iter_body(self, chunk_size: int) -> Iterator[bytes]:
+        ...
+
+
+class HTTPAsyncResponse(ABC):
+    __context: Optional[HTTPRequest] = None
+    __data_memory_limit: Optional[int] = None
+
+    @property
+    @abstractmethod
+    def raw(self) -> object:
+        """
+        The response object coming from the adapter
+        """
+
+    @property
+    @abstractmethod
+    def status_code(self) -> int:
+        """
+        The HTTP status code (RFC 2616 section 6.1.1)
+        """
+
+    @property
+    @abstractmethod
+    def reason(self) -> str:
+        """
+        The HTTP reason phrase (RFC 2616 section 6.1.1)
+        """
+
+    @property
+    @abstractmethod
+    def headers(self) -> HTTPHeaderDict:
+        """
+        The HTTP headers as a HTTPHeaderDict instance
+        """
+
+    @property
+    @abstractmethod
+    def data_stream(self) -> AsyncIterator[bytes]:
+        """
+        The body of the response as an asynchronous iterator of bytes, useful for data
+        streaming.
+        """
+
+    @abstractmethod
+    async def data_bytes(self) -> bytes:
+        """
+        The body of the response as bytes.
+        """
+
+    @abstractmethod
+    async def data_str(self) -> str:
+        """
+        The body of the response as a str, for easier access.
+        """
+
+    @abstractmethod
+    async def data_json(self) -> object:
+        """
+        The body of the response JSON-decoded, for easier access.
+        """
+
+    async def _join_data(self, chunks: AsyncIterable[bytes]) -> bytes:
+        # engines should use this to load the body in memory
+        # so that the memory limit is taken into account
+        limit = self.__data_memory_limit
+        parts: List[bytes] = []
+        size = 0
+        async for chunk in chunks:
+            size += len(chunk)
+            if limit is not None and size > limit:
+                raise HTTPDataTooLargeError(
+                    limit=limit,
+                    request=cast(HTTPRequest, self.__context),
+                    response=self,
+                )
+            parts.append(chunk)
+        return b"".join(parts)
+
+    def _close(self) -> None:  # noqa: B027
+        pass
+
+    def _set_context(
+        self,
+        context: HTTPRequest,
+        *,
+        data_memory_limit: Optional[int] = None,
+    ) -> None:
+        self.__context = context
+        self.__data_memory_limit = data_memory_limit
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        with suppress(Exception):
+            self._close()
+        if exc_val and self.__context:
+            raise HTTPContextError.from_exception(
+                exc_val,
+                request=self.__context,
+                response=self,
+            ) from exc_val
+
+    def __del__(self) -> None:
+        with suppress(Exception):
+            self._close()
+
+
 @dataclass
 class HTTPRequestAttemptInfo:
     attempt_number: int
     exception: BaseException
     initial_request: HTTPRequest
     seconds_since_start: float
+    retry_budget_exhausted: bool = False  # no retry, see HTTPRetryBudget
+
+
+@dataclass
+class HTTPBatchResult:
+    index: int
+    response: Optional[HTTPResponse]
+    exception: Optional[Exception]
@@ -0,0 +1,145 @@
+from time import monotonic, sleep, time
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import urlsplit
+
+from sdkite.http.model import (
+    HTTPAsyncResponse,
+    HTTPHeaderDict,
+    HTTPRequest,
+    HTTPResponse,
+)
+from sdkite.http.utils import SharedWhenCopied
+from sdkite.utils import LockResetAfterFork
+
+# reset values above that are timestamps instead of a number of seconds
+_RESET_TIMESTAMP_THRESHOLD = 1_000_000_000
+
+
+class _Bucket:
+    __slots__ = ["tat", "interval", "interval_until"]
+
+    def __init__(self, interval: float) -> None:
+        self.tat = 0.0  # theoretical arrival time of the next request
+        self.interval = interval
+        self.interval_until = 0.0
+
+
+def _parse_rate_limit_headers(
+    headers: HTTPHeaderDict,
+) -> Optional[Tuple[int, float]]:
+    for prefix in ("ratelimit-", "x-ratelimit-"):
+        try:
+            remaining = int(headers[f"{prefix}remaining"])
+            reset = float(headers[f"{prefix}reset"])
+        except (KeyError, ValueError):
+            continue
+        if reset > _RESET_TIMESTAMP_THRESHOLD:
+            reset -= time()
+        return max(0, remaining), max(0.0, reset)
+    return None
+
+
+class HTTPRateLimiter(LockResetAfterFork, SharedWhenCopied):
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        *,
+        per_host: bool = False,
+        adapt: bool = True,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError(f"Invalid rate: {rate}")
+        if burst < 1:
+            raise ValueError(f"Invalid burst: {burst}")
+        self.rate = rate
+        self.burst = burst
+        self.per_host = per_host
+        self.adapt = adapt
+        self._buckets: Dict[Optional[str], _Bucket] = {}
+        self._init_lock()
+
+    def _bucket(self, request: HTTPRequest) -> _Bucket:
+        key = urlsplit(request.url).netloc if self.per_host else None
+        try:
+            return self._buckets[key]
+        except KeyError:
+            bucket = self._buckets[key] = _Bucket(1 / self.rate)
+            return bucket
+
+    def reserve(self, request: HTTPRequest, max_wait: Optional[float] = None) -> float:
+        """
+        Reserve the sending of the request, returning the number of seconds to wait
+        before sending it.
+
+        Nothing is reserved if that number is above ``max_wait``.
+        """
+        with self._lock:
+            bucket = self._bucket(request)
+            now = monotonic()
+            if now >= bucket.interval_until:
+                bucket.interval = 1 / self.rate
+            tat = max(bucket.tat, now)
+            # the bucket allows burst - 1 requests ahead of the theoretical schedule
+            wait = max(0.0, tat - (self.burst - 1) * bucket.interval - now)
+            if max_wait is None or wait <= max_wait:
+                bucket.tat = tat + bucket.interval
+            return wait
+
+    def acquire(self, request: HTTPRequest, max_wait: Optional[float] = None) -> bool:
+        """
+        Wait until the request can be sent.
+
+        Return ``False`` without waiting if that would take more than ``max_wait``
+        seconds.
+        """
+        wait = self.reserve(request, max_wait)
+        if max_wait is not None and wait > max_wait:
+            return False
+        if wait > 0:
+            sleep(wait)
+        return True
+
+    async def aacquire(
+        self, request: HTTPRequest, max_wait: Optional[float] = None
+    ) -> bool:
+        """
+        Wait until the request can be sent, asynchronously.
+
+        Return ``False`` without waiting if that would take more than ``max_wait``
+        seconds.
+        """
+        wait = self.reserve(request, max_wait)
+        if max_wait is not None and wait > max_wait:
+            return False
+        if wait > 0:
+            # imported here so that 'asyncio' is only imported when actually used
+            import asyncio  # pylint: disable=import-outside-toplevel
+
+            await asyncio.sleep(wait)
+        return True
+
+    def update(
+        self, request: HTTPRequest, response: Union[HTTPResponse, HTTPAsyncResponse]
+    ) -> None:
+        """
+        Adapt the rate according to the headers of the response.
+        """
+        if not self.adapt:
+            return
+        parsed = _parse_rate_limit_headers(response.headers)
+        if parsed is None:
+            return
+        remaining, reset = parsed
+        with self._lock:
+            bucket = self._bucket(request)
+            now = monotonic()
+            if remaining == 0:
+                # no more requests until the reset
+                bucket.tat = max(
+                    bucket.tat, now + reset + (self.burst - 1) * bucket.interval
+                )
+            else:
+                # spread the remaining requests until the reset
+                bucket.interval = max(1 / self.rate, reset / remaining)
+                bucket.interval_until = now + reset
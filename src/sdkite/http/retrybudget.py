@@ -0,0 +1,69 @@
+from collections import deque
+from time import monotonic
+from typing import Deque
+
+from sdkite.http.utils import SharedWhenCopied
+from sdkite.utils import LockResetAfterFork
+
+
+class _Bucket:
+    __slots__ = ["second", "requests", "retries"]
+
+    def __init__(self, second: int) -> None:
+        self.second = second
+        self.requests = 0
+        self.retries = 0
+
+
+class HTTPRetryBudget(LockResetAfterFork, SharedWhenCopied):
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        *,
+        min_retries_per_second: float = 1.0,
+        ttl: float = 10.0,
+    ) -> None:
+        if ratio < 0:
+            raise ValueError(f"Invalid ratio: {ratio}")
+        if min_retries_per_second < 0:
+            raise ValueError(
+                f"Invalid min retries per second: {min_retries_per_second}"
+            )
+        if ttl <= 0:
+            raise ValueError(f"Invalid ttl: {ttl}")
+        self.ratio = ratio
+        self.min_retries_per_second = min_retries_per_second
+        self.ttl = ttl
+        # one bucket per second, to keep the memory usage independent of the load
+        self._buckets: Deque[_Bucket] = deque()
+        self._init_lock()
+
+    def _current_bucket(self) -> _Bucket:
+        now = monotonic()
+        while self._buckets and self._buckets[0].second <= now - self.ttl:
+            self._buckets.popleft()
+        second = int(now)
+        if not self._buckets or self._buckets[-1].second != second:
+            self._buckets.append(_Bucket(second))
+        return self._buckets[-1]
+
+    def deposit(self) -> None:
+        """
+        Record that a request is performed, allowing a fraction of a retry.
+        """
+        with self._lock:
+            self._current_bucket().requests += 1
+
+    def withdraw(self) -> bool:
+        """
+        Record that a request is retried, or return False if the budget is exhausted.
+        """
+        with self._lock:
+            current_bucket = self._current_bucket()
+            requests = sum(bucket.requests for bucket in self._buckets)
+            retries = sum(bucket.retries for bucket in self._buckets)
+            allowed = self.min_retries_per_second * self.ttl + self.ratio * requests
+            if retries >= allowed:
+                return False
+            current_bucket.retries += 1
+            return True
@@ -1,12 +1,11 @@
 from contextlib import contextmanager
 from functools import reduce
-import json
 import re
-import secrets
 import sys
-from typing import Optional, Set, Tuple, Union
+from typing import Any, Dict, List, Optional, Set, Tuple, TypeVar, Union
 from urllib.parse import quote_plus
 from urllib.parse import urljoin as _urljoin
+import zlib
 
 from sdkite.http.model import HTTPBodyEncoding
 
@@ -169,6 +168,8 @@ class _VisitorNone(_Visitor):
 
 class _VisitorJSON(_Visitor):
     def _visit_raw(self, obj: object) -> Iterator[bytes]:
+        import json  # pylint: disable=import-outside-toplevel
+
         yield json.dumps(obj).encode()
 
     def _visit_sequence_start(self) -> Iterator[bytes]:
@@ -229,7 +230,10 @@ class _VisitorMultipart(_Visitor):
     root = True
 
     def __init__(self) -> None:
-        self.boundary = b"----%s" % secrets.token_hex(32).encode()
+        # imported here as rarely used, to reduce the import time
+        from secrets import token_hex  # pylint: disable=import-outside-toplevel
+
+        self.boundary = b"----%s" % token_hex(32).encode()
 
     def _visit_raw(self, obj: object) -> Iterator[bytes]:
         if self.root:
@@ -345,3 +349,32 @@ def build_status_code_check(
         return bool(pattern.match(f"{code:03d}"))
 
     return status_code_check
+
+
+def create_decoders(
+    content_encoding: str,
+) -> List["zlib._Decompress"]:  # noqa: SLF001
+    decoders = []
+    for part in reversed(content_encoding.split(",")):
+        encoding = part.strip().lower()
+        if encoding in ("gzip", "x-gzip"):
+            decoders.append(zlib.decompressobj(16 + zlib.MAX_WBITS))
+        elif encoding == "deflate":
+            decoders.append(zlib.decompressobj())
+        elif encoding not in ("", "identity"):
+            # unknown encoding: leave the body untouched
+            return []
+    return decoders
+
+
+_T = TypeVar("_T")
+
+
+class SharedWhenCopied:
+    """
+    Mixin for objects whose state is shared by all the clients using them, and so
+    must not be copied when the clients are created.
+    """
+
+    def __deepcopy__(self: _T, memo: Dict[int, Any]) -> _T:
+        return self
@@ -1,8 +1,14 @@
 from contextlib import suppress
 from functools import wraps
-from inspect import Parameter, signature
+from inspect import (
+    BoundArguments,
+    Parameter,
+    isasyncgenfunction,
+    iscoroutinefunction,
+    signature,
+)
 import sys
-from typing import Any, TypeVar, Union, overload
+from typing import Any, Dict, Tuple, TypeVar, Union, cast, overload
 
 if sys.version_info < (3, 8):  # pragma: no cover
     from typing_extensions import Protocol
@@ -10,9 +16,23 @@ else:  # pragma: no cover
     from typing import Protocol
 
 if sys.version_info < (3, 9):  # pragma: no cover
-    from typing import Callable, Iterable, Iterator
+    from typing import (
+        AsyncIterable,
+        AsyncIterator,
+        Awaitable,
+        Callable,
+        Iterable,
+        Iterator,
+    )
 else:  # pragma: no cover
-    from collections.abc import Callable, Iterable, Iterator
+    from collections.abc import (
+        AsyncIterable,
+        AsyncIterator,
+        Awaitable,
+        Callable,
+        Iterable,
+        Iterator,
+    )
 
 if sys.version_info < (3, 10):  # pragma: no cover
     from typing_extensions import Concatenate, ParamSpec
@@ -56,6 +76,63 @@ class Pagination:
         self._finished = True
 
 
+_Bind = Callable[
+    [Tuple[object, ...], Dict[str, object]], Tuple[Pagination, BoundArguments]
+]
+
+
+def _wrap(
+    fct: Callable[..., object], bind: _Bind, *, stop_when_empty: bool
+) -> Callable[P, Iterator[T]]:
+    @wraps(fct)
+    def wrapped(*args: P.args, **kwargs: P.kwargs) -> Iterator[T]:
+        pagination, arguments = bind(args, kwargs)
+
+        while not pagination.finished:
+            iterable = cast(Iterable[T], fct(*arguments.args, **arguments.kwargs))
+            empty = True
+            for item in iterable:
+                pagination._offset += 1  # noqa: SLF001
+                empty = False
+                yield item
+            if empty and stop_when_empty:
+                pagination.finish()
+                break
+            pagination._page += 1  # noqa: SLF001
+
+    return wrapped
+
+
+def _wrap_async(
+    fct: Callable[..., object], bind: _Bind, *, stop_when_empty: bool
+) -> Callable[P, AsyncIterator[T]]:
+    async def iter_page(arguments: BoundArguments) -> AsyncIterator[T]:
+        result = fct(*arguments.args, **arguments.kwargs)
+        if isasyncgenfunction(fct):
+            async for item in cast(AsyncIterable[T], result):
+                yield item
+        else:
+            for item in await cast(Awaitable[Iterable[T]], result):
+                yield item
+
+    @wraps(fct)
+    async def wrapped(*args: P.args, **kwargs: P.kwargs) -> AsyncIterator[T]:
+        pagination, arguments = bind(args, kwargs)
+
+        while not pagination.finished:
+            empty = True
+            async for item in iter_page(arguments):
+                pagination._offset += 1  # noqa: SLF001
+                empty = False
+                yield item
+            if empty and stop_when_empty:
+                pagination.finish()
+                break
+            pagination._page += 1  # noqa: SLF001
+
+    return wrapped
+
+
 # typing note: paginated can be applied on either functions or class methods
 # for functions, the 'pagination' argument is expected to be the first parameter
 # for methods, it is expected to be after the 'self' parameter
@@ -64,6 +141,9 @@ class Pagination:
 # note that as a side-effect, it works as well on functions
 # where the 'pagination' argument is the second parameter
 
+# async functions (returning an iterable) and async generators are supported as well,
+# in which case the wrapped function returns an async iterator
+
 
 class _PaginatedDecorator(Protocol):
     @overload
@@ -72,12 +152,36 @@ class _PaginatedDecorator(Protocol):
     ) -> Callable[P, Iterator[T]]:
         ...
 
+    @overload
+    def __call__(
+        self, fct: Callable[Concatenate[Pagination, P], AsyncIterable[T]]
+    ) -> Callable[P, AsyncIterator[T]]:
+        ...
+
+    @overload
+    def __call__(
+        self, fct: Callable[Concatenate[Pagination, P], Awaitable[Iterable[T]]]
+    ) -> Callable[P, AsyncIterator[T]]:
+        ...
+
     @overload
     def __call__(
         self, fct: Callable[Concatenate[U, Pagination, P], Iterable[T]]
     ) -> Callable[Concatenate[U, P], Iterator[T]]:
         ...
 
+    @overload
+    def __call__(
+        self, fct: Callable[Concatenate[U, Pagination, P], AsyncIterable[T]]
+    ) -> Callable[Concatenate[U, P], AsyncIterator[T]]:
+        ...
+
+    @overload
+    def __call__(
+        self, fct: Callable[Concatenate[U, Pagination, P], Awaitable[Iterable[T]]]
+    ) -> Callable[Concatenate[U, P], AsyncIterator[T]]:
+        ...
+
 
 def paginated(
     *,
@@ -92,20 +196,53 @@ def paginated(
     ) -> Callable[P, Iterator[T]]:
         ...
 
+    @overload
+    def paginated_decorator(
+        fct: Callable[Concatenate[Pagination, P], AsyncIterable[T]]
+    ) -> Callable[P, AsyncIterator[T]]:
+        ...
+
+    @overload
+    def paginated_decorator(
+        fct: Callable[Concatenate[Pagination, P], Awaitable[Iterable[T]]]
+    ) -> Callable[P, AsyncIterator[T]]:
+        ...
+
     @overload
     def paginated_decorator(
         fct: Callable[Concatenate[U, Pagination, P], Iterable[T]]
     ) -> Callable[Concatenate[U, P], Iterator[T]]:
         ...
 
+    @overload
+    def paginated_decorator(
+        fct: Callable[Concatenate[U, Pagination, P], AsyncIterable[T]]
+    ) -> Callable[Concatenate[U, P], AsyncIterator[T]]:
+        ...
+
+    @overload
+    def paginated_decorator(
+        fct: Callable[Concatenate[U, Pagination, P], Awaitable[Iterable[T]]]
+    ) -> Callable[Concatenate[U, P], AsyncIterator[T]]:
+        ...
+
     def paginated_decorator(
         fct: (
             Union[
                 Callable[Concatenate[Pagination, P], Iterable[T]],
+                Callable[Concatenate[Pagination, P], AsyncIterable[T]],
+                Callable[Concatenate[Pagination, P], Awaitable[Iterable[T]]],
                 Callable[Concatenate[U, Pagination, P], Iterable[T]],
+                Callable[Concatenate[U, Pagination, P], AsyncIterable[T]],
+                Callable[Concatenate[U, Pagination, P], Awaitable[Iterable[T]]],
             ]
         )
-    ) -> Union[Callable[P, Iterator[T]], Callable[Concatenate[U, P], Iterator[T]]]:
+    ) -> Union[
+        Callable[P, Iterator[T]],
+        Callable[P, AsyncIterator[T]],
+        Callable[Concatenate[U, P], Iterator[T]],
+        Callable[Concatenate[U, P], AsyncIterator[T]],
+    ]:
         if isinstance(fct, (classmethod, staticmethod)):
             return type(fct)(paginated_decorator(fct.__func__))  # type: ignore[unreachable]
 
@@ -135,8 +272,9 @@ def paginated(
 
         # create wrapped function
 
-        @wraps(fct)
-        def wrapped(*args: P.args, **kwargs: P.kwargs) -> Iterator[T]:
+        def bind(
+            args: Tuple[object, ...], kwargs: Dict[str, object]
+        ) -> Tuple[Pagination, BoundArguments]:
             pagination = Pagination(page=page, offset=offset, context=context)
 
             try:
@@ -154,34 +292,32 @@ def paginated(
                     ) from ex
                 raise  # pragma: no cover
             arguments.apply_defaults()
+            return pagination, arguments
 
-            while not pagination.finished:
-                iterable = fct(*arguments.args, **arguments.kwargs)
-                empty = True
-                for item in iterable:
-                    pagination._offset += 1  # noqa: SLF001
-                    empty = False
-                    yield item
-                if empty and stop_when_empty:
-                    pagination.finish()
-                    break
-                pagination._page += 1  # noqa: SLF001
+        wrapped: Union[Callable[P, Iterator[T]], Callable[P, AsyncIterator[T]]]
+        return_annotation: object
+        if isasyncgenfunction(fct) or iscoroutinefunction(fct):
+            wrapped = _wrap_async(fct, bind, stop_when_empty=stop_when_empty)
+            return_annotation = AsyncIterator[Any]
+        else:
+            wrapped = _wrap(fct, bind, stop_when_empty=stop_when_empty)
+            return_annotation = Iterator[Any]
 
         # fix the signature and annotations
 
         # the return value hint is complex to compute exactly from fct's return value
         # e.g. consider 'list[int] | str' should be transformed to 'Iterator[int | str]'
-        # so we are just using 'Iterator[Any]'
+        # so we are just using 'Iterator[Any]' (or 'AsyncIterator[Any]')
 
         # see https://github.com/python/mypy/issues/12472 for ignore below
-        wrapped.__signature__ = sig.replace(  # type: ignore[attr-defined]
+        wrapped.__signature__ = sig.replace(  # type: ignore[union-attr]
             parameters=parameters[:param_pos] + parameters[param_pos + 1 :],
-            return_annotation=Iterator[Any],
+            return_annotation=return_annotation,
         )
 
         with suppress(KeyError):  # maybe no type hint
             del wrapped.__annotations__["pagination"]
-        wrapped.__annotations__["return"] = Iterator[Any]
+        wrapped.__annotations__["return"] = return_annotation
 
         return wrapped
 
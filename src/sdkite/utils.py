@@ -1,5 +1,13 @@
+import os
 import sys
+from threading import Lock, RLock
 from typing import Optional, Tuple, Type, TypeVar, Union, overload
+from weakref import WeakSet
+
+if sys.version_info < (3, 8):  # pragma: no cover
+    from typing_extensions import Protocol
+else:  # pragma: no cover
+    from typing import Protocol
 
 if sys.version_info < (3, 9):  # pragma: no cover
     from typing import Iterable, Reversible, Sequence
@@ -51,3 +59,46 @@ def walk_exception_context(
             return exception
         exception = exception.__context__
     return None
+
+
+class _ForkAware(Protocol):
+    def _after_fork(self) -> None:
+        ...
+
+
+# objects to reset in the child process after a fork, e.g. to drop the connections
+# opened by the parent process (which must not be shared)
+_fork_aware_objects: "WeakSet[_ForkAware]" = WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    for obj in list(_fork_aware_objects):
+        obj._after_fork()  # noqa: SLF001  # pylint: disable=protected-access
+
+
+if hasattr(os, "register_at_fork"):  # pragma: no branch
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+def register_after_fork(obj: _ForkAware) -> None:
+    _fork_aware_objects.add(obj)
+
+
+class LockResetAfterFork:
+    """
+    Mixin for objects guarded by a '_lock', which is recreated in the child process
+    after a fork: it may have been held by another thread of the parent process.
+
+    The lock is created by '_init_lock'; subclasses resetting more state after a fork
+    must call 'super()._after_fork()'.
+    """
+
+    _lock: Union[Lock, RLock]
+    _lock_reentrant = False
+
+    def _init_lock(self) -> None:
+        self._lock = RLock() if self._lock_reentrant else Lock()
+        register_after_fork(self)
+
+    def _after_fork(self) -> None:
+        self._init_lock()
@@ -0,0 +1,60 @@
+"""Measure the time needed to define and use a large tree of clients.
+
+Usage: python tests/benchmark/client_tree.py [number of clients]
+
+Each client has its own HTTP adapter spec, as is the case in large SDKs.
+"""
+
+import sys
+import time
+from typing import Dict, List, Type
+
+from sdkite import Client
+from sdkite.http import HTTPAdapterSpec
+
+
+def define_clients(count: int) -> Type[Client]:
+    children: List[Type[Client]] = [
+        type(
+            f"Client{index}",
+            (Client,),
+            {"_http": HTTPAdapterSpec(f"endpoint{index}/", headers={"X-Id": "a"})},
+        )
+        for index in range(count)
+    ]
+    annotations: Dict[str, Type[Client]] = {
+        f"client{index}": child for index, child in enumerate(children)
+    }
+    return type(
+        "Root",
+        (Client,),
+        {
+            "__annotations__": annotations,
+            "_http": HTTPAdapterSpec("https://api.example.com/"),
+        },
+    )
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    start = time.perf_counter()
+    root_class = define_clients(count)
+    defined = time.perf_counter()
+    root = root_class()
+    instantiated = time.perf_counter()
+    for index in range(count):
+        # pylint: disable-next=protected-access
+        assert getattr(root, f"client{index}")._http.url
+    used = time.perf_counter()
+
+    for name, elapsed in (
+        ("definition", defined - start),
+        ("instantiation", instantiated - defined),
+        ("first use of adapters", used - instantiated),
+    ):
+        print(f"{name:<22} {elapsed * 1000:>8.1f} ms")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
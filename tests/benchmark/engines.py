@@ -0,0 +1,72 @@
+"""Compare the per-request overhead of the synchronous HTTP engines.
+
+Usage: python tests/benchmark/engines.py [number of requests]
+
+Requests are sent sequentially to a local server returning a tiny body, so that the
+time measured is mostly spent in the engines.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import sys
+from threading import Thread
+import time
+
+from sdkite.http import HTTPHeaderDict, HTTPRequest
+from sdkite.http.engine_requests import HTTPEngineRequests
+from sdkite.http.engine_urllib3 import HTTPEngineUrllib3
+
+if sys.version_info < (3, 9):  # pragma: no cover
+    from typing import Callable
+else:  # pragma: no cover
+    from collections.abc import Callable
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+    def do_GET(self) -> None:  # pylint: disable=invalid-name # noqa: N802
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+
+def run(
+    name: str, engine: Callable[[HTTPRequest], object], url: str, count: int
+) -> None:
+    request = HTTPRequest(
+        method="GET",
+        url=url,
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=False,
+    )
+    engine(request)  # warm up: open the connection
+    start = time.perf_counter()
+    for _ in range(count):
+        engine(request)
+    elapsed = time.perf_counter() - start
+    print(  # noqa: T201
+        f"{name:<20} {count / elapsed:>8.0f} req/s {elapsed / count * 1e6:>8.1f} µs/req"
+    )
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    try:
+        run("HTTPEngineRequests", HTTPEngineRequests(), url, count)
+        run("HTTPEngineUrllib3", HTTPEngineUrllib3(), url, count)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Measure the time spent importing modules when using the HTTP engines.
+
+Usage: python tests/benchmark/import_time.py
+
+Each scenario is run in a new interpreter with `-X importtime`; the time reported is
+the total time spent in imports, and the modules of interest imported are listed.
+"""
+
+import subprocess
+import sys
+from typing import List, Tuple
+
+SCENARIOS = {
+    "import sdkite.http": "import sdkite.http",
+    "HTTPEngineRequests": """
+from sdkite import Client
+from sdkite.http import HTTPAdapterSpec
+class Api(Client):
+    _http = HTTPAdapterSpec("https://api.example.com/")
+Api()._http.engine
+""",
+    "HTTPEngineStdlib": """
+from sdkite import Client
+from sdkite.http import HTTPAdapterSpec
+from sdkite.http.engine_stdlib import HTTPEngineStdlib
+class Api(Client):
+    _http = HTTPAdapterSpec("https://api.example.com/")
+    _http.set_engine(HTTPEngineStdlib)
+Api()._http.engine
+""",
+}
+
+MODULES_OF_INTEREST = ("requests", "urllib3", "tenacity", "asyncio")
+
+
+def measure(code: str, runs: int = 5) -> Tuple[float, List[str]]:
+    best = float("inf")
+    modules: List[str] = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True,
+            check=True,
+            text=True,
+        )
+        total = 0
+        modules = []
+        for line in result.stderr.splitlines():
+            if not line.startswith("import time:") or "[us]" in line:
+                continue
+            self_us, _, name = line[len("import time:") :].split("|")
+            total += int(self_us)
+            if name.strip() in MODULES_OF_INTEREST:
+                modules.append(name.strip())
+        best = min(best, total / 1000)
+    return best, modules
+
+
+def main() -> None:
+    for name, code in SCENARIOS.items():
+        elapsed, modules = measure(code)
+        print(f"{name:<20} {elapsed:>7.1f} ms  {', '.join(modules)}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
-from typing import Any, List, cast
+from threading import Barrier
+from typing import Any, List, Set, cast
 
 import pytest
 from requests_mock import Mocker
@@ -8,6 +10,7 @@ from requests_mock import Mocker
 from sdkite import Client, Pagination, paginated
 from sdkite.http import BasicAuth, HTTPAdapterSpec, HTTPRequest, NoAuth
 from sdkite.http.engine_replay import HTTPEngineReplay, HTTPResponseReplay
+from sdkite.http.engine_requests import HTTPEngineRequests
 
 if sys.version_info < (3, 8):  # pragma: no cover
     from typing_extensions import TypedDict
@@ -214,3 +217,39 @@ def test_http_replay_record(tmp_path: Path) -> None:
 
     for path in expected_paths:
         assert (tmp_path / path).read_bytes() == (REPLAY_PATH / path).read_bytes(), path
+
+
+@pytest.mark.parametrize("session_per_thread", [False, True])
+@pytest.mark.usefixtures("_mock_http_requests")
+def test_http_threads(session_per_thread: bool) -> None:
+    engines: List[HTTPEngineRequests] = []
+
+    def create_engine(session_per_thread: bool) -> HTTPEngineRequests:
+        engine = HTTPEngineRequests(session_per_thread=session_per_thread)
+        engines.append(engine)
+        return engine
+
+    Api._http.set_engine(  # pylint: disable=protected-access
+        create_engine, session_per_thread=session_per_thread
+    )
+
+    nb_threads = 16
+    client = Api("https://www.example.com/api/v1", "s3cr3t")
+    barrier = Barrier(nb_threads)
+    sessions: Set[int] = set()
+
+    def hammer() -> None:
+        barrier.wait()  # first access to the adapters at the same time
+        for _ in range(5):
+            assert client.public.version() == "1.2.3"
+            assert client.users.get(1337) == User(name="John Doe", age=42)
+        sessions.add(id(engines[0].session))
+
+    with ThreadPoolExecutor(nb_threads) as executor:
+        futures = [executor.submit(hammer) for _ in range(nb_threads)]
+    for future in futures:
+        future.result()
+
+    assert len(engines) == 1
+    assert client.users._http.engine is engines[0]  # pylint: disable=protected-access
+    assert len(sessions) == (nb_threads if session_per_thread else 1)
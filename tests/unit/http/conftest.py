@@ -1,9 +1,133 @@
+import gzip
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import sys
+from threading import Thread
+import time
+from typing import List, Tuple
+
 import pytest
 from requests_mock import Mocker
 
+from sdkite.http import _retry, circuit, concurrency, ratelimit, retrybudget
+from tests.unit.http.helpers import Clock
+
+if sys.version_info < (3, 9):  # pragma: no cover
+    from typing import Iterator
+else:  # pragma: no cover
+    from collections.abc import Iterator
+
 
 @pytest.fixture(autouse=True)
 def _mock_requests(
     requests_mock: Mocker,  # pylint: disable=unused-argument # noqa: ARG001
 ) -> None:
     pass
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    for module in (_retry, circuit, concurrency, ratelimit, retrybudget):
+        monkeypatch.setattr(module, "monotonic", clock.monotonic)
+    monkeypatch.setattr(ratelimit, "sleep", clock.sleep)
+    return clock
+
+
+class _LocalHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # faster tests
+
+    def log_message(self, *args: object) -> None:
+        pass
+
+    def _read_body(self) -> bytes:
+        if "chunked" not in self.headers.get("Transfer-Encoding", ""):
+            return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        parts: List[bytes] = []
+        while True:
+            size = int(self.rfile.readline().split(b";")[0], 16)
+            if size == 0:
+                self.rfile.readline()  # no trailers
+                return b"".join(parts)
+            parts.append(self.rfile.read(size))
+            self.rfile.readline()
+
+    def _send(self, status: int, body: bytes, *headers: Tuple[str, str]) -> None:
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_chunked(self, *chunks: bytes) -> None:
+        self.send_response(200)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in chunks:
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _handle(self) -> None:
+        body = self._read_body()
+        path = self.path.split("?", 1)[0]
+        if path == "/echo":
+            data = {
+                "method": self.command,
+                "path": self.path,
+                "headers": {
+                    name.lower(): value for name, value in self.headers.items()
+                },
+                "body": body.decode(),
+            }
+            self._send(
+                200,
+                json.dumps(data).encode(),
+                ("Content-Type", "application/json"),
+            )
+        elif path == "/gzip":
+            self._send(200, gzip.compress(b"hello world"), ("Content-Encoding", "gzip"))
+        elif path == "/chunked":
+            self._send_chunked(b"line 1\n", b"line 2\nli", b"ne 3\n")
+        elif path == "/latin1":
+            self._send(
+                200,
+                "é".encode("latin-1"),
+                ("Content-Type", "text/plain; charset=latin-1"),
+            )
+        elif path == "/big":
+            self._send(200, b"x" * 100_000)
+        elif path == "/truncated":
+            self.send_response(200)
+            self.send_header("Content-Length", "10")
+            self.end_headers()
+            self.wfile.write(b"abc")
+            self.close_connection = True
+        elif path == "/close":
+            self._send(200, b"ok", ("Connection", "close"))
+        elif path == "/slow":
+            time.sleep(0.5)
+            self._send(200, b"slow")
+        elif path.startswith("/status/"):
+            self._send(int(path[len("/status/") :]), b"", ("X-Status", "yes"))
+        else:
+            self._send(200, b"ok")
+
+    do_GET = do_POST = do_PUT = do_PATCH = do_DELETE = _handle  # noqa: N815
+
+
+@pytest.fixture
+def local_url(requests_mock: Mocker) -> Iterator[str]:
+    requests_mock.real_http = True
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _LocalHandler)
+    server.daemon_threads = True
+    thread = Thread(target=server.serve_forever, kwargs={"poll_interval": 0.01})
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}/"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
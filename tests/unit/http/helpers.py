@@ -0,0 +1,141 @@
+from threading import Event
+from typing import Any, Dict, Iterator, List, Mapping, Optional
+
+from sdkite import Client
+from sdkite.http import (
+    HTTPAdapterAsyncSendRequest,
+    HTTPAdapterSpec,
+    HTTPHeaderDict,
+    HTTPRequest,
+    HTTPResponse,
+)
+
+TIMEOUT = 5  # only reached if the test fails
+
+
+class FakeResponse(HTTPResponse):
+    def __init__(
+        self,
+        status_code: int = 200,
+        headers: Optional[Mapping[str, str]] = None,
+        body: bytes = b"",
+        *,
+        name: str = "",
+    ) -> None:
+        self._status_code = status_code
+        self._headers = HTTPHeaderDict(headers)
+        self.body = body
+        self.name = name
+        self.closed = Event()  # may be closed from another thread
+
+    @property
+    def raw(self) -> object:
+        raise ValueError("No raw response")
+
+    @property
+    def status_code(self) -> int:
+        return self._status_code
+
+    reason = "Some reason"
+
+    @property
+    def headers(self) -> HTTPHeaderDict:
+        return self._headers
+
+    @property
+    def data_stream(self) -> Iterator[bytes]:
+        raise NotImplementedError
+
+    @property
+    def data_bytes(self) -> bytes:
+        return self.body
+
+    data_str = ""
+    data_json = None
+
+    def _close(self) -> None:
+        self.closed.set()
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+        self.sleeps: List[float] = []
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def async_sleep(self, seconds: float) -> None:
+        self.sleep(seconds)
+
+
+def create_request(
+    method: str = "GET",
+    url: str = "https://www.example.com/foo",
+    body: bytes = b"",
+    *,
+    headers: Optional[Mapping[str, str]] = None,
+    stream_response: bool = False,
+) -> HTTPRequest:
+    return HTTPRequest(
+        method=method,
+        url=url,
+        headers=HTTPHeaderDict(headers),
+        body=body,
+        stream_response=stream_response,
+    )
+
+
+class FakeEngine:
+    # the queued responses are returned first, then responses built from the
+    # 'status_code', 'headers' and 'body' attributes
+    def __init__(self, status_code: int = 200) -> None:
+        self.requests: List[HTTPRequest] = []
+        self.responses: List[FakeResponse] = []
+        self.status_code = status_code
+        self.headers: Dict[str, str] = {}
+        self.body = b""
+
+    def __call__(self, request: HTTPRequest) -> HTTPResponse:
+        self.requests.append(request)
+        if self.responses:
+            return self.responses.pop(0)
+        return FakeResponse(self.status_code, self.headers, self.body)
+
+    async def send_async(self, request: HTTPRequest) -> Any:
+        return self(request)  # the adapter does not need an HTTPAsyncResponse
+
+
+def create_client(
+    engine: FakeEngine,
+    async_engine: Optional[HTTPAdapterAsyncSendRequest] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Client whose 'http' adapter (and the one of its 'child' sub-client) sends the
+    requests to the engines, without waiting between the attempts.
+    """
+
+    class ChildClient(Client):
+        http = HTTPAdapterSpec("child/")
+
+    class ApiClient(Client):
+        http = HTTPAdapterSpec(
+            "https://www.example.com/",
+            retry_wait_initial=0,
+            retry_wait_jitter=0,
+            **kwargs,
+        )
+        http.set_engine(lambda: engine)
+        http.set_async_engine(lambda: async_engine or engine.send_async)
+
+        child: ChildClient
+
+    return ApiClient()
@@ -1,12 +1,16 @@
+import asyncio
 import re
 import sys
-from typing import Any, Dict, List, Optional, Tuple, Union
+from threading import Event, Lock
+import time
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 from unittest.mock import Mock, call
 
 import pytest
 
 from sdkite.http import (
     HTTPAdapter,
+    HTTPAsyncResponse,
     HTTPBodyEncoding,
     HTTPContextError,
     HTTPHeaderDict,
@@ -14,12 +18,14 @@ from sdkite.http import (
     HTTPRequestAttemptInfo,
     HTTPResponse,
     HTTPStatusCodeError,
+    HTTPTimeoutError,
 )
+from sdkite.http import _retry as retry_module
 
 if sys.version_info < (3, 9):  # pragma: no cover
-    from typing import Iterator
+    from typing import AsyncIterator, Iterator
 else:  # pragma: no cover
-    from collections.abc import Iterator
+    from collections.abc import AsyncIterator, Iterator
 
 
 class FakeResponse(HTTPResponse):
@@ -40,7 +46,7 @@ class FakeResponse(HTTPResponse):
 
     @property
     def headers(self) -> HTTPHeaderDict:
-        raise NotImplementedError
+        return HTTPHeaderDict()
 
     @property
     def data_stream(self) -> Iterator[bytes]:
@@ -59,6 +65,40 @@ class FakeResponse(HTTPResponse):
         raise NotImplementedError
 
 
+class FakeAsyncResponse(HTTPAsyncResponse):
+    def __init__(self, status_code: int = 200) -> None:
+        self._status_code = status_code
+
+    @property
+    def raw(self) -> object:
+        raise NotImplementedError
+
+    @property
+    def status_code(self) -> int:
+        return self._status_code
+
+    @property
+    def reason(self) -> str:
+        raise NotImplementedError
+
+    @property
+    def headers(self) -> HTTPHeaderDict:
+        return HTTPHeaderDict()
+
+    @property
+    def data_stream(self) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+
+    async def data_bytes(self) -> bytes:
+        raise NotImplementedError
+
+    async def data_str(self) -> str:
+        raise NotImplementedError
+
+    async def data_json(self) -> object:
+        raise NotImplementedError
+
+
 def create_adapter(
     url: Optional[str] = None,
     headers: Optional[Dict[str, str]] = None,
@@ -67,7 +107,12 @@ def create_adapter(
     # pylint: disable=protected-access
     send_request = Mock()
     send_request.return_value.status_code = 200
-    adapter = HTTPAdapter(send_request)
+    send_request.return_value.headers = HTTPHeaderDict()
+
+    async def async_send_request(request: HTTPRequest) -> Any:
+        return send_request(request)
+
+    adapter = HTTPAdapter(send_request, async_send_request)
     adapter._attr_name = "http"
     client = Mock()
     client.http = adapter
@@ -81,6 +126,20 @@ def create_adapter(
     adapter.retry_wait_initial = 0  # change default value for faster tests
     adapter.retry_wait_max = None
     adapter.retry_wait_jitter = 0  # change default value for faster tests
+    adapter.retry_status_codes = None
+    adapter.retry_non_idempotent = None
+    adapter.idempotency_key_header = None
+    adapter.timeout_connect = None
+    adapter.timeout_read = None
+    adapter.timeout_total = None
+    adapter.data_memory_limit = None
+    adapter.decode_content = None
+    adapter.rate_limiter = None
+    adapter.retry_budget = None
+    adapter.circuit_breaker = None
+    adapter.hedging = None
+    adapter.concurrency_limiter = None
+    adapter.bulkhead = None
     adapter.request_interceptor = {}
     adapter.response_interceptor = {}
     return (adapter, send_request, client)
@@ -193,7 +252,10 @@ def test_request_retry(
 
     expected_response = FakeResponse()
 
-    class CustomError(Exception):
+    class CustomError(HTTPTimeoutError):  # retried as a transport error
+        def __init__(self, msg: str) -> None:
+            super().__init__(msg=msg, request=Mock())
+
         def __eq__(self, other: Any) -> bool:
             return type(self) is type(other) and self.args == other.args
 
@@ -563,3 +625,376 @@ def test_adapter_context_manager() -> None:
     )
     assert isinstance(exception.response, FakeResponse)
     assert isinstance(exception.__context__, ValueError)
+
+
+def test_data_memory_limit() -> None:
+    adapter, send_request, _ = create_adapter()
+    adapter.data_memory_limit = 1337
+    response = adapter.request("GET", "https://www.example.com")
+    assert response == send_request.return_value
+    assert send_request.call_args_list == [
+        call(
+            HTTPRequest(
+                method="GET",
+                url="https://www.example.com",
+                headers=HTTPHeaderDict(),
+                body=b"",
+                stream_response=True,  # to read the body within the limit
+                timeout_read=30,  # default of the responses not streamed
+            )
+        )
+    ]
+    # context set once on the response, as it is not replaced by an interceptor
+    set_context = cast(Mock, response._set_context)  # pylint: disable=protected-access
+    assert set_context.call_args_list == [
+        call(
+            HTTPRequest(
+                method="GET",
+                url="https://www.example.com",
+                headers=HTTPHeaderDict(),
+                body=b"",
+                stream_response=False,
+            ),
+            data_memory_limit=1337,
+        )
+    ]
+
+    # overridden at request level
+    adapter.request("GET", "https://www.example.com", data_memory_limit=42)
+    assert set_context.call_args_list[-1].kwargs == {"data_memory_limit": 42}
+    # the default read timeout is kept for the streamed responses
+    adapter.request("GET", "https://www.example.com", stream_response=True)
+    assert send_request.call_args.args[0].timeout_read is None
+
+
+def test_decode_content() -> None:
+    adapter, send_request, _ = create_adapter()
+    adapter.request("GET", "https://www.example.com")
+    adapter.decode_content = False
+    adapter.request("GET", "https://www.example.com")
+    adapter.request("GET", "https://www.example.com", decode_content=True)
+    assert [
+        request.decode_content for (request,), _ in send_request.call_args_list
+    ] == [True, False, True]
+
+
+def test_timeouts() -> None:
+    parent_adapter, _, _ = create_adapter()
+    parent_adapter.timeout_connect = 5
+    parent_adapter.timeout_read = 10
+    adapter, send_request, _ = create_adapter(parent_adapter=parent_adapter)
+    adapter.request("GET", "https://www.example.com")
+    adapter.timeout_read = 20
+    adapter.request("GET", "https://www.example.com")
+    adapter.request("GET", "https://www.example.com", timeout_connect=1)
+    assert [
+        (request.timeout_connect, request.timeout_read)
+        for (request,), _ in send_request.call_args_list
+    ] == [(5, 10), (5, 20), (1, 20)]
+
+    # engine defaults
+    adapter, send_request, _ = create_adapter()
+    adapter.request("GET", "https://www.example.com")
+    request = send_request.call_args.args[0]
+    assert request.timeout_connect is None
+    assert request.timeout_read is None
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> List[float]:
+    now = [1000.0]
+    monkeypatch.setattr(retry_module, "monotonic", lambda: now[0])
+    return now
+
+
+def test_timeout_total(
+    clock: List[float],  # pylint: disable=redefined-outer-name
+) -> None:
+    adapter, send_request, _ = create_adapter()
+    adapter.retry_nb_attempts = 10
+
+    def do_send_request(_: HTTPRequest) -> FakeResponse:
+        clock[0] += 4
+        return FakeResponse(503)
+
+    send_request.side_effect = do_send_request
+
+    # attempts are stopped by the deadline, and last at most the remaining time
+    with pytest.raises(HTTPStatusCodeError):
+        adapter.request("GET", "https://www.example.com", timeout_total=10)
+    assert [
+        (request.timeout_connect, request.timeout_read)
+        for (request,), _ in send_request.call_args_list
+    ] == [(10, 10), (6, 6), (2, 2)]
+
+    # shorter timeouts are kept
+    send_request.reset_mock()
+    adapter.timeout_total = 10
+    adapter.timeout_connect = 3
+    with pytest.raises(HTTPStatusCodeError):
+        adapter.request("GET", "https://www.example.com")
+    assert [
+        (request.timeout_connect, request.timeout_read)
+        for (request,), _ in send_request.call_args_list
+    ] == [(3, 10), (3, 6), (2, 2)]
+
+    # wait time between attempts is taken into account
+    send_request.reset_mock()
+    adapter.retry_wait_initial = 0.01
+    with pytest.raises(HTTPStatusCodeError):
+        adapter.request("GET", "https://www.example.com", timeout_total=8.005)
+    assert send_request.call_count == 2
+
+    # no limit on the number of attempts
+    send_request.reset_mock()
+    adapter.retry_wait_initial = 0
+    adapter.timeout_total = None
+    with pytest.raises(HTTPStatusCodeError):
+        adapter.request("GET", "https://www.example.com")
+    assert send_request.call_count == 10
+
+
+def test_timeout_total_exceeded(
+    clock: List[float],  # pylint: disable=redefined-outer-name
+) -> None:
+    adapter, send_request, client = create_adapter()
+    adapter.request_interceptor["inter"] = 0
+
+    def intercept(request: HTTPRequest, _: HTTPAdapter) -> HTTPRequest:
+        clock[0] += 2
+        return request
+
+    client.inter.side_effect = intercept
+
+    with pytest.raises(HTTPTimeoutError, match=r"^Total timeout of 1.5s exceeded$"):
+        adapter.request("GET", "https://www.example.com", timeout_total=1.5)
+    assert not send_request.called
+
+    with pytest.raises(HTTPTimeoutError, match=r"^Total timeout of 1.5s exceeded$"):
+        asyncio.run(adapter.aget("https://www.example.com", timeout_total=1.5))
+    assert not send_request.called
+
+
+def test_request_many() -> None:
+    adapter, send_request, client = create_adapter("https://www.example.com/")
+
+    adapter.request_interceptor["inter"] = 0
+    client.inter.side_effect = lambda request, _: request
+
+    attempts: Dict[str, int] = {}
+    lock = Lock()
+
+    def do_send_request(request: HTTPRequest) -> FakeResponse:
+        with lock:
+            attempts[request.url] = attempts.get(request.url, 0) + 1
+            attempt = attempts[request.url]
+        if request.url.endswith("/flaky") and attempt == 1:
+            return FakeResponse(503)
+        if request.url.endswith("/missing"):
+            return FakeResponse(404)
+        return FakeResponse(200)
+
+    send_request.side_effect = do_send_request
+
+    results = list(
+        adapter.request_many(
+            [
+                {"method": "GET", "url": "first"},
+                {"method": "POST", "url": "flaky", "body": b"data"},
+                {"method": "GET", "url": "missing"},
+                {"method": "GET", "url": "missing", "retry_nb_attempts": 1},
+                {"url": "no-method"},
+            ]
+        )
+    )
+
+    assert [result.index for result in results] == [0, 1, 2, 3, 4]
+    assert isinstance(results[0].response, FakeResponse)
+    assert results[0].exception is None
+    assert isinstance(results[1].response, FakeResponse)
+    assert results[1].response.status_code == 200
+    for result in results[2:4]:
+        assert result.response is None
+        assert isinstance(result.exception, HTTPStatusCodeError)
+    assert results[4].response is None
+    assert isinstance(results[4].exception, TypeError)
+
+    # full pipeline for each request (404 is not retried)
+    assert attempts == {
+        "https://www.example.com/first": 1,
+        "https://www.example.com/flaky": 2,
+        "https://www.example.com/missing": 2,
+    }
+    assert client.inter.call_count == 5
+
+
+def test_request_many_unordered() -> None:
+    adapter, send_request, _ = create_adapter("https://www.example.com/")
+    second_done = Event()
+
+    def do_send_request(request: HTTPRequest) -> FakeResponse:
+        if request.url.endswith("/first"):
+            assert second_done.wait(5)
+        return FakeResponse(200)
+
+    send_request.side_effect = do_send_request
+
+    results = adapter.request_many(
+        [{"method": "GET", "url": "first"}, {"method": "GET", "url": "second"}],
+        ordered=False,
+    )
+    result = next(results)
+    assert result.index == 1
+    second_done.set()
+    assert [result.index for result in results] == [0]
+
+
+def test_request_many_max_workers() -> None:
+    adapter, send_request, _ = create_adapter("https://www.example.com/")
+    running = 0
+    max_running = 0
+    lock = Lock()
+
+    def do_send_request(_: HTTPRequest) -> FakeResponse:
+        nonlocal running, max_running
+        with lock:
+            running += 1
+            max_running = max(max_running, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        return FakeResponse(200)
+
+    send_request.side_effect = do_send_request
+
+    results = list(adapter.request_many([{"method": "GET"}] * 12, max_workers=3))
+    assert len(results) == 12
+    assert all(result.exception is None for result in results)
+    assert 1 < max_running <= 3
+
+
+def test_request_many_stopped_early() -> None:
+    adapter, send_request, _ = create_adapter("https://www.example.com/")
+    second_sent = Event()
+    responses: List[Mock] = []
+    lock = Lock()
+
+    def do_send_request(_: HTTPRequest) -> Mock:
+        with lock:
+            responses.append(Mock(status_code=200))
+            response = responses[-1]
+        if response is responses[0]:
+            assert second_sent.wait(5)
+        second_sent.set()
+        time.sleep(0.01)
+        return response
+
+    send_request.side_effect = do_send_request
+
+    results = adapter.request_many([{"method": "GET"}] * 100, max_workers=2)
+    assert next(results).response is responses[0]
+    results.close()  # type: ignore[attr-defined]
+    assert send_request.call_count < 100
+    # the responses received but not yielded are closed
+    # pylint: disable=protected-access
+    assert not responses[0]._close.called
+    assert len(responses) > 1
+    assert all(response._close.called for response in responses[1:])
+
+
+@pytest.mark.parametrize(
+    "method", ["get", "options", "head", "post", "put", "patch", "delete"]
+)
+def test_arequest(method: str) -> None:
+    adapter, send_request, _ = create_adapter()
+
+    async def main() -> None:
+        response = await adapter.arequest(
+            method, "https://www.example.com/foo", body=b"foobar"
+        )
+        assert response == send_request.return_value
+        response = await getattr(adapter, f"a{method}")(
+            "https://www.example.com/foo", body=b"foobar"
+        )
+        assert response == send_request.return_value
+
+    asyncio.run(main())
+    assert (
+        send_request.call_args_list
+        == [
+            call(
+                HTTPRequest(
+                    method=method.upper(),
+                    url="https://www.example.com/foo",
+                    headers=HTTPHeaderDict(),
+                    body=b"foobar",
+                    stream_response=False,
+                )
+            )
+        ]
+        * 2
+    )
+
+
+def test_arequest_retry_and_interceptors() -> None:
+    adapter, send_request, client = create_adapter()
+
+    adapter.request_interceptor["inter_req"] = 0
+    adapter.response_interceptor["inter_resp"] = 0
+    client.inter_req.side_effect = lambda request, _: request
+    client.inter_resp.side_effect = lambda response, _: response
+
+    responses = [FakeAsyncResponse(503), FakeAsyncResponse(200)]
+    send_request.side_effect = lambda _: responses.pop(0)
+
+    logged_retries: List[int] = []
+
+    def retry_callback(attempt_info: HTTPRequestAttemptInfo) -> None:
+        logged_retries.append(attempt_info.attempt_number)
+
+    response = asyncio.run(
+        adapter.arequest(
+            "GET", "https://www.example.com", retry_callback=retry_callback
+        )
+    )
+    assert isinstance(response, FakeAsyncResponse)
+    assert response.status_code == 200
+    assert logged_retries == [1]
+    assert client.inter_req.call_count == 2
+    assert client.inter_resp.call_count == 2
+
+    send_request.side_effect = lambda _: FakeAsyncResponse(404)
+    with pytest.raises(HTTPStatusCodeError, match="^Unexpected status code: 404$"):
+        asyncio.run(
+            adapter.arequest("GET", "https://www.example.com", retry_nb_attempts=1)
+        )
+
+
+def test_arequest_context_manager() -> None:
+    adapter, send_request, _ = create_adapter()
+    send_request.side_effect = lambda _: FakeAsyncResponse()
+
+    async def main() -> None:
+        async with await adapter.aget("https://www.example.com") as response:
+            assert isinstance(response, FakeAsyncResponse)
+
+        with pytest.raises(HTTPContextError, match="^ValueError: oops$"):  # noqa: PT012
+            async with await adapter.aget("https://www.example.com"):
+                raise ValueError("oops")
+
+    asyncio.run(main())
+
+
+def test_arequest_data_memory_limit() -> None:
+    adapter, send_request, _ = create_adapter()
+    adapter.data_memory_limit = 1337
+    response = asyncio.run(adapter.aget("https://www.example.com"))
+    assert send_request.call_args_list[0].args[0].stream_response is True
+    set_context = cast(Mock, response._set_context)  # pylint: disable=protected-access
+    assert set_context.call_args_list[-1].kwargs == {"data_memory_limit": 1337}
+
+
+def test_arequest_no_async_engine() -> None:
+    adapter = HTTPAdapter(Mock())
+    with pytest.raises(ValueError, match="^No async engine set$"):
+        asyncio.run(adapter.aget("https://www.example.com"))
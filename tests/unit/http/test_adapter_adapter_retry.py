@@ -0,0 +1,303 @@
+import re
+from typing import Any, Dict, List, Optional, Union
+from unittest.mock import Mock
+
+import pytest
+
+from sdkite import Client
+from sdkite.http import (
+    HTTPAdapter,
+    HTTPAdapterSpec,
+    HTTPConnectionError,
+    HTTPError,
+    HTTPHeaderDict,
+    HTTPRequest,
+    HTTPResponse,
+    HTTPStatusCodeError,
+    HTTPTimeoutError,
+)
+from sdkite.http import _retry as retry_module
+from sdkite.http._retry import _RetryAfterWait
+from tests.unit.http import helpers
+
+
+class FakeResponse(HTTPResponse):
+    def __init__(
+        self, status_code: int, headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        self._status_code = status_code
+        self._headers = HTTPHeaderDict(headers)
+
+    @property
+    def status_code(self) -> int:
+        return self._status_code
+
+    @property
+    def headers(self) -> HTTPHeaderDict:
+        return self._headers
+
+    raw = None
+    reason = "Some reason"
+    data_stream = iter(())
+    data_bytes = b""
+    data_str = ""
+    data_json = None
+
+
+class FakeEngine:
+    def __init__(self) -> None:
+        self.requests: List[HTTPRequest] = []
+        self.outcome: Union[int, Exception] = 200
+
+    def __call__(self, request: HTTPRequest) -> HTTPResponse:
+        self.requests.append(request)
+        if isinstance(self.outcome, Exception):
+            raise self.outcome
+        return FakeResponse(self.outcome)
+
+
+def create_client(engine: FakeEngine, **spec_kwargs: Any) -> Any:
+    class ApiClient(Client):
+        _http = HTTPAdapterSpec(
+            "https://www.example.com/",
+            retry_wait_initial=0,
+            retry_wait_jitter=0,
+            **spec_kwargs,
+        )
+        _http.set_engine(lambda: engine)
+
+    return ApiClient()._http  # pylint: disable=protected-access
+
+
+@pytest.mark.parametrize(
+    ["outcome", "nb_attempts"],
+    [
+        pytest.param(408, 3, id="408"),
+        pytest.param(429, 3, id="429"),
+        pytest.param(500, 3, id="500"),
+        pytest.param(503, 3, id="503"),
+        pytest.param(400, 1, id="400"),
+        pytest.param(404, 1, id="404"),
+        pytest.param(501, 1, id="501"),
+        pytest.param(
+            HTTPConnectionError(msg="Boom", request=Mock()), 3, id="connection"
+        ),
+        pytest.param(HTTPTimeoutError(msg="Boom", request=Mock()), 3, id="timeout"),
+        pytest.param(HTTPError(msg="Boom", request=Mock()), 1, id="http-error"),
+        pytest.param(ValueError("Boom"), 1, id="other"),
+    ],
+)
+def test_default_policy(outcome: Union[int, Exception], nb_attempts: int) -> None:
+    engine = FakeEngine()
+    engine.outcome = outcome
+    http = create_client(engine)
+
+    with pytest.raises((HTTPError, ValueError)):
+        http.get()
+    assert len(engine.requests) == nb_attempts
+
+
+@pytest.mark.parametrize(
+    ["method", "outcome", "retry_non_idempotent", "nb_attempts"],
+    [
+        ("POST", 500, None, 1),
+        ("PATCH", 502, None, 1),
+        ("POST", 429, None, 3),
+        ("POST", 503, None, 3),
+        ("POST", 404, True, 1),
+        ("POST", HTTPConnectionError(msg="Boom", request=Mock()), None, 1),
+        ("POST", 500, True, 3),
+        ("POST", HTTPConnectionError(msg="Boom", request=Mock()), True, 3),
+        ("PUT", 500, None, 3),
+        ("DELETE", HTTPConnectionError(msg="Boom", request=Mock()), None, 3),
+    ],
+)
+def test_non_idempotent(
+    method: str,
+    outcome: Union[int, Exception],
+    retry_non_idempotent: Optional[bool],
+    nb_attempts: int,
+) -> None:
+    engine = FakeEngine()
+    engine.outcome = outcome
+    http = create_client(engine)
+
+    with pytest.raises(HTTPError):
+        http.request(method, retry_non_idempotent=retry_non_idempotent)
+    assert len(engine.requests) == nb_attempts
+
+
+def test_idempotency_key() -> None:
+    engine = FakeEngine()
+    engine.outcome = 500
+    http = create_client(engine, idempotency_key_header="Idempotency-Key")
+
+    # the same key is used for all the attempts
+    with pytest.raises(HTTPStatusCodeError):
+        http.post()
+    assert len(engine.requests) == 3
+    keys = {request.headers["idempotency-key"] for request in engine.requests}
+    assert len(keys) == 1
+    assert re.match(r"^[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12}$", keys.pop())
+
+    # a new key for each request
+    engine.requests.clear()
+    with pytest.raises(HTTPStatusCodeError):
+        http.patch(retry_nb_attempts=1)
+    with pytest.raises(HTTPStatusCodeError):
+        http.patch(retry_nb_attempts=1)
+    assert len({request.headers["idempotency-key"] for request in engine.requests}) == 2
+
+    # the key given by the caller is kept
+    engine.requests.clear()
+    with pytest.raises(HTTPStatusCodeError):
+        http.post(headers={"idempotency-key": "abc"})
+    assert [request.headers["idempotency-key"] for request in engine.requests] == [
+        "abc"
+    ] * 3
+
+    # no key for idempotent methods
+    engine.requests.clear()
+    with pytest.raises(HTTPStatusCodeError):
+        http.put()
+    assert len(engine.requests) == 3
+    assert "idempotency-key" not in engine.requests[0].headers
+
+
+def test_idempotency_key_not_set() -> None:
+    engine = FakeEngine()
+    engine.outcome = 500
+    http = create_client(engine)
+
+    # the key given by the caller is not enough to retry the request
+    with pytest.raises(HTTPStatusCodeError):
+        http.post(headers={"Idempotency-Key": "abc"})
+    assert len(engine.requests) == 1
+
+
+def test_retry_status_codes() -> None:
+    engine = FakeEngine()
+    engine.outcome = 404
+    http = create_client(engine, retry_status_codes=["4xx"])
+
+    with pytest.raises(HTTPStatusCodeError):
+        http.get()
+    assert len(engine.requests) == 3
+
+    engine.requests.clear()
+    with pytest.raises(HTTPStatusCodeError):
+        http.request("GET", retry_status_codes=500)
+    assert len(engine.requests) == 1
+
+    engine.requests.clear()
+    engine.outcome = 500
+    with pytest.raises(HTTPStatusCodeError):
+        http.request("GET", retry_status_codes=500)
+    assert len(engine.requests) == 3
+
+
+def test_success_not_retried() -> None:
+    engine = FakeEngine()
+    http = create_client(engine, retry_status_codes="2xx")
+    assert http.get(expected_status_codes=200).status_code == 200
+    assert len(engine.requests) == 1
+
+
+def create_retry_call_state(exception: BaseException) -> Any:
+    retry_call_state = Mock()
+    retry_call_state.outcome.exception.return_value = exception
+    return retry_call_state
+
+
+def create_status_code_error(headers: Dict[str, str]) -> HTTPStatusCodeError:
+    return HTTPStatusCodeError(
+        status_code=503,
+        request=Mock(),
+        response=FakeResponse(503, headers),
+    )
+
+
+@pytest.mark.parametrize(
+    ["retry_after", "expected"],
+    [
+        pytest.param("12", 12, id="seconds"),
+        pytest.param("0", 0, id="zero"),
+        pytest.param("-5", 0, id="negative"),
+        pytest.param("120", 60, id="capped"),
+        pytest.param("Mon, 02 Jan 2023 10:00:30 GMT", 30, id="date"),
+        pytest.param("Mon, 02 Jan 2023 09:00:00 GMT", 0, id="date-past"),
+        pytest.param("soon", 1.5, id="invalid"),
+        pytest.param(None, 1.5, id="missing"),
+    ],
+)
+def test_retry_after_wait(
+    monkeypatch: pytest.MonkeyPatch, retry_after: Optional[str], expected: float
+) -> None:
+    monkeypatch.setattr(retry_module, "time", lambda: 1672653600)
+    wait = _RetryAfterWait(lambda _: 1.5, 60)
+    headers = {} if retry_after is None else {"Retry-After": retry_after}
+    exception = create_status_code_error(headers)
+    assert wait(create_retry_call_state(exception)) == pytest.approx(expected)
+
+
+def test_retry_after_wait_other_exception() -> None:
+    wait = _RetryAfterWait(lambda _: 1.5, 60)
+    assert (
+        wait(create_retry_call_state(HTTPConnectionError(msg="Boom", request=Mock())))
+        == 1.5
+    )
+    exception = HTTPStatusCodeError(status_code=503, request=Mock(), response=None)
+    assert wait(create_retry_call_state(exception)) == 1.5
+
+
+def test_retry_after_client() -> None:
+    responses = [FakeResponse(503, {"Retry-After": "0"}), FakeResponse(200)]
+
+    def send(_: HTTPRequest) -> HTTPResponse:
+        return responses.pop(0)
+
+    class ApiClient(Client):
+        # the test would hang if Retry-After was not honored
+        _http = HTTPAdapterSpec(
+            "https://www.example.com/", retry_wait_initial=60, retry_wait_jitter=0
+        )
+        _http.set_engine(lambda: send)
+
+    client = ApiClient()
+    assert client._http.get().status_code == 200  # pylint: disable=protected-access
+    assert not responses
+
+
+def test_status_code_error_closes_response() -> None:
+    engine = helpers.FakeEngine()
+    responses = [helpers.FakeResponse(503) for _ in range(3)]
+    engine.responses = list(responses)
+    http = helpers.create_client(engine, data_memory_limit=1000).http
+
+    # the streamed responses do not keep their connection
+    with pytest.raises(HTTPStatusCodeError):
+        http.get()
+    assert len(engine.requests) == 3
+    assert all(request.stream_response for request in engine.requests)
+    assert all(response.closed.is_set() for response in responses)
+
+
+def test_status_code_error_closes_intercepted_response() -> None:
+    engine = helpers.FakeEngine()
+    engine_response, wrapped = helpers.FakeResponse(503), helpers.FakeResponse(503)
+    engine.responses = [engine_response]
+
+    class ApiClient(Client):
+        _http = HTTPAdapterSpec("https://www.example.com/", retry_nb_attempts=1)
+        _http.set_engine(lambda: engine)
+
+        @_http.intercept_response(0)
+        @staticmethod
+        def wrap(_: HTTPResponse, __: HTTPAdapter) -> HTTPResponse:
+            return wrapped
+
+    # both the engine response and the one of the interceptor are closed
+    with pytest.raises(HTTPStatusCodeError):
+        ApiClient()._http.get()  # pylint: disable=protected-access
+    assert engine_response.closed.is_set()
+    assert wrapped.closed.is_set()
@@ -1,21 +1,35 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import nullcontext
 import re
-from typing import TYPE_CHECKING, Any
+from threading import Barrier, Lock
+from typing import TYPE_CHECKING, Any, Dict, cast
 from unittest.mock import Mock, call
 
 import pytest
+import tenacity as tenacity_module
 
 from sdkite.http import (
     HTTPAdapter,
+    HTTPAdapterAsyncSendRequest,
     HTTPAdapterSendRequest,
     HTTPAdapterSpec,
+    HTTPAsyncResponse,
     HTTPBodyEncoding,
+    HTTPBulkhead,
+    HTTPCircuitBreaker,
+    HTTPConcurrencyLimiter,
     HTTPHeaderDict,
+    HTTPHedging,
+    HTTPRateLimiter,
     HTTPRequest,
     HTTPResponse,
+    HTTPRetryBudget,
 )
 from sdkite.http import adapter as adapter_module
-from sdkite.http.adapter import _BeforeSleep
+from sdkite.http._retry import _BeforeSleep, _RetryAfterWait, _RetryCondition
+from sdkite.http.engine_asyncio import HTTPEngineAsyncio
+from sdkite.http.engine_requests import HTTPEngineRequests
 
 if TYPE_CHECKING:
     from sdkite import Client
@@ -56,7 +70,7 @@ class FakeResponse(HTTPResponse):
 def _patched_adapter(monkeypatch: pytest.MonkeyPatch) -> None:
     engine = Mock()
     engine.return_value = lambda request: FakeResponse("send_request", request)
-    monkeypatch.setattr(adapter_module, "HTTPEngineRequests", engine)
+    monkeypatch.setattr(adapter_module, "_create_default_engine", engine)
 
 
 @pytest.fixture
@@ -68,7 +82,7 @@ def patched_tenacity(monkeypatch: pytest.MonkeyPatch) -> Mock:
     tenacity.wait_exponential_jitter.side_effect = call
 
     for attr in ["Retrying", "stop_after_attempt", "wait_exponential_jitter"]:
-        monkeypatch.setattr(adapter_module, attr, getattr(tenacity, attr))
+        monkeypatch.setattr(tenacity_module, attr, getattr(tenacity, attr))
 
     return tenacity
 
@@ -96,9 +110,13 @@ def test_base(
     assert patched_tenacity.Retrying.call_args_list == [
         call(
             stop=patched_tenacity.stop_after_attempt(3),
-            wait=patched_tenacity.wait_exponential_jitter(
-                initial=1.0, max=60.0, jitter=1.0
+            wait=_RetryAfterWait(
+                patched_tenacity.wait_exponential_jitter(
+                    initial=1.0, max=60.0, jitter=1.0
+                ),
+                60.0,
             ),
+            retry=_RetryCondition((408, 429, 500, 502, 503, 504), idempotent=True),
             before_sleep=_BeforeSleep(None, expected_request),
             reraise=True,
         )
@@ -138,9 +156,13 @@ def test_retry_at_spec_level(
     assert patched_tenacity.Retrying.call_args_list == [
         call(
             stop=patched_tenacity.stop_after_attempt(1),
-            wait=patched_tenacity.wait_exponential_jitter(
-                initial=2.0, max=3.0, jitter=4.0
+            wait=_RetryAfterWait(
+                patched_tenacity.wait_exponential_jitter(
+                    initial=2.0, max=3.0, jitter=4.0
+                ),
+                3.0,
             ),
+            retry=_RetryCondition((408, 429, 500, 502, 503, 504), idempotent=True),
             before_sleep=_BeforeSleep(retry_callback0, expected_request),
             reraise=True,
         )
@@ -159,15 +181,81 @@ def test_retry_at_spec_level(
     assert patched_tenacity.Retrying.call_args_list == [
         call(
             stop=patched_tenacity.stop_after_attempt(6),
-            wait=patched_tenacity.wait_exponential_jitter(
-                initial=7.0, max=8.0, jitter=9.0
+            wait=_RetryAfterWait(
+                patched_tenacity.wait_exponential_jitter(
+                    initial=7.0, max=8.0, jitter=9.0
+                ),
+                8.0,
             ),
+            retry=_RetryCondition((408, 429, 500, 502, 503, 504), idempotent=True),
             before_sleep=_BeforeSleep(retry_callback1, expected_request),
             reraise=True,
         )
     ]
 
 
+def test_timeouts_at_spec_level() -> None:
+    class Klass(Client):
+        _parent = None
+
+        xxx = HTTPAdapterSpec(
+            url="https://www.example.com/xxx",
+            timeout_connect=5,
+            timeout_read=10,
+            timeout_total=60,
+        )
+
+    client = Klass()
+    response = client.xxx.request("GET", "uvw", timeout_read=20)
+    request = response.raw
+    assert isinstance(request, HTTPRequest)
+    assert request.timeout_connect == 5
+    assert request.timeout_read == 20
+
+
+@pytest.mark.parametrize(
+    ["attr", "obj"],
+    [
+        ("rate_limiter", HTTPRateLimiter(1)),
+        ("retry_budget", HTTPRetryBudget()),
+        ("circuit_breaker", HTTPCircuitBreaker()),
+        ("hedging", HTTPHedging()),
+        ("concurrency_limiter", HTTPConcurrencyLimiter()),
+        ("bulkhead", HTTPBulkhead()),
+    ],
+)
+def test_shared_policy_at_spec_level(attr: str, obj: object) -> None:
+    class Klass(Client):
+        _parent = None
+
+        xxx = HTTPAdapterSpec(
+            url="https://www.example.com/xxx", **cast(Dict[str, Any], {attr: obj})
+        )
+
+    # the state of the object is shared by all clients
+    assert getattr(Klass().xxx, attr) is obj
+    assert getattr(Klass().xxx, attr) is obj
+    assert getattr(HTTPAdapterSpec(), attr) is None
+
+
+def test_warmup() -> None:
+    engine = Mock()
+
+    class Klass(Client):
+        _parent = None
+
+        xxx = HTTPAdapterSpec(url="https://www.example.com/xxx")
+        xxx.set_engine(lambda: engine)
+
+        yyy = HTTPAdapterSpec(url="https://www.example.com/yyy")
+
+    client = Klass()
+    client.xxx.warmup(3)
+    engine.warmup.assert_called_once_with("https://www.example.com/xxx", 3)
+    # not supported by the engine
+    client.yyy.warmup()
+
+
 def test_overidden_content_type() -> None:
     class Klass(Client):
         _parent = None
@@ -387,14 +475,19 @@ def test_custom_engine() -> None:
 
         xxx = HTTPAdapterSpec(url="https://www.example.com/xxx")
 
+    # the arguments are checked when the adapter is created
+    Klass.xxx.set_engine(custom_engine)  # type: ignore[call-arg]
     with pytest.raises(TypeError):
-        Klass.xxx.set_engine(custom_engine)  # type: ignore[call-arg]
+        Klass().xxx  # pylint: disable=expression-not-assigned  # noqa: B018
+    Klass.xxx.set_engine(custom_engine, 42)  # type: ignore[call-arg]
     with pytest.raises(TypeError):
-        Klass.xxx.set_engine(custom_engine, 42)  # type: ignore[call-arg]
+        Klass().xxx  # pylint: disable=expression-not-assigned  # noqa: B018
+    Klass.xxx.set_engine(custom_engine, 42, 1337)  # type: ignore[misc]
     with pytest.raises(TypeError):
-        Klass.xxx.set_engine(custom_engine, 42, 1337)  # type: ignore[misc]
+        Klass().xxx  # pylint: disable=expression-not-assigned  # noqa: B018
+    Klass.xxx.set_engine(custom_engine, param1=1337)  # type: ignore[call-arg]
     with pytest.raises(TypeError):
-        Klass.xxx.set_engine(custom_engine, param1=1337)  # type: ignore[call-arg]
+        Klass().xxx  # pylint: disable=expression-not-assigned  # noqa: B018
 
     Klass.xxx.set_engine(custom_engine, 42, param1=1337)
 
@@ -410,3 +503,103 @@ def test_custom_engine() -> None:
             stream_response=False,
         ),
     )
+
+
+def test_custom_async_engine() -> None:
+    def custom_engine(param0: int, *, param1: int) -> HTTPAdapterAsyncSendRequest:
+        async def send_request(request: HTTPRequest) -> HTTPAsyncResponse:
+            # only the status code is used by the adapter
+            response = FakeResponse(f"engine-{param0}-{param1}", request)
+            return cast(HTTPAsyncResponse, response)
+
+        return send_request
+
+    class Klass(Client):
+        _parent = None
+
+        xxx = HTTPAdapterSpec(url="https://www.example.com/xxx")
+
+    # the arguments are checked when the adapter is created, not on first use
+    Klass.xxx.set_async_engine(custom_engine, 42)  # type: ignore[call-arg]
+    with pytest.raises(TypeError):
+        Klass().xxx  # pylint: disable=expression-not-assigned  # noqa: B018
+
+    Klass.xxx.set_async_engine(custom_engine, 42, param1=1337)
+
+    client = Klass()
+    response = asyncio.run(client.xxx.arequest("GET", "uvw"))
+    assert response == FakeResponse(
+        "engine-42-1337",
+        HTTPRequest(
+            method="GET",
+            url="https://www.example.com/xxx/uvw",
+            headers=HTTPHeaderDict(),
+            body=b"",
+            stream_response=False,
+        ),
+    )
+
+
+def test_engine_access() -> None:
+    # pylint: disable=protected-access
+    class Klass(Client):
+        _parent = None
+
+        xxx = HTTPAdapterSpec(url="https://www.example.com/xxx")
+        xxx.set_engine(HTTPEngineRequests, pool_maxsize=20, pool_block=True)
+
+    client = Klass()
+    engine = client.xxx.engine
+    assert isinstance(engine, HTTPEngineRequests)
+    assert client.xxx.engine is engine
+    adapter = engine.session.get_adapter("https://www.example.com/")
+    assert adapter._pool_maxsize == 20  # type: ignore[attr-defined]
+    assert adapter._pool_block  # type: ignore[attr-defined]
+    assert isinstance(client.xxx.async_engine, HTTPEngineAsyncio)
+
+    with pytest.raises(AttributeError):
+        client.xxx.engine = engine  # type: ignore[misc]
+
+
+class _BarrierLock:
+    # make all threads wait for each other before trying to get the lock
+    # so that they all see the async engine as not created yet
+    def __init__(self, nb_threads: int) -> None:
+        self.barrier = Barrier(nb_threads)
+        self.lock = Lock()
+
+    def __enter__(self) -> None:
+        self.barrier.wait()
+        self.lock.acquire()
+
+    def __exit__(self, *args: object) -> None:
+        self.lock.release()
+
+
+def test_async_engine_created_on_first_use() -> None:
+    nb_threads = 4
+    engine = Mock(return_value=HTTPEngineAsyncio())
+
+    class Klass(Client):
+        _parent = None
+
+        xxx = HTTPAdapterSpec(url="https://www.example.com/xxx")
+        xxx.set_async_engine(engine)
+
+    client = Klass()
+    assert client.xxx.url == "https://www.example.com/xxx"
+    assert engine.call_count == 0
+
+    # pylint: disable-next=protected-access
+    client.xxx._lock = _BarrierLock(nb_threads)  # type: ignore[assignment]
+    with ThreadPoolExecutor(nb_threads) as executor:
+        futures = [
+            executor.submit(lambda: client.xxx.async_engine) for _ in range(nb_threads)
+        ]
+    assert {id(future.result()) for future in futures} == {id(engine.return_value)}
+    assert engine.call_count == 1
+
+    # the lock may have been held by another thread of the parent process
+    lock = client.xxx._lock  # pylint: disable=protected-access
+    client.xxx._after_fork()  # pylint: disable=protected-access
+    assert client.xxx._lock is not lock  # pylint: disable=protected-access
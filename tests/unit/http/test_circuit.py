@@ -0,0 +1,369 @@
+import asyncio
+from contextlib import suppress
+from typing import Any, Callable, List, Tuple, Union
+
+import pytest
+
+from sdkite.http import (
+    HTTPCircuitBreaker,
+    HTTPCircuitOpenError,
+    HTTPCircuitState,
+    HTTPConnectionError,
+    HTTPRequest,
+    HTTPResponse,
+    HTTPStatusCodeError,
+)
+from tests.unit.http.helpers import (
+    Clock,
+    FakeEngine,
+    FakeResponse,
+    create_client,
+    create_request,
+)
+
+CLOSED = HTTPCircuitState.CLOSED
+OPEN = HTTPCircuitState.OPEN
+HALF_OPEN = HTTPCircuitState.HALF_OPEN
+
+Transition = Tuple[str, HTTPCircuitState, HTTPCircuitState]
+
+
+def respond(outcome: Union[int, Exception]) -> Callable[[HTTPRequest], HTTPResponse]:
+    def send_request(_: HTTPRequest) -> HTTPResponse:
+        if isinstance(outcome, Exception):
+            raise outcome
+        return FakeResponse(outcome)
+
+    return send_request
+
+
+def respond_async(status_code: int) -> Callable[[HTTPRequest], Any]:
+    async def async_send_request(_: HTTPRequest) -> Any:
+        return FakeResponse(status_code)
+
+    return async_send_request
+
+
+def send(
+    breaker: HTTPCircuitBreaker,
+    outcome: Union[int, Exception],
+    url: str = "https://www.example.com/foo",
+) -> None:
+    with suppress(HTTPConnectionError):
+        breaker.send(respond(outcome), create_request(url=url))
+
+
+def test_opens_on_failure_rate(clock: Clock) -> None:
+    transitions: List[Transition] = []
+
+    def on_state_change(
+        host: str, old_state: HTTPCircuitState, new_state: HTTPCircuitState
+    ) -> None:
+        transitions.append((host, old_state, new_state))
+
+    breaker = HTTPCircuitBreaker(
+        window_size=4, min_calls=4, on_state_change=on_state_change
+    )
+    assert breaker.failure_rate == 0.5
+    assert breaker.open_duration == 30
+    assert breaker.half_open_calls == 1
+
+    # not enough calls yet
+    send(breaker, 503)
+    assert breaker.state("www.example.com") is CLOSED
+
+    # the oldest outcomes leave the window
+    send(breaker, 200)
+    send(breaker, 200)
+    send(breaker, 200)
+    assert breaker.state("www.example.com") is CLOSED
+    send(breaker, 404)  # not a failure
+    assert breaker.state("www.example.com") is CLOSED
+    send(breaker, HTTPConnectionError(msg="Boom", request=create_request()))
+    assert breaker.state("www.example.com") is CLOSED
+    send(breaker, 502)
+    assert breaker.state("www.example.com") is OPEN
+    assert transitions == [("www.example.com", CLOSED, OPEN)]
+
+    # fail fast
+    requests: List[HTTPRequest] = []
+
+    def send_request(request: HTTPRequest) -> HTTPResponse:
+        requests.append(request)
+        return FakeResponse(200)
+
+    clock.now += 29
+    with pytest.raises(
+        HTTPCircuitOpenError, match="^Circuit breaker open for host www.example.com$"
+    ) as exc_info:
+        breaker.send(send_request, create_request())
+    assert exc_info.value.host == "www.example.com"
+    assert exc_info.value.request.url == "https://www.example.com/foo"
+    assert not requests
+
+    # probe after the open duration
+    clock.now += 1
+    breaker.send(send_request, create_request())
+    assert len(requests) == 1
+    assert breaker.state("www.example.com") is CLOSED
+    assert transitions == [
+        ("www.example.com", CLOSED, OPEN),
+        ("www.example.com", OPEN, HALF_OPEN),
+        ("www.example.com", HALF_OPEN, CLOSED),
+    ]
+
+    # the window starts over after closing
+    for _ in range(3):
+        send(breaker, 500)
+    assert breaker.state("www.example.com") is CLOSED
+
+
+def test_probe_failure_reopens(clock: Clock) -> None:
+    breaker = HTTPCircuitBreaker(window_size=1, min_calls=1, open_duration=10)
+    send(breaker, 500)
+    assert breaker.state("www.example.com") is OPEN
+
+    clock.now += 10
+    send(breaker, 503)
+    assert breaker.state("www.example.com") is OPEN
+
+    # open for the full duration again
+    clock.now += 9
+    with pytest.raises(HTTPCircuitOpenError):
+        send(breaker, 200)
+    clock.now += 1
+    send(breaker, 200)
+    assert breaker.state("www.example.com") is CLOSED
+
+
+def test_half_open_calls(clock: Clock) -> None:
+    breaker = HTTPCircuitBreaker(window_size=1, min_calls=1, half_open_calls=2)
+    send(breaker, 500)
+    clock.now += 30
+
+    states: List[HTTPCircuitState] = []
+
+    def send_request(request: HTTPRequest) -> HTTPResponse:
+        # nested calls simulate concurrent requests
+        states.append(breaker.state("www.example.com"))
+        if len(states) == 1:
+            breaker.send(send_request, request)
+        else:
+            with pytest.raises(HTTPCircuitOpenError):
+                breaker.send(send_request, request)
+        return FakeResponse(200)
+
+    breaker.send(send_request, create_request())
+    assert states == [HALF_OPEN, HALF_OPEN]
+    assert breaker.state("www.example.com") is CLOSED
+
+
+def test_probe_outcome_after_reopening(clock: Clock) -> None:
+    breaker = HTTPCircuitBreaker(window_size=1, min_calls=1, half_open_calls=2)
+    send(breaker, 500)
+    clock.now += 30
+
+    def send_request(_: HTTPRequest) -> HTTPResponse:
+        send(breaker, 500)  # concurrent probe failing
+        assert breaker.state("www.example.com") is OPEN
+        return FakeResponse(200)
+
+    breaker.send(send_request, create_request())
+    assert breaker.state("www.example.com") is OPEN
+
+
+def test_after_fork(clock: Clock) -> None:
+    # pylint: disable=protected-access
+    breaker = HTTPCircuitBreaker(window_size=1, min_calls=1)
+    send(breaker, 500)
+    clock.now += 30
+
+    def send_request(_: HTTPRequest) -> HTTPResponse:
+        breaker._lock.acquire()  # pylint: disable=consider-using-with
+        # the probe in flight does not exist in the child process: another one is sent
+        breaker._after_fork()
+        send(breaker, 200)
+        assert breaker.state("www.example.com") is CLOSED
+        return FakeResponse(200)
+
+    breaker.send(send_request, create_request())
+    assert breaker.state("www.example.com") is CLOSED
+
+
+def test_outcome_after_opening() -> None:
+    breaker = HTTPCircuitBreaker(window_size=1, min_calls=1)
+
+    def send_request(_: HTTPRequest) -> HTTPResponse:
+        send(breaker, 500)  # concurrent request failing
+        return FakeResponse(200)
+
+    breaker.send(send_request, create_request())
+    # the success of a request sent before the circuit opened does not close it
+    assert breaker.state("www.example.com") is OPEN
+
+
+def test_per_host() -> None:
+    breaker = HTTPCircuitBreaker(window_size=1, min_calls=1)
+    send(breaker, 500, "https://www.example.com/foo")
+    send(breaker, 200, "https://api.example.com/foo")
+    send(breaker, 500, "https://www.example.com:8443/foo")
+    assert breaker.state("www.example.com") is OPEN
+    assert breaker.state("api.example.com") is CLOSED
+    assert breaker.state("www.example.com:8443") is OPEN
+    assert breaker.state("unknown.example.com") is CLOSED
+
+
+def test_failure_status_codes() -> None:
+    breaker = HTTPCircuitBreaker(
+        window_size=1, min_calls=1, failure_status_codes=["429", "5xx"]
+    )
+    send(breaker, 501)
+    assert breaker.state("www.example.com") is OPEN
+    breaker = HTTPCircuitBreaker(
+        window_size=1, min_calls=1, failure_status_codes=["429", "5xx"]
+    )
+    send(breaker, 429)
+    assert breaker.state("www.example.com") is OPEN
+
+
+def test_callback_can_use_breaker() -> None:
+    states: List[HTTPCircuitState] = []
+
+    def on_state_change(
+        host: str, old_state: HTTPCircuitState, new_state: HTTPCircuitState
+    ) -> None:
+        assert old_state is CLOSED
+        assert new_state is OPEN
+        states.append(breaker.state(host))  # would hang if called within the lock
+
+    breaker = HTTPCircuitBreaker(
+        window_size=1, min_calls=1, on_state_change=on_state_change
+    )
+    send(breaker, 500)
+    assert states == [OPEN]
+
+
+def test_asend(clock: Clock) -> None:
+    breaker = HTTPCircuitBreaker(window_size=2, min_calls=2)
+
+    async def async_send_request(request: HTTPRequest) -> Any:
+        if "fail" in request.url:
+            raise HTTPConnectionError(msg="Boom", request=request)
+        return FakeResponse(200)
+
+    async def main() -> None:
+        response = await breaker.asend(async_send_request, create_request())
+        assert response.status_code == 200
+        with pytest.raises(HTTPConnectionError):
+            await breaker.asend(
+                async_send_request, create_request(url="https://www.example.com/fail")
+            )
+        assert breaker.state("www.example.com") is OPEN
+        with pytest.raises(HTTPCircuitOpenError):
+            await breaker.asend(async_send_request, create_request())
+        clock.now += 30
+        await breaker.asend(async_send_request, create_request())
+        assert breaker.state("www.example.com") is CLOSED
+
+    asyncio.run(main())
+
+
+def test_asend_cancelled(clock: Clock) -> None:
+    breaker = HTTPCircuitBreaker(window_size=1, min_calls=1)
+
+    async def async_send_request(_: HTTPRequest) -> Any:
+        await asyncio.sleep(60)
+
+    async def cancel() -> None:
+        task = asyncio.ensure_future(
+            breaker.asend(async_send_request, create_request())
+        )
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    async def main() -> None:
+        # a cancelled request is not a failure
+        await cancel()
+        assert breaker.state("www.example.com") is CLOSED
+
+        # a cancelled probe is given back
+        send(breaker, 500)
+        clock.now += 30
+        await cancel()
+        assert breaker.state("www.example.com") is HALF_OPEN
+        await breaker.asend(respond_async(200), create_request())
+        assert breaker.state("www.example.com") is CLOSED
+
+    asyncio.run(main())
+
+
+def test_invalid() -> None:
+    with pytest.raises(ValueError, match="^Invalid failure rate: 0$"):
+        HTTPCircuitBreaker(failure_rate=0)
+    with pytest.raises(ValueError, match="^Invalid failure rate: 1.5$"):
+        HTTPCircuitBreaker(failure_rate=1.5)
+    with pytest.raises(ValueError, match="^Invalid window size: 0$"):
+        HTTPCircuitBreaker(window_size=0)
+    with pytest.raises(ValueError, match="^Invalid min calls: 0$"):
+        HTTPCircuitBreaker(min_calls=0)
+    with pytest.raises(ValueError, match="^Invalid min calls: 21$"):
+        HTTPCircuitBreaker(min_calls=21)
+    with pytest.raises(ValueError, match="^Invalid half-open calls: 0$"):
+        HTTPCircuitBreaker(half_open_calls=0)
+
+
+@pytest.mark.usefixtures("clock")
+def test_client() -> None:
+    engine = FakeEngine(503)
+    breaker = HTTPCircuitBreaker(window_size=2, min_calls=2)
+    http = create_client(engine, circuit_breaker=breaker).http
+
+    # the circuit opens on the second attempt, the third one fails fast
+    with pytest.raises(HTTPCircuitOpenError):
+        http.get("foo")
+    assert len(engine.requests) == 2
+
+    # not retried
+    with pytest.raises(HTTPCircuitOpenError):
+        http.get("foo")
+    assert len(engine.requests) == 2
+
+    # shared with other clients
+    with pytest.raises(HTTPCircuitOpenError):
+        create_client(engine, circuit_breaker=breaker).http.get("foo")
+    assert len(engine.requests) == 2
+
+
+def test_client_async(clock: Clock) -> None:
+    engine = FakeEngine(503)
+    breaker = HTTPCircuitBreaker(window_size=2, min_calls=2)
+    http = create_client(engine, circuit_breaker=breaker).http
+
+    async def main() -> None:
+        with pytest.raises(HTTPCircuitOpenError):
+            await http.aget("foo")
+        assert len(engine.requests) == 2
+
+        clock.now += 30
+        engine.status_code = 200
+        response = await http.aget("foo")
+        assert response.status_code == 200
+        assert len(engine.requests) == 3
+
+    asyncio.run(main())
+    assert breaker.state("www.example.com") is CLOSED
+
+
+def test_client_status_code_error(clock: Clock) -> None:
+    engine = FakeEngine(503)
+    breaker = HTTPCircuitBreaker(window_size=4, min_calls=4)
+    http = create_client(engine, circuit_breaker=breaker).http
+
+    # below the threshold, the status code error is raised after the retries
+    with pytest.raises(HTTPStatusCodeError):
+        http.get("foo")
+    assert len(engine.requests) == 3
+    assert breaker.state("www.example.com") is CLOSED
+    assert clock.now == 1000
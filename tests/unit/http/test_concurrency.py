@@ -0,0 +1,459 @@
+import asyncio
+from threading import Event, Thread
+from time import monotonic
+from typing import Any, Callable, List, Optional
+from unittest.mock import Mock
+
+import pytest
+
+from sdkite import Client
+from sdkite.http import (
+    HTTPAdapterSpec,
+    HTTPBulkhead,
+    HTTPBulkheadFullError,
+    HTTPConcurrencyLimiter,
+    HTTPConcurrencyLimitError,
+    HTTPConcurrencyStats,
+    HTTPConnectionError,
+    HTTPRequest,
+    HTTPResponse,
+    HTTPStatusCodeError,
+    HTTPTimeoutError,
+)
+from sdkite.http import concurrency as concurrency_module
+from tests.unit.http.helpers import (
+    TIMEOUT,
+    Clock,
+    FakeEngine,
+    FakeResponse,
+    create_client,
+    create_request,
+)
+
+
+def respond(
+    status_code: int = 200,
+    clock: Optional[Clock] = None,
+    latency: float = 0.1,
+) -> Callable[[HTTPRequest], HTTPResponse]:
+    def send_request(_: HTTPRequest) -> HTTPResponse:
+        if clock is not None:
+            clock.now += latency
+        return FakeResponse(status_code)
+
+    return send_request
+
+
+def concurrent(
+    limiter: HTTPConcurrencyLimiter,
+    nb_requests: int,
+    clock: Optional[Clock] = None,
+    latency: float = 0.1,
+) -> Callable[[HTTPRequest], HTTPResponse]:
+    # send 'nb_requests' requests in flight at the same time, with the same latency
+    def send_request(request: HTTPRequest) -> HTTPResponse:
+        return limiter.send(
+            concurrent(limiter, nb_requests - 1, clock, latency), request
+        )
+
+    if nb_requests == 1:
+        return respond(clock=clock, latency=latency)
+    return send_request
+
+
+def test_additive_increase() -> None:
+    limiter = HTTPConcurrencyLimiter(2)
+    assert limiter.stats() == HTTPConcurrencyStats(limit=2, in_flight=0, queued=0)
+
+    # increased by 1/limit for each request when the limit is used
+    limiter.send(concurrent(limiter, 2), create_request())  # 2.5
+    limiter.send(concurrent(limiter, 2), create_request())  # 2.9
+    assert limiter.stats().limit == 2
+    limiter.send(concurrent(limiter, 2), create_request())  # 3.245
+    assert limiter.stats() == HTTPConcurrencyStats(limit=3, in_flight=0, queued=0)
+
+    # not increased when less than half of the limit is used
+    for _ in range(10):
+        limiter.send(respond(), create_request())
+    assert limiter.stats().limit == 3
+
+
+def test_max_limit() -> None:
+    limiter = HTTPConcurrencyLimiter(1, max_limit=2)
+    for _ in range(5):
+        limiter.send(respond(), create_request())
+    assert limiter.stats().limit == 2
+
+
+def test_latency_increase(clock: Clock) -> None:
+    limiter = HTTPConcurrencyLimiter(2, latency_tolerance=2)
+    limiter.send(concurrent(limiter, 2, clock, 1), create_request())  # 2.5
+    # latency is not stable: the limit is not increased
+    limiter.send(concurrent(limiter, 2, clock, 2.5), create_request())
+    # the average latency is now 1.15
+    limiter.send(concurrent(limiter, 2, clock, 2.3), create_request())  # 2.9
+    assert limiter.stats().limit == 2
+    limiter.send(concurrent(limiter, 2, clock, 2.3), create_request())  # 3.245
+    assert limiter.stats().limit == 3
+
+
+@pytest.mark.parametrize("status_code", [429, 503])
+def test_multiplicative_decrease(status_code: int) -> None:
+    limiter = HTTPConcurrencyLimiter(20, min_limit=3)
+    limiter.send(respond(status_code), create_request())
+    assert limiter.stats().limit == 10
+    limiter.send(respond(status_code), create_request())
+    assert limiter.stats().limit == 5
+    limiter.send(respond(status_code), create_request())
+    assert limiter.stats().limit == 3
+
+    limiter = HTTPConcurrencyLimiter(20, backoff_ratio=0.8, overload_status_codes=500)
+    limiter.send(respond(status_code), create_request())
+    limiter.send(respond(500), create_request())
+    assert limiter.stats().limit == 16
+
+
+def test_exceptions() -> None:
+    limiter = HTTPConcurrencyLimiter(20)
+
+    def send_request(request: HTTPRequest) -> HTTPResponse:
+        raise error_class(msg="Boom", request=request)
+
+    error_class: Any = HTTPConnectionError
+    with pytest.raises(HTTPConnectionError):
+        limiter.send(send_request, create_request())
+    assert limiter.stats() == HTTPConcurrencyStats(limit=20, in_flight=0, queued=0)
+
+    error_class = HTTPTimeoutError
+    with pytest.raises(HTTPTimeoutError):
+        limiter.send(send_request, create_request())
+    assert limiter.stats() == HTTPConcurrencyStats(limit=10, in_flight=0, queued=0)
+
+
+class Blocked:
+    # a request waiting for 'release' in a thread
+    def __init__(self, limiter: HTTPConcurrencyLimiter) -> None:
+        self.started = Event()
+        self.release = Event()
+        self.thread = Thread(target=limiter.send, args=(self, create_request()))
+        self.thread.start()
+
+    def __call__(self, _: HTTPRequest) -> HTTPResponse:
+        self.started.set()
+        self.release.wait(TIMEOUT)
+        return FakeResponse()
+
+    def finish(self) -> None:
+        self.release.set()
+        self.thread.join(TIMEOUT)
+
+
+def test_queue() -> None:
+    limiter = HTTPConcurrencyLimiter(1, max_limit=1)
+    first = Blocked(limiter)
+    assert first.started.wait(TIMEOUT)
+    second = Blocked(limiter)
+    third = Blocked(limiter)
+    while limiter.stats().queued != 2:
+        pass
+    assert limiter.stats() == HTTPConcurrencyStats(limit=1, in_flight=1, queued=2)
+
+    # the requests are sent in order
+    first.finish()
+    assert second.started.wait(TIMEOUT)
+    assert not third.started.is_set()
+    second.finish()
+    assert third.started.wait(TIMEOUT)
+    third.finish()
+    assert limiter.stats() == HTTPConcurrencyStats(limit=1, in_flight=0, queued=0)
+
+
+def test_max_wait() -> None:
+    limiter = HTTPConcurrencyLimiter(1, max_limit=1, max_wait=0.01)
+    blocked = Blocked(limiter)
+    assert blocked.started.wait(TIMEOUT)
+
+    with pytest.raises(
+        HTTPConcurrencyLimitError,
+        match=r"^Waited more than 0\.01s for the concurrency limit of 1$",
+    ):
+        limiter.send(respond(), create_request())
+    assert limiter.stats() == HTTPConcurrencyStats(limit=1, in_flight=1, queued=0)
+    blocked.finish()
+
+
+def test_deadline(clock: Clock) -> None:
+    limiter = HTTPConcurrencyLimiter(1, max_limit=1, max_wait=TIMEOUT)
+    blocked = Blocked(limiter)
+    assert blocked.started.wait(TIMEOUT)
+
+    # the wait is capped by the deadline
+    with pytest.raises(
+        HTTPConcurrencyLimitError,
+        match=r"^Waited more than 0\.0s for the concurrency limit of 1$",
+    ):
+        limiter.send(respond(), create_request(), deadline=clock.now - 1)
+    assert limiter.stats() == HTTPConcurrencyStats(limit=1, in_flight=1, queued=0)
+
+    async def main() -> None:
+        with pytest.raises(HTTPConcurrencyLimitError):
+            await limiter.asend(
+                FakeEngine().send_async, create_request(), deadline=clock.now
+            )
+
+    asyncio.run(main())
+    blocked.finish()
+
+
+def test_max_wait_slot_given(monkeypatch: pytest.MonkeyPatch) -> None:
+    limiter = HTTPConcurrencyLimiter(1, max_limit=1, max_wait=0)
+    blocked = Blocked(limiter)
+    assert blocked.started.wait(TIMEOUT)
+
+    class LateEvent(Event):
+        def wait(self, timeout: Optional[float] = None) -> bool:
+            result = super().wait(timeout)
+            # the slot is given just after the timeout
+            blocked.finish()
+            return result
+
+    monkeypatch.setattr(concurrency_module, "Event", LateEvent)
+    assert limiter.send(respond(), create_request()).status_code == 200
+    assert limiter.stats() == HTTPConcurrencyStats(limit=1, in_flight=0, queued=0)
+
+
+def test_asend() -> None:
+    limiter = HTTPConcurrencyLimiter(1, max_limit=1, max_wait=TIMEOUT)
+
+    async def main() -> None:
+        release = asyncio.Event()
+        order: List[str] = []
+
+        async def async_send_request(request: HTTPRequest) -> Any:
+            order.append(request.url)
+            await release.wait()
+            return FakeResponse(503)
+
+        def start(path: str) -> "asyncio.Task[Any]":
+            request = create_request()
+            request.url += path
+            return asyncio.ensure_future(limiter.asend(async_send_request, request))
+
+        tasks = [start("/1"), start("/2"), start("/3")]
+        await asyncio.sleep(0)
+        assert limiter.stats() == HTTPConcurrencyStats(limit=1, in_flight=1, queued=2)
+
+        release.set()
+        responses = await asyncio.gather(*tasks)
+        assert [response.status_code for response in responses] == [503] * 3
+        assert order == [f"https://www.example.com/foo/{index}" for index in (1, 2, 3)]
+
+    asyncio.run(main())
+    assert limiter.stats() == HTTPConcurrencyStats(limit=1, in_flight=0, queued=0)
+
+
+def test_asend_timeout() -> None:
+    limiter = HTTPConcurrencyLimiter(1, max_limit=1, max_wait=0.01)
+
+    async def main() -> None:
+        release = asyncio.Event()
+
+        async def async_send_request(_: HTTPRequest) -> Any:
+            await release.wait()
+            raise HTTPTimeoutError(msg="Boom", request=create_request())
+
+        task = asyncio.ensure_future(
+            limiter.asend(async_send_request, create_request())
+        )
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPConcurrencyLimitError):
+            await limiter.asend(async_send_request, create_request())
+        release.set()
+        with pytest.raises(HTTPTimeoutError, match="^Boom$"):
+            await task
+
+    asyncio.run(main())
+    assert limiter.stats() == HTTPConcurrencyStats(limit=1, in_flight=0, queued=0)
+
+
+def test_asend_cancelled() -> None:
+    limiter = HTTPConcurrencyLimiter(1, max_limit=1)
+
+    async def main() -> None:
+        release = asyncio.Event()
+
+        async def async_send_request(_: HTTPRequest) -> Any:
+            await release.wait()
+            return FakeResponse()
+
+        def start() -> "asyncio.Task[Any]":
+            return asyncio.ensure_future(
+                limiter.asend(async_send_request, create_request())
+            )
+
+        first, second, third = start(), start(), start()
+        await asyncio.sleep(0)
+
+        # cancelled while waiting
+        third.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await third
+        assert limiter.stats() == HTTPConcurrencyStats(limit=1, in_flight=1, queued=1)
+
+        # cancelled after being given the slot
+        release.set()
+        await first
+        assert limiter.stats() == HTTPConcurrencyStats(limit=1, in_flight=1, queued=0)
+        second.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await second
+
+    asyncio.run(main())
+    assert limiter.stats() == HTTPConcurrencyStats(limit=1, in_flight=0, queued=0)
+
+
+def test_after_fork() -> None:
+    # pylint: disable=protected-access
+    limiter = HTTPConcurrencyLimiter(1, max_limit=1)
+    # requests sent and queued by other threads of the parent process
+    assert limiter._try_acquire(Event().set) is None
+    assert limiter._try_acquire(Event().set) is not None
+    limiter._lock.acquire()  # pylint: disable=consider-using-with
+
+    # they do not take the slots of the child process
+    limiter._after_fork()
+    assert limiter.stats() == HTTPConcurrencyStats(limit=1, in_flight=0, queued=0)
+    assert limiter.send(respond(), create_request()).status_code == 200
+
+
+def test_invalid() -> None:
+    with pytest.raises(ValueError, match="^Invalid limits: 0 <= 10 <= 200$"):
+        HTTPConcurrencyLimiter(min_limit=0)
+    with pytest.raises(ValueError, match="^Invalid limits: 1 <= 10 <= 5$"):
+        HTTPConcurrencyLimiter(max_limit=5)
+    with pytest.raises(ValueError, match="^Invalid backoff ratio: 1$"):
+        HTTPConcurrencyLimiter(backoff_ratio=1)
+
+
+def test_bulkhead() -> None:
+    bulkhead = HTTPBulkhead(1)
+    assert bulkhead.max_concurrent == 1
+    assert bulkhead.max_wait == 0
+
+    blocked = Blocked(bulkhead)
+    assert blocked.started.wait(TIMEOUT)
+    with pytest.raises(
+        HTTPBulkheadFullError,
+        match=r"^Bulkhead full: 1 requests in flight for more than 0\.0s$",
+    ):
+        bulkhead.send(respond(), create_request())
+    blocked.finish()
+
+    # the limit does not change
+    for status_code in (200, 200, 503):
+        bulkhead.send(respond(status_code), create_request())
+    assert bulkhead.stats() == HTTPConcurrencyStats(limit=1, in_flight=0, queued=0)
+
+
+def test_bulkhead_asend() -> None:
+    bulkhead = HTTPBulkhead(2, max_wait=0.01)
+
+    async def main() -> None:
+        release = asyncio.Event()
+
+        async def async_send_request(_: HTTPRequest) -> Any:
+            await release.wait()
+            return FakeResponse()
+
+        tasks = [
+            asyncio.ensure_future(bulkhead.asend(async_send_request, create_request()))
+            for _ in range(2)
+        ]
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPBulkheadFullError):
+            await bulkhead.asend(async_send_request, create_request())
+        release.set()
+        await asyncio.gather(*tasks)
+
+    asyncio.run(main())
+    assert bulkhead.stats() == HTTPConcurrencyStats(limit=2, in_flight=0, queued=0)
+
+
+def test_client() -> None:
+    engine = FakeEngine(503)
+    limiter = HTTPConcurrencyLimiter(8)
+    http = create_client(engine, concurrency_limiter=limiter).http
+
+    # each attempt goes through the limiter
+    with pytest.raises(HTTPStatusCodeError):
+        http.get()
+    assert len(engine.requests) == 3
+    assert limiter.stats() == HTTPConcurrencyStats(limit=1, in_flight=0, queued=0)
+
+
+def test_client_async() -> None:
+    engine = FakeEngine(503)
+    limiter = HTTPConcurrencyLimiter(8)
+    http = create_client(engine, concurrency_limiter=limiter).http
+
+    with pytest.raises(HTTPStatusCodeError):
+        asyncio.run(http.aget())
+    assert len(engine.requests) == 3
+    assert limiter.stats() == HTTPConcurrencyStats(limit=1, in_flight=0, queued=0)
+
+
+def test_bulkhead_sub_clients() -> None:
+    engine = FakeEngine(503)
+    reports_bulkhead = HTTPBulkhead(1)
+
+    class Reports(Client):
+        _http = HTTPAdapterSpec("reports", bulkhead=reports_bulkhead)
+        _http.set_engine(lambda: engine)
+        _http.set_async_engine(lambda: engine.send_async)
+
+    class Users(Client):
+        _http = HTTPAdapterSpec("users", retry_nb_attempts=1)
+        _http.set_engine(lambda: engine)
+
+    class ApiClient(Client):
+        _http = HTTPAdapterSpec("https://www.example.com/", bulkhead=HTTPBulkhead(8))
+        reports: Reports
+        users: Users
+
+    client = ApiClient()
+    # pylint: disable=protected-access
+
+    # the slow reports do not prevent other requests from being sent
+    blocked = Blocked(reports_bulkhead)
+    assert blocked.started.wait(TIMEOUT)
+    with pytest.raises(HTTPBulkheadFullError):
+        client.reports._http.get("export")
+    with pytest.raises(HTTPBulkheadFullError):
+        asyncio.run(client.reports._http.aget("export"))
+    with pytest.raises(HTTPStatusCodeError):
+        client.users._http.get("42")
+    blocked.finish()
+
+    # rejected requests are not retried
+    assert [request.url for request in engine.requests] == [
+        "https://www.example.com/users/42"
+    ]
+
+
+def test_client_timeout_total(monkeypatch: pytest.MonkeyPatch) -> None:
+    engine = FakeEngine()
+    limiter = HTTPConcurrencyLimiter(1, max_limit=1, max_wait=TIMEOUT)
+    blocked = Blocked(limiter)
+    assert blocked.started.wait(TIMEOUT)
+    send = Mock(wraps=limiter.send)
+    monkeypatch.setattr(limiter, "send", send)
+    http = create_client(engine, concurrency_limiter=limiter).http
+
+    # the request waits for the limiter until the total timeout, and is not retried
+    start = monotonic()
+    with pytest.raises(HTTPConcurrencyLimitError):
+        http.get(timeout_total=0.05)
+    assert monotonic() - start < 1
+    assert send.call_count == 1
+    assert not engine.requests
+    blocked.finish()
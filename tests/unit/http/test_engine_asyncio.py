@@ -0,0 +1,630 @@
+import asyncio
+from contextlib import suppress
+from dataclasses import replace
+import gc
+import gzip
+import re
+import ssl
+import sys
+from types import TracebackType
+from typing import Any, Dict, List, Optional, Tuple, Type, Union
+import zlib
+
+import pytest
+
+from sdkite.http import (
+    HTTPConnectionError,
+    HTTPContextError,
+    HTTPError,
+    HTTPHeaderDict,
+    HTTPRequest,
+    HTTPTimeoutError,
+    engine_asyncio,
+)
+from sdkite.http.engine_asyncio import HTTPEngineAsyncio
+
+if sys.version_info < (3, 9):  # pragma: no cover
+    from typing import Awaitable, Callable
+else:  # pragma: no cover
+    from collections.abc import Awaitable, Callable
+
+
+# a response, or None to close the connection without answering
+StandInResponse = Optional[bytes]
+
+
+class StandInServer:
+    def __init__(self, *responses: StandInResponse) -> None:
+        self.responses = list(responses)
+        self.requests: List[Tuple[int, bytes, HTTPHeaderDict, bytes]] = []
+        self.nb_connections = 0
+        self._writers: List[asyncio.StreamWriter] = []
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def __aenter__(self) -> str:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://127.0.0.1:{port}"
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        assert self._server is not None
+        self._server.close()
+        for writer in self._writers:
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+        await self._server.wait_closed()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.nb_connections += 1
+        connection_id = self.nb_connections
+        self._writers.append(writer)
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                headers = HTTPHeaderDict()
+                while True:
+                    line = await reader.readline()
+                    if not line.strip():
+                        break
+                    name, _, value = line.decode().partition(":")
+                    headers.add(name.strip(), value.strip())
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests.append(
+                    (connection_id, request_line.rstrip(), headers, body)
+                )
+                response = self.responses.pop(0)
+                if response is None:
+                    break
+                writer.write(response)
+                await writer.drain()
+                if response.startswith(b"HTTP/1.0") or b"Connection: close" in response:
+                    break
+        except ConnectionError:  # pragma: no cover
+            pass
+        finally:
+            writer.close()
+
+
+def run(
+    coroutine_function: Callable[[HTTPEngineAsyncio], Awaitable[None]],
+    engine: Optional[HTTPEngineAsyncio] = None,
+) -> None:
+    used_engine = HTTPEngineAsyncio() if engine is None else engine
+
+    async def main() -> None:
+        try:
+            await coroutine_function(used_engine)
+        finally:
+            used_engine.close()
+
+    asyncio.run(main())
+
+
+def create_request(
+    url: str,
+    method: str = "GET",
+    body: Union[bytes, List[bytes]] = b"",
+    *,
+    headers: Optional[HTTPHeaderDict] = None,
+    stream_response: bool = False,
+    decode_content: bool = True,
+) -> HTTPRequest:
+    return HTTPRequest(
+        method=method,
+        url=url,
+        headers=HTTPHeaderDict() if headers is None else headers,
+        body=body if isinstance(body, bytes) else iter(body),
+        stream_response=stream_response,
+        decode_content=decode_content,
+    )
+
+
+def ok(body: bytes, *headers: str, status: str = "200 OK") -> bytes:
+    lines = [f"HTTP/1.1 {status}", f"Content-Length: {len(body)}", *headers]
+    return "\r\n".join([*lines, "", ""]).encode() + body
+
+
+def test_request() -> None:
+    server = StandInServer(
+        ok(b'{"hello": "world"}', "Content-Type: application/json", "X-Foo: 1"),
+        ok(b"abc", "Content-Type: text/plain; charset=latin-1", status="404 Not Found"),
+    )
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with server as url:
+            response = await engine(create_request(f"{url}/foo/bar?a=b&c=d"))
+            assert response.status_code == 200
+            assert response.reason == "OK"
+            assert response.headers["x-foo"] == "1"
+            assert isinstance(response.raw, asyncio.StreamReader)
+            assert await response.data_bytes() == b'{"hello": "world"}'
+            assert await response.data_str() == '{"hello": "world"}'
+            assert await response.data_json() == {"hello": "world"}
+            assert [chunk async for chunk in response.data_stream] == [
+                b'{"hello": "world"}'
+            ]
+
+            response = await engine(
+                create_request(
+                    url,
+                    "POST",
+                    [b"foo", b"bar"],
+                    headers=HTTPHeaderDict({"X-Bar": "2"}),
+                )
+            )
+            assert response.status_code == 404
+            assert response.reason == "Not Found"
+            assert await response.data_str() == "abc"
+
+    run(main)
+
+    host = server.requests[0][2]["host"]
+    assert [(cid, line) for cid, line, _, _ in server.requests] == [
+        (1, b"GET /foo/bar?a=b&c=d HTTP/1.1"),
+        (1, b"POST / HTTP/1.1"),  # same connection
+    ]
+    assert server.requests[0][2] == HTTPHeaderDict(
+        {"Host": host, "Accept-Encoding": "gzip, deflate"}
+    )
+    assert server.requests[1][2] == HTTPHeaderDict(
+        {
+            "X-Bar": "2",
+            "Host": host,
+            "Content-Length": "6",
+            "Accept-Encoding": "gzip, deflate",
+        }
+    )
+    assert server.requests[1][3] == b"foobar"
+
+
+def test_stream_response_chunked() -> None:
+    server = StandInServer(
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+        b"3\r\nabc\r\n5;ext=1\r\ndefgh\r\n0\r\nX-Trailer: 1\r\n\r\n",
+        ok(b"next"),
+    )
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with server as url:
+            response = await engine(create_request(url, stream_response=True))
+            assert [chunk async for chunk in response.data_stream] == [
+                b"abc",
+                b"defgh",
+            ]
+            response = await engine(
+                create_request(url, headers=HTTPHeaderDict({"Host": "example.com"}))
+            )
+            assert await response.data_bytes() == b"next"
+
+    run(main)
+    assert [cid for cid, _, _, _ in server.requests] == [1, 1]
+    assert server.requests[1][2]["host"] == "example.com"
+
+
+def test_content_encoding_small_chunks() -> None:
+    data = b"Hello, world! " * 1000
+    encoded = gzip.compress(zlib.compress(data))
+    server = StandInServer(
+        b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n"
+        b"Content-Encoding: deflate, gzip\r\n\r\n"
+        + b"".join(b"1\r\n%s\r\n" % encoded[i : i + 1] for i in range(len(encoded)))
+        + b"0\r\n\r\n"
+    )
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with server as url:
+            response = await engine(create_request(url))
+            assert await response.data_bytes() == data
+
+    run(main)
+
+
+@pytest.mark.parametrize(
+    ["content_encoding", "encode"],
+    [
+        pytest.param("gzip", gzip.compress, id="gzip"),
+        pytest.param("deflate", zlib.compress, id="deflate"),
+        pytest.param(
+            "deflate, gzip",
+            lambda data: gzip.compress(zlib.compress(data)),
+            id="deflate-gzip",
+        ),
+        pytest.param("identity", lambda data: data, id="identity"),
+        pytest.param("br", lambda data: b"brotli" + data, id="unknown"),
+    ],
+)
+@pytest.mark.parametrize("decode_content", [True, False])
+def test_content_encoding(
+    content_encoding: str, encode: Callable[[bytes], bytes], decode_content: bool
+) -> None:
+    data = b"Hello, world! " * 1000
+    encoded = encode(data)
+    server = StandInServer(ok(encoded, f"Content-Encoding: {content_encoding}"))
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with server as url:
+            response = await engine(create_request(url, decode_content=decode_content))
+            if decode_content and content_encoding != "br":
+                assert await response.data_bytes() == data
+            else:
+                assert await response.data_bytes() == encoded
+
+    run(main)
+    assert ("accept-encoding" in server.requests[0][2]) is decode_content
+
+
+@pytest.mark.parametrize(
+    ["method", "response", "body", "reused"],
+    [
+        pytest.param("GET", ok(b"abc"), b"abc", True, id="length"),
+        pytest.param("HEAD", ok(b"abc")[:-3], b"", True, id="head"),
+        pytest.param("GET", b"HTTP/1.1 204 No Content\r\n\r\n", b"", True, id="204"),
+        pytest.param(
+            "GET", b"HTTP/1.1 100 Continue\r\n\r\n" + ok(b"abc"), b"abc", True, id="100"
+        ),
+        pytest.param(
+            "GET",
+            b"HTTP/1.1 200 OK\r\nConnection: close\r\n\r\nabc",
+            b"abc",
+            False,
+            id="eof",
+        ),
+        pytest.param("GET", ok(b"abc", "Connection: close"), b"abc", False, id="close"),
+        pytest.param(
+            "GET", b"HTTP/1.0 200 OK\r\nContent-Length: 3\r\n\r\nabc", b"abc", False
+        ),
+    ],
+)
+def test_body_framing(method: str, response: bytes, body: bytes, reused: bool) -> None:
+    server = StandInServer(response, ok(b"next"))
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with server as url:
+            assert (
+                await (await engine(create_request(url, method))).data_bytes() == body
+            )
+            assert await (await engine(create_request(url))).data_bytes() == b"next"
+
+    run(main)
+    assert [cid for cid, _, _, _ in server.requests] == [1, 1 if reused else 2]
+
+
+def test_stale_connection() -> None:
+    # the server closes the connection after the first response
+    server = StandInServer(ok(b"first"), None, ok(b"second"))
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with server as url:
+            response = await engine(create_request(url))
+            assert await response.data_bytes() == b"first"
+            await asyncio.sleep(0.01)  # not detected as closed yet otherwise
+            response = await engine(create_request(url))
+            assert await response.data_bytes() == b"second"
+
+    run(main)
+    assert [cid for cid, _, _, _ in server.requests] == [1, 1, 2]
+
+
+def test_stale_connection_not_idempotent() -> None:
+    # the request may have been processed by the server: it is not sent again
+    server = StandInServer(ok(b"first"), None)
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with server as url:
+            response = await engine(create_request(url))
+            assert await response.data_bytes() == b"first"
+            await asyncio.sleep(0.01)
+            with pytest.raises(HTTPConnectionError):
+                await engine(create_request(url, "POST", b"data"))
+
+    run(main)
+    assert [cid for cid, _, _, _ in server.requests] == [1, 1]
+
+
+def test_closed_idle_connection() -> None:
+    server = StandInServer(ok(b"first"), ok(b"second"))
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with server as url:
+            response = await engine(create_request(url))
+            assert await response.data_bytes() == b"first"
+            for (
+                connections
+            ) in engine._idle_connections.values():  # pylint: disable=protected-access
+                connections[0].writer.close()
+            response = await engine(create_request(url))
+            assert await response.data_bytes() == b"second"
+
+    run(main)
+    assert [cid for cid, _, _, _ in server.requests] == [1, 2]
+
+
+def test_max_idle_connections() -> None:
+    server = StandInServer(ok(b"first"), ok(b"second"))
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with server as url:
+            for expected in (b"first", b"second"):
+                response = await engine(create_request(url))
+                assert await response.data_bytes() == expected
+
+    run(main, HTTPEngineAsyncio(max_idle_connections=0))
+    assert [cid for cid, _, _, _ in server.requests] == [1, 2]
+
+
+def test_connection_other_event_loop() -> None:
+    # pylint: disable=protected-access
+    server = StandInServer(ok(b"abc"))
+    engine = HTTPEngineAsyncio()
+
+    async def main0() -> None:
+        async with server as url:
+            assert await (await engine(create_request(url))).data_bytes() == b"abc"
+            # the connection is neither used nor closed by an event loop in another
+            # thread
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, asyncio.run, main1())
+            (connections,) = engine._idle_connections.values()
+            assert len(connections) == 1
+            assert connections[0].usable
+
+    async def main1() -> None:
+        ((_, key),) = engine._idle_connections
+        assert engine._get_idle_connection(key) is None
+
+    # the connections of the closed event loops are dropped
+    async def main2() -> None:
+        async with StandInServer(ok(b"def")) as url:
+            assert await (await engine(create_request(url))).data_bytes() == b"def"
+            ((loop, _),) = engine._idle_connections
+            assert loop is asyncio.get_running_loop()
+            engine.close()
+
+    asyncio.run(main0())
+    with pytest.warns(ResourceWarning):
+        asyncio.run(main2())
+        gc.collect()
+
+
+def test_after_fork() -> None:
+    server = StandInServer(ok(b"abc"))
+    engine = HTTPEngineAsyncio()
+
+    async def main() -> None:
+        async with server as url:
+            assert await (await engine(create_request(url))).data_bytes() == b"abc"
+
+    asyncio.run(main())
+    assert engine._idle_connections  # pylint: disable=protected-access
+    # the connections are not closed, as they are still used by the parent process
+    with pytest.warns(ResourceWarning):
+        engine._after_fork()  # pylint: disable=protected-access
+        gc.collect()
+    assert not engine._idle_connections  # pylint: disable=protected-access
+
+
+def test_response_context_manager() -> None:
+    server = StandInServer(ok(b"abc"), ok(b"next"), ok(b"last"))
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with server as url:
+            request = create_request(url, stream_response=True)
+            with pytest.raises(  # noqa: PT012
+                HTTPContextError, match=re.escape("ValueError: abc")
+            ):
+                async with await engine(request) as response:
+                    response._set_context(request)  # pylint: disable=protected-access
+                    raise ValueError(await response.data_str())
+
+            # not completely read: the connection is not reused
+            async with await engine(create_request(url, stream_response=True)):
+                pass
+            assert await (await engine(create_request(url))).data_bytes() == b"last"
+
+    run(main)
+    assert [cid for cid, _, _, _ in server.requests] == [1, 1, 2]
+
+
+def test_data_memory_limit() -> None:
+    server = StandInServer(ok(b"a" * 100), ok(b"b" * 100))
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with server as url:
+            request = create_request(url, stream_response=True)
+            response = await engine(request)
+            response._set_context(  # pylint: disable=protected-access
+                request, data_memory_limit=100
+            )
+            assert await response.data_bytes() == b"a" * 100
+
+            response = await engine(request)
+            response._set_context(  # pylint: disable=protected-access
+                request, data_memory_limit=99
+            )
+            with pytest.raises(
+                HTTPError,
+                match=re.escape("Response body larger than memory limit of 99 bytes"),
+            ):
+                await response.data_bytes()
+
+    run(main)
+
+
+def test_connection_error() -> None:
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with StandInServer() as url:
+            pass
+        # the server is now closed
+        with pytest.raises(HTTPConnectionError, match="Errno"):
+            await engine(create_request(url))
+
+    run(main)
+
+
+def test_timeout(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(engine_asyncio, "_READ_TIMEOUT", 0.01)
+    server = StandInServer(b"HTTP/1.1 200 OK\r\n")  # headers never finish
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with server as url:
+            with pytest.raises(HTTPTimeoutError, match="TimeoutError"):
+                await engine(create_request(url))
+
+    run(main)
+
+
+def test_timeout_from_request() -> None:
+    server = StandInServer(b"HTTP/1.1 200 OK\r\n")  # headers never finish
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with server as url:
+            request = replace(create_request(url), timeout_read=0.01)
+            with pytest.raises(HTTPTimeoutError, match="TimeoutError"):
+                await engine(request)
+
+    run(main)
+
+
+def test_timeout_connect(monkeypatch: pytest.MonkeyPatch) -> None:
+    async def open_connection(*_: object, **__: object) -> None:
+        await asyncio.sleep(1)
+
+    monkeypatch.setattr(engine_asyncio.asyncio, "open_connection", open_connection)
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        request = replace(
+            create_request("http://www.example.com/"), timeout_connect=0.01
+        )
+        with pytest.raises(HTTPTimeoutError, match="TimeoutError"):
+            await engine(request)
+
+    run(main)
+
+
+@pytest.mark.parametrize(
+    ["url", "response", "error_msg"],
+    [
+        pytest.param(
+            "ftp://example.com", None, "ValueError: Unsupported URL: 'ftp://", id="url"
+        ),
+        pytest.param(
+            None,
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\nxyz\r\n",
+            "ValueError: Invalid chunk size: b'xyz\\r\\n'",
+            id="chunk",
+        ),
+        pytest.param(
+            None,
+            b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 10\r\n\r\nabc",
+            "IncompleteReadError: 0 bytes read on a total of 7 expected bytes",
+            id="body",
+        ),
+        pytest.param(
+            None,
+            b"HTTP/1.1 200 OK\r\nConnection: close\r\n",
+            "IncompleteReadError: 0 bytes read on a total of undefined expected bytes",
+            id="headers",
+        ),
+    ],
+)
+def test_invalid(url: Optional[str], response: StandInResponse, error_msg: str) -> None:
+    server = StandInServer(response)
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        async with server as server_url:
+            with pytest.raises(HTTPError, match=re.escape(error_msg)):
+                await engine(create_request(url or server_url))
+
+    run(main)
+
+
+@pytest.mark.parametrize(
+    ["url", "headers", "error_msg"],
+    [
+        pytest.param(
+            "http://example.com/",
+            {"X-A": "v\r\nX-Injected: 1"},
+            "ValueError: Invalid header value: 'v\\r\\nX-Injected: 1'",
+            id="value-crlf",
+        ),
+        pytest.param(
+            "http://example.com/",
+            {"X-A": "v\0"},
+            "ValueError: Invalid header value: 'v\\x00'",
+            id="value-nul",
+        ),
+        pytest.param(
+            "http://example.com/",
+            {"X-A\r\nX-Injected": "1"},
+            "ValueError: Invalid header name: 'X-A\\r\\nX-Injected'",
+            id="name-crlf",
+        ),
+        pytest.param(
+            "http://example.com/",
+            {"X-A: b": "1"},
+            "ValueError: Invalid header name: 'X-A: b'",
+            id="name-colon",
+        ),
+        pytest.param(
+            "http://example.com/foo bar",
+            {},
+            "ValueError: URL can't contain control characters: '/foo bar'",
+            id="target-space",
+        ),
+        pytest.param(
+            "http://example.com/foo\0",
+            {},
+            "ValueError: URL can't contain control characters: '/foo\\x00'",
+            id="target-nul",
+        ),
+    ],
+)
+def test_invalid_request(url: str, headers: Dict[str, str], error_msg: str) -> None:
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        request = create_request(url, headers=HTTPHeaderDict(headers))
+        with pytest.raises(HTTPError, match=f"^{re.escape(error_msg)}$"):
+            await engine(request)
+
+    run(main)
+
+
+def test_https(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[Tuple[Any, ...]] = []
+
+    async def open_connection(host: str, port: int, **kwargs: Any) -> None:
+        calls.append((host, port, kwargs["ssl"]))
+        raise ConnectionRefusedError
+
+    monkeypatch.setattr(engine_asyncio.asyncio, "open_connection", open_connection)
+
+    async def main(engine: HTTPEngineAsyncio) -> None:
+        for url in ("https://example.com", "https://example.com:8443/foo"):
+            with pytest.raises(HTTPConnectionError):
+                await engine(create_request(url))
+        with pytest.raises(HTTPConnectionError):
+            await engine(create_request("http://example.com"))
+
+    run(main)
+    assert [(host, port) for host, port, _ in calls] == [
+        ("example.com", 443),
+        ("example.com", 8443),
+        ("example.com", 80),
+    ]
+    assert isinstance(calls[0][2], ssl.SSLContext)
+    assert calls[0][2] is calls[1][2]
+    assert calls[2][2] is None
+
+    # shared context
+    ssl_context = ssl.create_default_context()
+    run(main, HTTPEngineAsyncio(ssl_context=ssl_context))
+    assert calls[3][2] is ssl_context
@@ -0,0 +1,513 @@
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+
+from sdkite.http import HTTPHeaderDict, HTTPRequest, engine_caching
+from sdkite.http.engine_caching import (
+    HTTPCacheDirectoryStorage,
+    HTTPCacheEntry,
+    HTTPCacheMemoryStorage,
+    HTTPCacheStats,
+    HTTPEngineCaching,
+    HTTPResponseCached,
+    cache_key,
+)
+from sdkite.http.engine_requests import HTTPEngineRequests
+from tests.unit.http.helpers import Clock, FakeEngine, FakeResponse, create_request
+
+
+class CacheableEngine(FakeEngine):
+    def __init__(self) -> None:
+        super().__init__()
+        self.headers = {"Cache-Control": "max-age=60"}
+        self.body = b"data"
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(clock: Clock, monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock.now = 1_000_000.0
+    monkeypatch.setattr(engine_caching, "time", clock.time)
+    return clock
+
+
+def stats(hits: int = 0, revalidations: int = 0, misses: int = 0) -> HTTPCacheStats:
+    return HTTPCacheStats(hits=hits, revalidations=revalidations, misses=misses)
+
+
+def test_max_age(clock: Clock) -> None:
+    fake_engine = CacheableEngine()
+    engine = HTTPEngineCaching(fake_engine)
+    assert engine.engine is fake_engine
+    assert isinstance(engine.storage, HTTPCacheMemoryStorage)
+    assert engine.key is cache_key
+
+    response = engine(create_request())
+    assert isinstance(response, HTTPResponseCached)
+    assert response.cache_status == "miss"
+    assert isinstance(response.raw, FakeResponse)
+    assert response.raw.closed.is_set()
+    assert engine.stats() == stats(misses=1)
+
+    fake_engine.body = b"new data"
+    clock.now += 59
+    response = engine(create_request())
+    assert isinstance(response, HTTPResponseCached)
+    assert response.cache_status == "hit"
+    assert isinstance(response.raw, HTTPCacheEntry)
+    assert response.status_code == 200
+    assert response.reason == "Some reason"
+    assert dict(response.headers) == {"Cache-Control": "max-age=60"}
+    assert response.data_bytes == b"data"
+    assert len(fake_engine.requests) == 1
+    assert engine.stats() == stats(hits=1, misses=1)
+
+    clock.now += 1
+    assert engine(create_request()).data_bytes == b"new data"
+    assert len(fake_engine.requests) == 2
+    assert engine.stats() == stats(hits=1, misses=2)
+
+
+@pytest.mark.parametrize(
+    ["headers", "shared", "fresh"],
+    [
+        pytest.param({"Cache-Control": "max-age=0"}, False, False, id="max-age-0"),
+        pytest.param({"Cache-Control": "max-age=foo"}, False, False, id="max-age-bad"),
+        pytest.param({"Cache-Control": 'max-age="60"'}, False, True, id="quoted"),
+        pytest.param({"Cache-Control": "MAX-AGE=60"}, False, True, id="case"),
+        pytest.param(
+            {"Age": "60", "Cache-Control": "max-age=60"}, False, False, id="age"
+        ),
+        pytest.param({"Cache-Control": "s-maxage=60"}, False, False, id="s-maxage"),
+        pytest.param(
+            {"Cache-Control": "s-maxage=60"}, True, True, id="s-maxage-shared"
+        ),
+        pytest.param(
+            {"Cache-Control": "max-age=60, s-maxage=0"}, True, False, id="both-shared"
+        ),
+        pytest.param(
+            {
+                "Date": "Mon, 02 Jan 2023 10:00:00 GMT",
+                "Expires": "Mon, 02 Jan 2023 10:01:00 GMT",
+            },
+            False,
+            True,
+            id="expires",
+        ),
+        pytest.param(
+            {
+                "Date": "Mon, 02 Jan 2023 10:00:00 GMT",
+                "Expires": "Mon, 02 Jan 2023 10:00:00 GMT",
+            },
+            False,
+            False,
+            id="expires-past",
+        ),
+        pytest.param({"Expires": "0"}, False, False, id="expires-bad"),
+        pytest.param(
+            {"Cache-Control": "max-age=60, no-cache", "ETag": '"a"'},
+            False,
+            False,
+            id="no-cache",
+        ),
+    ],
+)
+def test_freshness(headers: Dict[str, str], shared: bool, fresh: bool) -> None:
+    fake_engine = CacheableEngine()
+    fake_engine.headers = {**headers, "ETag": '"a"'}
+    engine = HTTPEngineCaching(fake_engine, shared=shared)
+
+    engine(create_request())
+    engine(create_request())
+    assert len(fake_engine.requests) == (1 if fresh else 2)
+
+
+def test_expires_without_date(clock: Clock) -> None:
+    fake_engine = CacheableEngine()
+    fake_engine.headers = {"Expires": "Mon, 02 Jan 2023 10:00:00 GMT"}
+    clock.now = 1672653540  # a minute before
+    engine = HTTPEngineCaching(fake_engine)
+
+    engine(create_request())
+    engine(create_request())
+    assert len(fake_engine.requests) == 1
+
+
+@pytest.mark.parametrize(
+    ["status_code", "headers", "request_headers", "shared"],
+    [
+        pytest.param(500, {"Cache-Control": "max-age=60"}, {}, False, id="status"),
+        pytest.param(200, {"Cache-Control": "no-store"}, {}, False, id="no-store"),
+        pytest.param(200, {}, {}, False, id="no-freshness-no-validator"),
+        pytest.param(
+            200, {"Cache-Control": "max-age=60", "Vary": "*"}, {}, False, id="vary-*"
+        ),
+        pytest.param(
+            200, {"Cache-Control": "private, max-age=60"}, {}, True, id="private"
+        ),
+        pytest.param(
+            200,
+            {"Cache-Control": "max-age=60"},
+            {"Authorization": "Basic Zm9v"},
+            True,
+            id="authorization",
+        ),
+    ],
+)
+def test_not_stored(
+    status_code: int,
+    headers: Dict[str, str],
+    request_headers: Dict[str, str],
+    shared: bool,
+) -> None:
+    fake_engine = CacheableEngine()
+    fake_engine.status_code = status_code
+    fake_engine.headers = headers
+    engine = HTTPEngineCaching(fake_engine, shared=shared)
+
+    for _ in range(2):
+        response = engine(create_request(headers=request_headers))
+        assert isinstance(response, FakeResponse)
+    assert len(fake_engine.requests) == 2
+    assert engine.stats() == stats(misses=2)
+
+
+@pytest.mark.parametrize(
+    ["headers", "request_headers"],
+    [
+        pytest.param({"Cache-Control": "private, max-age=60"}, {}, id="private"),
+        pytest.param(
+            {"Cache-Control": "max-age=60"},
+            {"Authorization": "Basic Zm9v"},
+            id="authorization",
+        ),
+    ],
+)
+def test_stored_private_cache(
+    headers: Dict[str, str], request_headers: Dict[str, str]
+) -> None:
+    fake_engine = CacheableEngine()
+    fake_engine.headers = headers
+    engine = HTTPEngineCaching(fake_engine)
+
+    engine(create_request(headers=request_headers))
+    engine(create_request(headers=request_headers))
+    assert len(fake_engine.requests) == 1
+
+
+def test_stored_shared_cache_public() -> None:
+    fake_engine = CacheableEngine()
+    fake_engine.headers = {"Cache-Control": "public, max-age=60"}
+    engine = HTTPEngineCaching(fake_engine, shared=True)
+
+    engine(create_request(headers={"Authorization": "Basic Zm9v"}))
+    engine(create_request(headers={"Authorization": "Basic Zm9v"}))
+    assert len(fake_engine.requests) == 1
+
+
+@pytest.mark.parametrize(
+    "request_",
+    [
+        pytest.param(
+            create_request(headers={"Cache-Control": "no-store"}), id="no-store"
+        ),
+        pytest.param(
+            create_request(headers={"If-None-Match": '"a"'}), id="conditional"
+        ),
+        pytest.param(create_request(headers={"Range": "bytes=0-1"}), id="range"),
+        pytest.param(create_request(stream_response=True), id="stream"),
+    ],
+)
+def test_bypassed(request_: HTTPRequest) -> None:
+    fake_engine = CacheableEngine()
+    storage = HTTPCacheMemoryStorage()
+    engine = HTTPEngineCaching(fake_engine, storage=storage)
+    engine(create_request())
+
+    response = engine(request_)
+    assert isinstance(response, FakeResponse)
+    assert fake_engine.requests[1] is request_
+    assert engine.stats() == stats(misses=1)
+    assert len(storage) == 1
+
+
+@pytest.mark.parametrize(
+    "request_headers",
+    [
+        pytest.param({"Cache-Control": "no-cache"}, id="no-cache"),
+        pytest.param({"Cache-Control": "max-age=0"}, id="max-age"),
+    ],
+)
+def test_request_cache_control(request_headers: Dict[str, str]) -> None:
+    fake_engine = CacheableEngine()
+    engine = HTTPEngineCaching(fake_engine)
+
+    engine(create_request())
+    engine(create_request(headers=request_headers))
+    assert len(fake_engine.requests) == 2
+    engine(create_request())
+    assert len(fake_engine.requests) == 2
+
+
+def test_vary() -> None:
+    fake_engine = CacheableEngine()
+    fake_engine.headers = {"Cache-Control": "max-age=60", "Vary": "Accept, X-Foo"}
+    engine = HTTPEngineCaching(fake_engine)
+
+    engine(create_request(headers={"Accept": "application/json"}))
+    engine(create_request(headers={"accept": "application/json"}))
+    assert len(fake_engine.requests) == 1
+
+    headers_list: List[Dict[str, str]] = [
+        {"Accept": "text/plain"},
+        {"Accept": "text/plain", "X-Foo": "bar"},
+        {},
+    ]
+    for headers in headers_list:
+        engine(create_request(headers=headers))
+    assert len(fake_engine.requests) == 4
+    assert engine.stats() == stats(hits=1, misses=4)
+
+
+def test_revalidation_etag(clock: Clock) -> None:
+    fake_engine = CacheableEngine()
+    fake_engine.headers = {
+        "Cache-Control": "max-age=60",
+        "Content-Length": "4",
+        "ETag": '"v1"',
+        "X-Foo": "foo",
+    }
+    engine = HTTPEngineCaching(fake_engine)
+    engine(create_request(headers={"Accept": "*/*"}))
+
+    clock.now += 60
+    fake_engine.status_code = 304
+    fake_engine.headers = {
+        "Cache-Control": "max-age=120",
+        "Content-Length": "0",
+        "ETag": '"v1"',
+    }
+    fake_engine.body = b""
+    response = engine(create_request(headers={"Accept": "*/*"}))
+    assert isinstance(response, HTTPResponseCached)
+    assert response.cache_status == "revalidated"
+    assert isinstance(response.raw, FakeResponse)
+    assert response.raw.closed.is_set()
+    assert response.status_code == 200
+    assert dict(response.headers) == {
+        "Cache-Control": "max-age=120",
+        "Content-Length": "4",
+        "ETag": '"v1"',
+        "X-Foo": "foo",
+    }
+    assert response.data_bytes == b"data"
+    assert dict(fake_engine.requests[1].headers) == {
+        "Accept": "*/*",
+        "If-None-Match": '"v1"',
+    }
+    assert engine.stats() == stats(revalidations=1, misses=1)
+
+    # fresh again, with the new max-age
+    clock.now += 119
+    assert engine(create_request()).data_bytes == b"data"
+    assert len(fake_engine.requests) == 2
+    assert engine.stats() == stats(hits=1, revalidations=1, misses=1)
+
+
+def test_revalidation_last_modified() -> None:
+    fake_engine = CacheableEngine()
+    fake_engine.headers = {"Last-Modified": "Mon, 02 Jan 2023 10:00:00 GMT"}
+    engine = HTTPEngineCaching(fake_engine)
+    engine(create_request())
+
+    fake_engine.status_code = 304
+    assert engine(create_request()).status_code == 200
+    assert dict(fake_engine.requests[1].headers) == {
+        "If-Modified-Since": "Mon, 02 Jan 2023 10:00:00 GMT"
+    }
+    assert engine.stats() == stats(revalidations=1, misses=1)
+
+
+def test_revalidation_modified() -> None:
+    fake_engine = CacheableEngine()
+    fake_engine.headers = {"ETag": '"v1"'}
+    engine = HTTPEngineCaching(fake_engine)
+    engine(create_request())
+
+    fake_engine.headers = {"ETag": '"v2"'}
+    fake_engine.body = b"new data"
+    assert engine(create_request()).data_bytes == b"new data"
+    assert engine(create_request()).data_bytes == b"new data"
+    assert [dict(request.headers) for request in fake_engine.requests] == [
+        {},
+        {"If-None-Match": '"v1"'},
+        {"If-None-Match": '"v2"'},
+    ]
+
+
+def test_stale_without_validator(clock: Clock) -> None:
+    fake_engine = CacheableEngine()
+    engine = HTTPEngineCaching(fake_engine)
+    engine(create_request())
+
+    clock.now += 60
+    fake_engine.status_code = 304  # would be wrong, as there was no validator
+    response = engine(create_request())
+    assert isinstance(response, FakeResponse)
+    assert not fake_engine.requests[1].headers
+
+
+@pytest.mark.parametrize(
+    ["method", "status_code", "invalidated"],
+    [
+        ("POST", 200, True),
+        ("PUT", 204, True),
+        ("DELETE", 302, True),
+        ("POST", 400, False),
+        ("HEAD", 200, False),
+        ("OPTIONS", 200, False),
+    ],
+)
+def test_invalidation(method: str, status_code: int, invalidated: bool) -> None:
+    fake_engine = CacheableEngine()
+    engine = HTTPEngineCaching(fake_engine)
+    engine(create_request())
+
+    fake_engine.status_code = status_code
+    response = engine(create_request(method))
+    assert isinstance(response, FakeResponse)
+
+    fake_engine.status_code = 200
+    engine(create_request())
+    assert len(fake_engine.requests) == (3 if invalidated else 2)
+
+
+def test_custom_key() -> None:
+    fake_engine = CacheableEngine()
+    engine = HTTPEngineCaching(fake_engine, key=lambda _: "same")
+
+    engine(create_request())
+    response = engine(create_request(url="https://www.example.com/other"))
+    assert isinstance(response, HTTPResponseCached)
+    assert response.cache_status == "hit"
+
+
+def test_authorization_key() -> None:
+    fake_engine = CacheableEngine()
+    engine = HTTPEngineCaching(fake_engine)
+
+    engine(create_request(headers={"Authorization": "Basic Zm9v"}))
+    engine(create_request(headers={"Authorization": "Basic YmFy"}))
+    engine(create_request())
+    assert len(fake_engine.requests) == 3
+    response = engine(create_request(headers={"Authorization": "Basic YmFy"}))
+    assert isinstance(response, HTTPResponseCached)
+    assert response.cache_status == "hit"
+    assert "Zm9v" not in cache_key(
+        create_request(headers={"Authorization": "Basic Zm9v"})
+    )
+
+
+def test_decode_content_key() -> None:
+    assert cache_key(create_request()) != cache_key(
+        HTTPRequest(
+            method="GET",
+            url="https://www.example.com/foo",
+            headers=HTTPHeaderDict(),
+            body=b"",
+            stream_response=False,
+            decode_content=False,
+        )
+    )
+
+
+def create_entry(body: bytes = b"data") -> HTTPCacheEntry:
+    return HTTPCacheEntry(
+        status_code=200,
+        reason="OK",
+        headers=HTTPHeaderDict([("Content-Type", "text/plain"), ("X-Foo", "a")]),
+        body=body,
+        stored_at=123.5,
+        vary={"accept": None, "x-bar": "bar"},
+    )
+
+
+def test_memory_storage_lru() -> None:
+    storage = HTTPCacheMemoryStorage(max_entries=2)
+    assert storage.max_entries == 2
+    entries = [create_entry(bytes([i])) for i in range(3)]
+
+    storage.save("a", entries[0])
+    storage.save("b", entries[1])
+    assert storage.load("a") is entries[0]  # "b" is now the least recently used
+    storage.save("c", entries[2])
+    assert len(storage) == 2
+    assert storage.load("a") is entries[0]
+    assert storage.load("b") is None
+    assert storage.load("c") is entries[2]
+
+    storage.save("c", entries[0])
+    assert storage.load("c") is entries[0]
+    storage.delete("c")
+    storage.delete("c")
+    assert storage.load("c") is None
+    assert len(storage) == 1
+
+
+def test_after_fork() -> None:
+    # pylint: disable=protected-access
+    engine = HTTPEngineCaching(CacheableEngine())
+    assert isinstance(engine.storage, HTTPCacheMemoryStorage)
+    engine._lock.acquire()  # pylint: disable=consider-using-with
+    engine.storage._lock.acquire()
+    # the locks may have been held by other threads of the parent process
+    engine._after_fork()
+    engine.storage._after_fork()
+    engine(create_request())
+    assert engine.stats() == stats(misses=1)
+
+
+def test_directory_storage(tmp_path: Path) -> None:
+    storage = HTTPCacheDirectoryStorage(tmp_path / "cache")
+    assert storage.path == tmp_path / "cache"
+    assert storage.load("a") is None
+
+    storage.save("a", create_entry(bytes(range(256))))
+    storage.save("b", create_entry())
+    assert storage.load("a") == create_entry(bytes(range(256)))
+    assert HTTPCacheDirectoryStorage(str(tmp_path / "cache")).load("b") == (
+        create_entry()
+    )
+    assert len(list(storage.path.iterdir())) == 2
+
+    storage.delete("a")
+    storage.delete("a")
+    assert storage.load("a") is None
+    assert storage.load("b") is not None
+
+
+def test_directory_storage_corrupted(tmp_path: Path) -> None:
+    storage = HTTPCacheDirectoryStorage(tmp_path)
+    storage.save("a", create_entry())
+    for content in ("{", "{}", "[]"):
+        for path in tmp_path.iterdir():
+            path.write_text(content)
+        assert storage.load("a") is None
+
+
+def test_directory_storage_engine(tmp_path: Path) -> None:
+    fake_engine = CacheableEngine()
+    HTTPEngineCaching(fake_engine, storage=HTTPCacheDirectoryStorage(tmp_path))(
+        create_request()
+    )
+
+    # e.g. in another process
+    engine = HTTPEngineCaching(fake_engine, storage=HTTPCacheDirectoryStorage(tmp_path))
+    assert engine(create_request()).data_bytes == b"data"
+    assert len(fake_engine.requests) == 1
+    assert engine.stats() == stats(hits=1)
+
+
+def test_default_engine() -> None:
+    engine = HTTPEngineCaching()
+    assert isinstance(engine.engine, HTTPEngineRequests)
@@ -0,0 +1,268 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import replace
+from threading import Event
+import time
+from typing import Hashable, List, Optional, Type
+
+import pytest
+
+from sdkite.http import (
+    HTTPConnectionError,
+    HTTPDataTooLargeError,
+    HTTPError,
+    HTTPRequest,
+    HTTPResponse,
+    HTTPTimeoutError,
+    engine_coalescing,
+)
+from sdkite.http.engine_coalescing import (
+    HTTPEngineCoalescing,
+    HTTPResponseCoalesced,
+    _InFlight,
+    coalescing_key,
+)
+from sdkite.http.engine_requests import HTTPEngineRequests
+from tests.unit.http.helpers import FakeEngine, FakeResponse, create_request
+
+
+class BlockingEngine(FakeEngine):
+    # the requests wait for the 'release' event
+    def __init__(self, body: bytes = b"\xe9t\xe9") -> None:
+        super().__init__()
+        self.body = body
+        self.release = Event()
+        self.error: Optional[Exception] = None
+
+    def __call__(self, request: HTTPRequest) -> HTTPResponse:
+        self.requests.append(request)
+        self.release.wait(1)
+        if self.error is not None:
+            raise self.error
+        response = FakeResponse(
+            headers={"Content-Type": "text/plain; charset=latin-1"}, body=self.body
+        )
+        self.responses.append(response)
+        return response
+
+
+class CountingEvent(Event):
+    nb_waiting = 0
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        CountingEvent.nb_waiting += 1  # GIL is enough for tests
+        return super().wait(timeout)
+
+
+@pytest.fixture(autouse=True)
+def _counting_event(monkeypatch: pytest.MonkeyPatch) -> None:
+    CountingEvent.nb_waiting = 0
+    monkeypatch.setattr(engine_coalescing, "Event", CountingEvent)
+
+
+def send_concurrently_futures(
+    fake_engine: BlockingEngine,
+    engine: HTTPEngineCoalescing,
+    requests: List[HTTPRequest],
+    nb_sent: int,
+) -> List["Future[HTTPResponse]"]:
+    with ThreadPoolExecutor(len(requests)) as executor:
+        futures = [executor.submit(engine, request) for request in requests]
+        # wait for all requests to be either sent or waiting for another one
+        while (
+            len(fake_engine.requests) < nb_sent
+            or CountingEvent.nb_waiting < len(requests) - nb_sent
+        ):
+            time.sleep(0.001)
+        fake_engine.release.set()
+    return futures
+
+
+def send_concurrently(
+    fake_engine: BlockingEngine,
+    engine: HTTPEngineCoalescing,
+    requests: List[HTTPRequest],
+    nb_sent: int,
+) -> List[HTTPResponse]:
+    futures = send_concurrently_futures(fake_engine, engine, requests, nb_sent)
+    return [future.result() for future in futures]
+
+
+def test_coalescing() -> None:
+    fake_engine = BlockingEngine()
+    engine = HTTPEngineCoalescing(fake_engine)
+    assert engine.engine is fake_engine
+    assert engine.key is coalescing_key
+
+    responses = send_concurrently(fake_engine, engine, [create_request()] * 5, 1)
+
+    assert len(fake_engine.requests) == 1
+    assert fake_engine.responses[0].closed.is_set()
+    assert len({id(response) for response in responses}) == 5
+    for response in responses:
+        assert isinstance(response, HTTPResponseCoalesced)
+        assert response.raw is fake_engine.responses[0]
+        assert response.status_code == 200
+        assert response.reason == "Some reason"
+        assert response.headers == fake_engine.responses[0].headers
+        assert response.headers is not fake_engine.responses[0].headers
+        assert response.data_str == "été"
+        assert list(response.data_stream) == [b"\xe9t\xe9"]
+
+    # later requests are sent again
+    assert engine(create_request()).data_bytes == b"\xe9t\xe9"
+    assert len(fake_engine.requests) == 2
+
+
+@pytest.mark.parametrize(
+    ["error", "follower_error_type", "follower_msg"],
+    [
+        pytest.param(ValueError("Boom"), HTTPError, "ValueError: Boom", id="other"),
+        pytest.param(
+            HTTPConnectionError(msg="Boom", request=create_request()),
+            HTTPConnectionError,
+            "Boom",
+            id="connection",
+        ),
+    ],
+)
+def test_coalescing_error(
+    error: Exception, follower_error_type: Type[HTTPError], follower_msg: str
+) -> None:
+    fake_engine = BlockingEngine()
+    fake_engine.error = error
+    engine = HTTPEngineCoalescing(fake_engine)
+
+    requests = [create_request() for _ in range(3)]
+    futures = send_concurrently_futures(fake_engine, engine, requests, 1)
+    assert len(fake_engine.requests) == 1
+    exceptions = [future.exception() for future in futures]
+    # the leader raises the error, and each follower its own exception caused by it
+    assert exceptions.count(error) == 1
+    followers = [
+        (exception, request)
+        for exception, request in zip(exceptions, requests)
+        if exception is not error
+    ]
+    for exception, request in followers:
+        assert isinstance(exception, HTTPError)
+        assert exception.__class__ is follower_error_type
+        assert str(exception) == follower_msg
+        assert exception.__cause__ is error
+        assert exception.request is request
+    assert followers[0][0] is not followers[1][0]
+
+    fake_engine.error = None
+    assert engine(create_request()).status_code == 200
+
+
+def test_coalescing_timeout() -> None:
+    fake_engine = BlockingEngine()
+    engine = HTTPEngineCoalescing(fake_engine)
+
+    with ThreadPoolExecutor(1) as executor:
+        leader = executor.submit(engine, create_request())
+        while not fake_engine.requests:
+            time.sleep(0.001)
+        request = replace(create_request(), timeout_connect=0.01, timeout_read=0.02)
+        with pytest.raises(
+            HTTPTimeoutError,
+            match=r"^Waited more than 0\.03s for an identical request$",
+        ):
+            engine(request)
+        fake_engine.release.set()
+        assert leader.result().status_code == 200
+
+
+def test_after_fork() -> None:
+    # pylint: disable=protected-access
+    fake_engine = BlockingEngine()
+    fake_engine.release.set()
+    engine = HTTPEngineCoalescing(fake_engine)
+    # request sent by another thread of the parent process
+    engine._in_flight[coalescing_key(create_request())] = _InFlight()
+    engine._lock.acquire()  # pylint: disable=consider-using-with
+
+    # the request is sent again in the child process, instead of waiting forever
+    engine._after_fork()
+    assert engine(create_request()).status_code == 200
+    assert len(fake_engine.requests) == 1
+
+
+def test_coalescing_different_requests() -> None:
+    fake_engine = BlockingEngine()
+    engine = HTTPEngineCoalescing(fake_engine)
+
+    requests = [
+        create_request(),
+        create_request(url="https://www.example.com/other"),
+        create_request(headers={"Accept": "application/json"}),
+        create_request(method="HEAD"),
+    ]
+    send_concurrently(fake_engine, engine, requests, len(requests))
+    assert len(fake_engine.requests) == len(requests)
+
+
+@pytest.mark.parametrize(
+    "request_",
+    [
+        pytest.param(create_request(method="POST"), id="post"),
+        pytest.param(create_request(body=b"data"), id="body"),
+        pytest.param(create_request(stream_response=True), id="stream"),
+    ],
+)
+def test_not_coalesced(request_: HTTPRequest) -> None:
+    assert coalescing_key(request_) is None
+
+    fake_engine = BlockingEngine()
+    fake_engine.release.set()
+    engine = HTTPEngineCoalescing(fake_engine)
+    response = engine(request_)
+    assert response is fake_engine.responses[0]
+
+
+def test_custom_key() -> None:
+    def key(request: HTTPRequest) -> Hashable:
+        return request.url  # ignore headers
+
+    fake_engine = BlockingEngine()
+    engine = HTTPEngineCoalescing(fake_engine, key=key)
+    requests = [
+        create_request(),
+        create_request(headers={"Accept": "application/json"}),
+    ]
+    send_concurrently(fake_engine, engine, requests, 1)
+    assert len(fake_engine.requests) == 1
+
+
+def test_data_memory_limit() -> None:
+    fake_engine = BlockingEngine()
+    fake_engine.release.set()
+    engine = HTTPEngineCoalescing(fake_engine)
+    request = create_request()
+    response = engine(request)
+    # pylint: disable-next=protected-access
+    response._set_context(request, data_memory_limit=2)
+    with pytest.raises(HTTPDataTooLargeError):
+        response.data_bytes  # pylint: disable=pointless-statement  # noqa: B018
+
+
+def test_empty_body() -> None:
+    fake_engine = BlockingEngine(b"")
+    fake_engine.release.set()
+    engine = HTTPEngineCoalescing(fake_engine)
+    response = engine(create_request(method="HEAD"))
+    assert isinstance(response, HTTPResponseCoalesced)
+    assert not list(response.data_stream)
+    assert response.data_bytes == b""
+
+
+def test_data_json() -> None:
+    fake_engine = BlockingEngine(b'{"a": [1, 2]}')
+    fake_engine.release.set()
+    engine = HTTPEngineCoalescing(fake_engine)
+    assert engine(create_request()).data_json == {"a": [1, 2]}
+
+
+def test_default_engine() -> None:
+    engine = HTTPEngineCoalescing()
+    assert isinstance(engine.engine, HTTPEngineRequests)
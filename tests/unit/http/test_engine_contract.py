@@ -0,0 +1,189 @@
+import gzip
+import re
+import socket
+from typing import Any, List, Optional
+
+import pytest
+from requests_mock import Mocker
+
+from sdkite.http import (
+    HTTPConnectionError,
+    HTTPDataTooLargeError,
+    HTTPError,
+    HTTPHeaderDict,
+    HTTPRequest,
+    HTTPResponse,
+    HTTPTimeoutError,
+)
+from sdkite.http.adapter import HTTPAdapterSendRequest
+from sdkite.http.engine_requests import HTTPEngineRequests
+from sdkite.http.engine_stdlib import HTTPEngineStdlib
+from sdkite.http.engine_urllib3 import HTTPEngineUrllib3
+
+
+# behavior expected from all synchronous engines, tested against a local server
+
+
+@pytest.fixture(
+    name="engine", params=[HTTPEngineRequests, HTTPEngineStdlib, HTTPEngineUrllib3]
+)
+def fixture_engine(request: Any) -> HTTPAdapterSendRequest:
+    engine: HTTPAdapterSendRequest = request.param()
+    return engine
+
+
+def create_request(
+    url: str,
+    method: str = "GET",
+    body: Any = b"",
+    *,
+    headers: Optional[HTTPHeaderDict] = None,
+    stream_response: bool = False,
+    decode_content: bool = True,
+    timeout_read: Optional[float] = None,
+) -> HTTPRequest:
+    return HTTPRequest(
+        method=method,
+        url=url,
+        headers=HTTPHeaderDict() if headers is None else headers,
+        body=body,
+        stream_response=stream_response,
+        decode_content=decode_content,
+        timeout_read=timeout_read,
+    )
+
+
+@pytest.mark.parametrize("stream_response", [False, True])
+def test_request(
+    engine: HTTPAdapterSendRequest, local_url: str, stream_response: bool
+) -> None:
+    response = engine(
+        create_request(
+            f"{local_url}echo?a=1&b=2",
+            "POST",
+            b"hello",
+            headers=HTTPHeaderDict({"X-Foo": "Uvw"}),
+            stream_response=stream_response,
+        )
+    )
+
+    assert isinstance(response, HTTPResponse)
+    assert response.status_code == 200
+    assert response.reason == "OK"
+    assert response.headers["content-type"] == "application/json"
+    data: Any = response.data_json
+    assert data["method"] == "POST"
+    assert data["path"] == "/echo?a=1&b=2"
+    assert data["headers"]["x-foo"] == "Uvw"
+    assert data["headers"]["content-length"] == "5"
+    assert "user-agent" not in data["headers"]
+    assert data["body"] == "hello"
+    assert response.data_str.startswith('{"method": "POST"')
+    assert response.data_bytes == response.data_str.encode()
+
+
+def test_request_body_iterator(engine: HTTPAdapterSendRequest, local_url: str) -> None:
+    response = engine(
+        create_request(
+            f"{local_url}echo",
+            "PUT",
+            iter([b"hello", b" ", b"world"]),
+            headers=HTTPHeaderDict({"User-Agent": "Custom"}),
+        )
+    )
+    data: Any = response.data_json
+    assert data["headers"]["transfer-encoding"] == "chunked"
+    assert data["headers"]["user-agent"] == "Custom"
+    assert data["body"] == "hello world"
+
+
+def test_status_code(engine: HTTPAdapterSendRequest, local_url: str) -> None:
+    response = engine(create_request(f"{local_url}status/404"))
+    assert response.status_code == 404
+    assert response.reason == "Not Found"
+    assert response.headers["x-status"] == "yes"
+    assert response.data_bytes == b""
+
+
+def test_data_str_charset(engine: HTTPAdapterSendRequest, local_url: str) -> None:
+    response = engine(create_request(f"{local_url}latin1"))
+    assert response.data_str == "é"
+
+
+@pytest.mark.parametrize("stream_response", [False, True])
+def test_decode_content(
+    engine: HTTPAdapterSendRequest, local_url: str, stream_response: bool
+) -> None:
+    response = engine(
+        create_request(f"{local_url}gzip", stream_response=stream_response)
+    )
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.data_bytes == b"hello world"
+
+    response = engine(
+        create_request(
+            f"{local_url}gzip", stream_response=stream_response, decode_content=False
+        )
+    )
+    assert gzip.decompress(b"".join(response.data_stream)) == b"hello world"
+
+
+def test_stream(engine: HTTPAdapterSendRequest, local_url: str) -> None:
+    response = engine(create_request(f"{local_url}chunked", stream_response=True))
+    assert list(response.iter_lines()) == ["line 1", "line 2", "line 3"]
+
+    response = engine(create_request(f"{local_url}chunked", stream_response=True))
+    assert b"".join(response.data_stream) == b"line 1\nline 2\nline 3\n"
+
+
+def test_close_early(engine: HTTPAdapterSendRequest, local_url: str) -> None:
+    for _ in range(3):
+        with engine(create_request(f"{local_url}big", stream_response=True)) as resp:
+            assert next(iter(resp.data_stream)).startswith(b"x")
+    # the connection is still usable
+    assert engine(create_request(f"{local_url}echo")).status_code == 200
+
+
+def test_data_memory_limit(engine: HTTPAdapterSendRequest, local_url: str) -> None:
+    request = create_request(f"{local_url}big", stream_response=True)
+    response = engine(request)
+    # pylint: disable-next=protected-access
+    response._set_context(request, data_memory_limit=1000)
+    with pytest.raises(HTTPDataTooLargeError):
+        response.data_bytes  # pylint: disable=pointless-statement  # noqa: B018
+
+
+def test_connection_error(
+    engine: HTTPAdapterSendRequest, requests_mock: Mocker
+) -> None:
+    requests_mock.real_http = True
+
+    # find a port where nothing is listening
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    with pytest.raises(HTTPConnectionError):
+        engine(create_request(f"http://127.0.0.1:{port}/"))
+
+
+def test_truncated_body(engine: HTTPAdapterSendRequest, local_url: str) -> None:
+    with pytest.raises(HTTPError):
+        engine(create_request(f"{local_url}truncated"))
+
+
+def test_invalid_url(engine: HTTPAdapterSendRequest) -> None:
+    with pytest.raises(HTTPError):
+        engine(create_request("ftp://www.example.com/"))
+
+
+def test_timeout(engine: HTTPAdapterSendRequest, local_url: str) -> None:
+    with pytest.raises(HTTPTimeoutError, match=re.escape("timed out")):
+        engine(create_request(f"{local_url}slow", timeout_read=0.05))
+
+
+def test_sequential_requests(engine: HTTPAdapterSendRequest, local_url: str) -> None:
+    bodies: List[bytes] = [
+        engine(create_request(f"{local_url}ok")).data_bytes for _ in range(20)
+    ]
+    assert bodies == [b"ok"] * 20
@@ -1,11 +1,18 @@
 from dataclasses import replace
+import gzip
+from hashlib import sha256
+from io import BytesIO
+import json
+from mmap import mmap
 from pathlib import Path
 import re
-from typing import Dict, cast
+from typing import Callable, Dict, cast
+import zlib
 
 import pytest
 
-from sdkite.http import HTTPHeaderDict, HTTPRequest
+from sdkite.http import HTTPDataTooLargeError, HTTPHeaderDict, HTTPRequest
+from sdkite.http._stringescape import stringescape_dumps
 from sdkite.http.engine_replay import (
     HTTPEngineReplay,
     HTTPResponseReplay,
@@ -71,6 +78,25 @@ def test_response() -> None:
     assert response_replay.data_json == {"msg": 42}
     assert response_replay.data_json == {"msg": 42}
 
+    response_replay = HTTPResponseReplay(
+        {
+            "status_code": 200,
+            "reason": "OK",
+            "headers": {"content-type": "application/json"},
+            "body": [b'{"msg": [1', b"3, 3", b"7]}"],
+        }
+    )
+    assert list(response_replay.iter_json_items("msg")) == [13, 37]
+    with pytest.raises(ValueError, match=re.escape("Unexpected end of JSON data")):
+        list(response_replay.iter_json_items(["msg"]))  # exhausted
+
+    response_replay = HTTPResponseReplay(recorded_response)
+    fileobj = BytesIO()
+    checksum = sha256()
+    assert response_replay.save_to(fileobj, checksum=checksum) == 11
+    assert fileobj.getvalue() == b'{"msg": 42}'
+    assert checksum.hexdigest() == sha256(b'{"msg": 42}').hexdigest()
+
     # modify headers
     response_replay = HTTPResponseReplay(recorded_response)
     response_replay.headers["content-type"] = "new"
@@ -87,6 +113,54 @@ def test_response() -> None:
     assert response_replay.data_json == {"msg": 42}
 
 
+def test_response_data_memory_limit() -> None:
+    # pylint: disable=protected-access
+    recorded_response: _RecordedResponse = {
+        "status_code": 200,
+        "reason": "OK",
+        "headers": {"content-length": "11"},
+        "body": [b'{"msg":', b" 4", b"2}"],
+    }
+    request = HTTPRequest(
+        method="GET",
+        url="https://example.com/",
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=False,
+    )
+
+    response_replay = HTTPResponseReplay(recorded_response)
+    response_replay._set_context(request, data_memory_limit=11)
+    assert response_replay.data_json == {"msg": 42}
+
+    response_replay = HTTPResponseReplay(recorded_response)
+    response_replay._set_context(request, data_memory_limit=11)
+    assert response_replay.data_buffer == b'{"msg": 42}'
+
+    response_replay = HTTPResponseReplay(recorded_response)
+    response_replay._set_context(request)  # no limit
+    assert response_replay.data_buffer == b'{"msg": 42}'
+
+    response_replay = HTTPResponseReplay(recorded_response)
+    response_replay._set_context(request, data_memory_limit=10)
+    with pytest.raises(HTTPDataTooLargeError):
+        response_replay.data_bytes  # pylint: disable=pointless-statement  # noqa: B018
+
+    # invalid content-length is ignored
+    response_replay = HTTPResponseReplay(
+        {**recorded_response, "headers": {"content-length": "?"}}  # type: ignore[misc]
+    )
+    response_replay._set_context(request, data_memory_limit=10)
+    with pytest.raises(HTTPDataTooLargeError):
+        response_replay.data_str  # pylint: disable=pointless-statement  # noqa: B018
+
+    response_replay = HTTPResponseReplay(recorded_response)
+    response_replay._set_context(request, data_memory_limit=10)
+    data_buffer = response_replay.data_buffer
+    assert isinstance(data_buffer, mmap)
+    assert data_buffer[:] == b'{"msg": 42}'
+
+
 def test_response_replace() -> None:
     recorded_response: _RecordedResponse = {
         "status_code": 200,
@@ -305,3 +379,132 @@ def test_replay_with_modifiers() -> None:
     assert response.reason == "OK"
     assert response.headers == HTTPHeaderDict({"server": "nginx"})
     assert response.data_json == {"msg": 1337}
+
+
+@pytest.mark.parametrize(
+    ["content_encoding", "compress"],
+    [
+        pytest.param("gzip", gzip.compress, id="gzip"),
+        pytest.param("deflate", zlib.compress, id="deflate"),
+        pytest.param(
+            "gzip, Deflate",
+            lambda data: zlib.compress(gzip.compress(data)),
+            id="gzip-deflate",
+        ),
+        pytest.param("identity", lambda data: data, id="identity"),
+    ],
+)
+def test_replay_decode_content(
+    tmp_path: Path, content_encoding: str, compress: Callable[[bytes], bytes]
+) -> None:
+    encoded = compress(b'{"msg": 42}')
+    record = {
+        "request": {
+            "method": "GET",
+            "url": "https://example.com/",
+            "headers": {},
+            "body": "",
+        },
+        "response": {
+            "status_code": 200,
+            "reason": "OK",
+            "headers": {"Content-Encoding": content_encoding},
+            "body": [stringescape_dumps(encoded[:5]), stringescape_dumps(encoded[5:])],
+            "body_encoded": True,
+        },
+    }
+    (tmp_path / "encoded.json").write_text(json.dumps(record))
+
+    engine = HTTPEngineReplay([tmp_path])
+    request = HTTPRequest(
+        method="GET",
+        url="https://example.com/",
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=False,
+    )
+
+    # decoded
+    for _ in range(2):  # record is left untouched
+        response = engine(request)
+        assert response.headers == HTTPHeaderDict(
+            {"Content-Encoding": content_encoding}
+        )
+        assert response.data_json == {"msg": 42}
+
+    # not decoded
+    response = engine(replace(request, decode_content=False))
+    assert response.headers == HTTPHeaderDict({"Content-Encoding": content_encoding})
+    assert response.data_bytes == encoded
+
+
+def test_replay_decode_content_unsupported(tmp_path: Path) -> None:
+    record = {
+        "request": {
+            "method": "GET",
+            "url": "https://example.com/",
+            "headers": {},
+            "body": "",
+        },
+        "response": {
+            "status_code": 200,
+            "reason": "OK",
+            "headers": {"Content-Encoding": "br"},
+            "body": ["???"],
+            "body_encoded": True,
+        },
+    }
+    (tmp_path / "encoded.json").write_text(json.dumps(record))
+
+    engine = HTTPEngineReplay([tmp_path])
+    request = HTTPRequest(
+        method="GET",
+        url="https://example.com/",
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=False,
+    )
+    with pytest.raises(
+        ValueError,
+        match=re.escape("Content encoding 'br' is not supported by the replay engine"),
+    ):
+        engine(request)
+    assert engine(replace(request, decode_content=False)).data_bytes == b"???"
+
+
+def test_replay_no_decode_content_of_decoded_record(tmp_path: Path) -> None:
+    record = {
+        "request": {
+            "method": "GET",
+            "url": "https://example.com/",
+            "headers": {},
+            "body": "",
+        },
+        "response": {
+            "status_code": 200,
+            "reason": "OK",
+            "headers": {"Content-Encoding": "gzip", "Server": "nginx"},
+            "body": ['{"msg": 42}'],
+        },
+    }
+    (tmp_path / "decoded.json").write_text(json.dumps(record))
+
+    engine = HTTPEngineReplay([tmp_path])
+    request = HTTPRequest(
+        method="GET",
+        url="https://example.com/",
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=False,
+    )
+
+    response = engine(request)
+    assert response.headers == HTTPHeaderDict(
+        {"Content-Encoding": "gzip", "Server": "nginx"}
+    )
+    assert response.data_bytes == b'{"msg": 42}'
+
+    # the body is sent as-is without content encoding
+    response = engine(replace(request, decode_content=False))
+    assert response.headers == HTTPHeaderDict({"Server": "nginx"})
+    assert response.data_bytes == b'{"msg": 42}'
@@ -260,3 +260,51 @@ def test_recording_modifiers(
     # response unmodified
     response = engine(request)
     assert response.data_json == {"msg": "modified1"}
+
+
+def test_recording_no_decode_content(tmp_path: Path, requests_mock: Mocker) -> None:
+    requests_mock.register_uri(
+        # request
+        "GET",
+        "https://example.com/foo",
+        # response
+        content=b"\x1f\x8b...",
+        reason="OK",
+        headers={"content-encoding": "gzip"},
+    )
+
+    engine = HTTPEngineReplay([tmp_path], recording=True)
+    request = HTTPRequest(
+        method="GET",
+        url="https://example.com/foo",
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=False,
+        decode_content=False,
+    )
+    response = engine(request)
+    assert response.headers == HTTPHeaderDict({"content-encoding": "gzip"})
+    assert response.data_bytes == b"\x1f\x8b..."
+    assert (
+        (tmp_path / "1234567890_get_https___example_com_foo.json").read_bytes()
+        == rb"""{
+  "request": {
+    "method": "GET",
+    "url": "https://example.com/foo",
+    "headers": {},
+    "body": ""
+  },
+  "response": {
+    "status_code": 200,
+    "reason": "OK",
+    "headers": {
+      "content-encoding": "gzip"
+    },
+    "body": [
+      "\\x1f\\x8b..."
+    ],
+    "body_encoded": true
+  }
+}
+"""
+    )
@@ -1,8 +1,35 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+import gzip
+from hashlib import sha256
+from io import BytesIO
+from mmap import mmap
+import os
+from pathlib import Path
+import re
+import ssl
+from typing import List
+from unittest.mock import Mock
+import warnings
+
+import pytest
 from requests import Response
+from requests.utils import DEFAULT_CA_BUNDLE_PATH
 from requests_mock import Mocker
 
-from sdkite.http import HTTPHeaderDict, HTTPRequest, HTTPResponse
-from sdkite.http.engine_requests import HTTPEngineRequests, HTTPResponseRequests
+from sdkite import Client
+from sdkite.http import (
+    HTTPAdapterSpec,
+    HTTPDataTooLargeError,
+    HTTPHeaderDict,
+    HTTPRequest,
+    HTTPResponse,
+)
+from sdkite.http.engine_requests import (
+    HTTPEngineRequests,
+    HTTPPoolStats,
+    HTTPResponseRequests,
+)
 
 
 def test_requests_engine(requests_mock: Mocker) -> None:
@@ -75,3 +102,396 @@ def test_request_engine_custom_ua(requests_mock: Mocker) -> None:
             stream_response=False,
         )
     )
+
+
+def test_requests_engine_iter_json_items(requests_mock: Mocker) -> None:
+    requests_mock.register_uri(
+        "GET",
+        "https://www.example.com/foo/bar",
+        content=b'{"count": 2, "items": [{"id": 1}, {"id": 2}]}',
+    )
+
+    engine = HTTPEngineRequests()
+    response = engine(
+        HTTPRequest(
+            method="GET",
+            url="https://www.example.com/foo/bar",
+            headers=HTTPHeaderDict(),
+            body=b"",
+            stream_response=True,
+        )
+    )
+    assert list(response.iter_json_items("items")) == [{"id": 1}, {"id": 2}]
+
+
+def test_requests_engine_save_to(requests_mock: Mocker, tmp_path: Path) -> None:
+    content = bytes(range(256)) * 10_000
+    requests_mock.register_uri(
+        "GET",
+        "https://www.example.com/foo/bar",
+        content=content,
+    )
+
+    engine = HTTPEngineRequests()
+    request = HTTPRequest(
+        method="GET",
+        url="https://www.example.com/foo/bar",
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=True,
+    )
+
+    # to path
+    checksum = sha256()
+    with engine(request) as response:
+        assert response.save_to(tmp_path / "data", checksum=checksum) == len(content)
+    assert (tmp_path / "data").read_bytes() == content
+    assert checksum.hexdigest() == sha256(content).hexdigest()
+
+    # to file object
+    fileobj = BytesIO()
+    with engine(request) as response:
+        assert response.save_to(fileobj) == len(content)
+    assert fileobj.getvalue() == content
+
+
+def test_requests_engine_iter_lines(requests_mock: Mocker) -> None:
+    requests_mock.register_uri(
+        "GET",
+        "https://www.example.com/foo/bar",
+        content=b'{"id": 1}\n{"id": 2}\n',
+    )
+
+    engine = HTTPEngineRequests()
+    request = HTTPRequest(
+        method="GET",
+        url="https://www.example.com/foo/bar",
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=True,
+    )
+    with engine(request) as response:
+        assert list(response.iter_lines()) == ['{"id": 1}', '{"id": 2}']
+    with engine(request) as response:
+        assert list(response.iter_ndjson()) == [{"id": 1}, {"id": 2}]
+
+
+@pytest.mark.parametrize("content_length", [False, True])
+def test_requests_engine_data_memory_limit(
+    requests_mock: Mocker, content_length: bool
+) -> None:
+    # pylint: disable=protected-access
+    content = b'{"data": "%s"}' % (b"x" * 100)
+    requests_mock.register_uri(
+        "GET",
+        "https://www.example.com/foo/bar",
+        content=content,
+        headers={"content-length": str(len(content))} if content_length else {},
+    )
+
+    engine = HTTPEngineRequests()
+    request = HTTPRequest(
+        method="GET",
+        url="https://www.example.com/foo/bar",
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=True,
+    )
+
+    # below limit
+    for attr in ("data_bytes", "data_str", "data_json", "data_buffer"):
+        response = engine(request)
+        response._set_context(request, data_memory_limit=len(content))
+        assert getattr(response, attr)
+        assert response.data_bytes == content
+        assert response.data_buffer == content
+
+    # above limit
+    for attr in ("data_bytes", "data_str", "data_json"):
+        response = engine(request)
+        response._set_context(request, data_memory_limit=len(content) - 1)
+        with pytest.raises(
+            HTTPDataTooLargeError,
+            match=re.escape(
+                f"Response body larger than memory limit of {len(content) - 1} bytes"
+            ),
+        ) as excinfo:
+            getattr(response, attr)
+        assert excinfo.value.limit == len(content) - 1
+        assert excinfo.value.request == request
+        assert excinfo.value.response == response
+
+    # above limit with spill to disk
+    response = engine(request)
+    response._set_context(request, data_memory_limit=len(content) - 1)
+    data_buffer = response.data_buffer
+    assert isinstance(data_buffer, mmap)
+    assert data_buffer[:] == content
+    assert data_buffer.find(b"x" * 100) == 10
+
+
+def test_requests_engine_decode_content(requests_mock: Mocker) -> None:
+    content = gzip.compress(b'{"hello":"world"}')
+    requests_mock.register_uri(
+        "GET",
+        "https://www.example.com/foo/bar",
+        content=content,
+        headers={"Content-Encoding": "gzip"},
+    )
+
+    engine = HTTPEngineRequests()
+    request = HTTPRequest(
+        method="GET",
+        url="https://www.example.com/foo/bar",
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=False,
+    )
+
+    # decoded
+    for stream_response in (False, True):
+        response = engine(replace(request, stream_response=stream_response))
+        assert response.headers == HTTPHeaderDict({"Content-Encoding": "gzip"})
+        assert response.data_bytes == b'{"hello":"world"}'
+
+    # not decoded
+    for stream_response in (False, True):
+        request_no_decode = replace(
+            request, stream_response=stream_response, decode_content=False
+        )
+
+        response = engine(request_no_decode)
+        assert requests_mock.last_request.stream  # type: ignore[union-attr]
+        assert response.headers == HTTPHeaderDict({"Content-Encoding": "gzip"})
+        assert response.data_bytes == content
+        assert response.data_bytes == content  # can be accessed several times
+        assert b"".join(response.data_stream) == content
+
+        response = engine(request_no_decode)
+        assert b"".join(response.data_stream) == content
+
+        response = engine(request_no_decode)
+        fileobj = BytesIO()
+        response.save_to(fileobj)
+        assert fileobj.getvalue() == content
+
+
+def test_requests_engine_timeouts(requests_mock: Mocker) -> None:
+    requests_mock.register_uri("GET", "https://www.example.com/foo/bar")
+
+    engine = HTTPEngineRequests()
+    request = HTTPRequest(
+        method="GET",
+        url="https://www.example.com/foo/bar",
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=False,
+    )
+
+    engine(request)
+    engine(replace(request, stream_response=True))
+    engine(replace(request, timeout_connect=1.5))
+    engine(replace(request, stream_response=True, timeout_read=2.5))
+    timeouts: List[object] = [
+        request.timeout for request in requests_mock.request_history
+    ]
+    assert timeouts == [
+        (40, 30),
+        (40, 600),
+        (1.5, 30),
+        (40, 2.5),
+    ]
+
+
+def test_requests_engine_pool_settings() -> None:
+    # pylint: disable=protected-access
+    engine = HTTPEngineRequests(
+        pool_connections=3, pool_maxsize=20, pool_block=True, max_retries=2
+    )
+    for prefix in ("http://", "https://"):
+        adapter = engine.session.get_adapter(f"{prefix}www.example.com/")
+        assert adapter is engine._transport_adapter
+        assert adapter._pool_connections == 3  # type: ignore[attr-defined]
+        assert adapter._pool_maxsize == 20  # type: ignore[attr-defined]
+        assert adapter._pool_block  # type: ignore[attr-defined]
+        assert adapter.max_retries.total == 2  # type: ignore[attr-defined]
+
+
+@pytest.mark.parametrize("session_per_thread", [False, True])
+def test_requests_engine_session_per_thread(session_per_thread: bool) -> None:
+    engine = HTTPEngineRequests(session_per_thread=session_per_thread)
+    session = engine.session
+    assert engine.session is session
+
+    with ThreadPoolExecutor(1) as executor:
+        other_session = executor.submit(lambda: engine.session).result()
+
+    assert (other_session is session) is not session_per_thread
+    # connection pools are shared in any case
+    for prefix in ("http://", "https://"):
+        assert other_session.get_adapter(prefix) is session.get_adapter(prefix)
+
+
+def test_requests_engine_pool_stats(local_url: str) -> None:
+    engine = HTTPEngineRequests(pool_maxsize=4)
+    assert engine.pool_stats() == []
+
+    request = HTTPRequest(
+        method="GET",
+        url=local_url,
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=True,
+    )
+    port = int(local_url.rsplit(":", 1)[1].strip("/"))
+
+    # two connections in use at the same time
+    with engine(request) as response1, engine(request) as response2:
+        assert engine.pool_stats() == [
+            HTTPPoolStats(
+                scheme="http",
+                host="127.0.0.1",
+                port=port,
+                maxsize=4,
+                num_connections=2,
+                num_requests=2,
+                idle_connections=0,
+            )
+        ]
+        assert response1.data_bytes == b"ok"
+        assert response2.data_bytes == b"ok"
+
+    # connections are back in the pool and reused
+    assert engine.pool_stats()[0].idle_connections == 2
+    assert engine(replace(request, stream_response=False)).data_bytes == b"ok"
+    (stats,) = engine.pool_stats()
+    assert stats.num_connections == 2
+    assert stats.num_requests == 3
+    assert stats.idle_connections == 2
+
+    engine.session.close()
+    assert engine.pool_stats() == []
+
+
+def test_requests_engine_ssl_context() -> None:
+    # pylint: disable=protected-access
+    ssl_context = ssl.create_default_context()
+    for engine, ca_certs in (
+        (HTTPEngineRequests(), DEFAULT_CA_BUNDLE_PATH),
+        # the certificates are already loaded in the context
+        (HTTPEngineRequests(ssl_context=ssl_context), None),
+    ):
+        transport_adapter = engine._transport_adapter
+        connection = Mock()
+        transport_adapter.cert_verify(
+            connection, "https://www.example.com/", True, None
+        )
+        assert connection.ca_certs == ca_certs
+        # unless other ones are given
+        transport_adapter.cert_verify(
+            connection, "https://www.example.com/", DEFAULT_CA_BUNDLE_PATH, None
+        )
+        assert connection.ca_certs == DEFAULT_CA_BUNDLE_PATH
+
+    pool_kwargs = transport_adapter.poolmanager.connection_pool_kw
+    assert pool_kwargs["ssl_context"] is ssl_context
+
+
+def test_requests_engine_warmup(local_url: str) -> None:
+    engine = HTTPEngineRequests(pool_maxsize=3)
+    engine.warmup(local_url, 2)
+    (stats,) = engine.pool_stats()
+    assert (stats.num_connections, stats.num_requests, stats.idle_connections) == (
+        2,
+        0,
+        2,
+    )
+
+    # idle connections are reused, up to the size of the pool
+    engine.warmup(local_url, 5)
+    (stats,) = engine.pool_stats()
+    assert (stats.num_connections, stats.idle_connections) == (3, 3)
+
+    # the connections are used by the requests
+    request = HTTPRequest(
+        method="GET",
+        url=local_url,
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=False,
+    )
+    assert engine(request).data_bytes == b"ok"
+    (stats,) = engine.pool_stats()
+    assert (stats.num_connections, stats.num_requests) == (3, 1)
+
+    # connection errors are raised by the requests instead
+    engine.warmup("http://127.0.0.1:1/")
+
+
+def test_requests_engine_client_warmup(local_url: str) -> None:
+    class Reports(Client):
+        _http = HTTPAdapterSpec("reports")
+
+    class ApiClient(Client):
+        _http = HTTPAdapterSpec(local_url)
+        _http.set_engine(HTTPEngineRequests, pool_maxsize=4)
+        reports: Reports
+
+    client = ApiClient()
+    client.warmup(2)
+    # same pool for the sub-client
+    engine = client._http.engine  # pylint: disable=protected-access
+    (stats,) = engine.pool_stats()  # type: ignore[attr-defined]
+    assert stats.num_connections == 2
+
+
+def test_requests_engine_after_fork(local_url: str) -> None:
+    # pylint: disable=protected-access
+    engine = HTTPEngineRequests(pool_maxsize=4)
+    session = engine.session
+    engine.warmup(local_url)
+    poolmanager = engine._transport_adapter.poolmanager
+
+    engine._after_fork()
+    assert engine.pool_stats() == []
+    assert engine.session is session
+    assert engine._transport_adapter.poolmanager is not poolmanager
+    assert engine._transport_adapter.poolmanager.connection_pool_kw["maxsize"] == 4
+    poolmanager.clear()
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="os.fork is not available")
+def test_requests_engine_fork(local_url: str) -> None:
+    engine = HTTPEngineRequests()
+    request = HTTPRequest(
+        method="GET",
+        url=local_url,
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=False,
+    )
+    assert engine(request).data_bytes == b"ok"
+
+    with warnings.catch_warnings():
+        # the local server runs in a thread of this process
+        warnings.simplefilter("ignore", DeprecationWarning)
+        pid = os.fork()
+    if pid == 0:  # pragma: no cover
+        # child process: uses its own connection
+        exit_code = 1
+        try:
+            assert engine(request).data_bytes == b"ok"
+            (stats,) = engine.pool_stats()
+            assert (stats.num_connections, stats.num_requests) == (1, 1)
+            exit_code = 0
+        finally:
+            os._exit(exit_code)
+
+    _, status = os.waitpid(pid, 0)
+    assert os.WIFEXITED(status)
+    assert os.WEXITSTATUS(status) == 0
+
+    # the connection of the parent is still usable
+    assert engine(request).data_bytes == b"ok"
+    (stats,) = engine.pool_stats()
+    assert (stats.num_connections, stats.num_requests) == (1, 2)
@@ -0,0 +1,194 @@
+from dataclasses import replace
+import http.client
+import socket
+import ssl
+import subprocess
+import sys
+from typing import Any, Iterator, List, Optional, Tuple
+
+import pytest
+
+from sdkite.http import (
+    HTTPConnectionError,
+    HTTPHeaderDict,
+    HTTPRequest,
+    model,
+)
+from sdkite.http.engine_stdlib import HTTPEngineStdlib, HTTPResponseStdlib
+
+
+def create_request(
+    url: str, body: Any = b"", headers: Optional[HTTPHeaderDict] = None
+) -> HTTPRequest:
+    return HTTPRequest(
+        method="GET",
+        url=url,
+        headers=HTTPHeaderDict() if headers is None else headers,
+        body=body,
+        stream_response=False,
+    )
+
+
+def idle_connections(engine: HTTPEngineStdlib) -> List[http.client.HTTPConnection]:
+    return [
+        connection
+        for connections in engine._idle_connections.values()  # pylint: disable=protected-access
+        for connection in connections
+    ]
+
+
+def test_keep_alive(local_url: str) -> None:
+    engine = HTTPEngineStdlib()
+    response = engine(create_request(f"{local_url}ok"))
+    assert isinstance(response, HTTPResponseStdlib)
+    assert isinstance(response.raw, http.client.HTTPResponse)
+    (connection,) = idle_connections(engine)
+
+    for _ in range(3):
+        assert engine(create_request(f"{local_url}ok")).data_bytes == b"ok"
+        assert idle_connections(engine) == [connection]
+
+    engine.close()
+    assert idle_connections(engine) == []
+    assert connection.sock is None
+
+
+def test_connection_close(local_url: str) -> None:
+    engine = HTTPEngineStdlib()
+    assert engine(create_request(f"{local_url}close")).data_bytes == b"ok"
+    assert idle_connections(engine) == []
+
+
+def test_stale_connection(local_url: str) -> None:
+    engine = HTTPEngineStdlib()
+    engine(create_request(f"{local_url}ok"))
+    (connection,) = idle_connections(engine)
+    # the connection is closed by the server while idle
+    connection.sock.shutdown(socket.SHUT_RDWR)
+
+    assert engine(create_request(f"{local_url}ok")).data_bytes == b"ok"
+    (new_connection,) = idle_connections(engine)
+    assert new_connection is not connection
+    assert connection.sock is None
+
+
+def test_stale_connection_not_idempotent(local_url: str) -> None:
+    engine = HTTPEngineStdlib()
+    engine(create_request(f"{local_url}ok"))
+    (connection,) = idle_connections(engine)
+    connection.sock.shutdown(socket.SHUT_RDWR)
+
+    # the request may have been processed by the server: it is not sent again
+    request = replace(create_request(f"{local_url}echo", b"data"), method="POST")
+    with pytest.raises(HTTPConnectionError):
+        engine(request)
+    assert idle_connections(engine) == []
+
+
+def test_body_iterator_new_connection(local_url: str) -> None:
+    def body() -> Iterator[bytes]:
+        yield b"data"
+
+    engine = HTTPEngineStdlib()
+    engine(create_request(f"{local_url}ok"))
+    (connection,) = idle_connections(engine)
+
+    # the body cannot be sent again if the idle connection is stale
+    assert engine(create_request(f"{local_url}echo", body())).status_code == 200
+    assert len(idle_connections(engine)) == 2
+    assert connection in idle_connections(engine)
+
+
+def test_max_idle_connections(local_url: str) -> None:
+    engine = HTTPEngineStdlib(max_idle_connections=0)
+    assert engine.max_idle_connections == 0
+    engine(create_request(f"{local_url}ok"))
+    assert idle_connections(engine) == []
+
+
+def test_after_fork(local_url: str) -> None:
+    engine = HTTPEngineStdlib()
+    engine(create_request(f"{local_url}ok"))
+    (connection,) = idle_connections(engine)
+
+    engine._after_fork()  # pylint: disable=protected-access
+    assert idle_connections(engine) == []
+    # not closed, as it is still used by the parent process
+    assert connection.sock is not None
+    assert engine(create_request(f"{local_url}ok")).data_bytes == b"ok"
+    (new_connection,) = idle_connections(engine)
+    assert new_connection is not connection
+    connection.close()
+
+
+def test_accept_encoding(local_url: str) -> None:
+    engine = HTTPEngineStdlib()
+    for headers, expected in (
+        (None, "gzip, deflate"),
+        (HTTPHeaderDict({"Accept-Encoding": "identity"}), "identity"),
+    ):
+        response = engine(create_request(f"{local_url}echo", headers=headers))
+        data: Any = response.data_json
+        assert data["headers"]["accept-encoding"] == expected
+
+
+def test_content_encoding_small_chunks(
+    local_url: str, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(model, "_DATA_CHUNK_SIZE", 1)
+    engine = HTTPEngineStdlib()
+    assert engine(create_request(f"{local_url}gzip")).data_bytes == b"hello world"
+
+
+def test_https(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[Tuple[Any, ...]] = []
+
+    def connect(connection: http.client.HTTPConnection) -> None:
+        calls.append(
+            (connection.host, connection.port, getattr(connection, "_context", None))
+        )
+        raise ConnectionRefusedError
+
+    monkeypatch.setattr(http.client.HTTPConnection, "connect", connect)
+    monkeypatch.setattr(http.client.HTTPSConnection, "connect", connect)
+
+    engine = HTTPEngineStdlib()
+    for url in (
+        "https://example.com",
+        "https://example.com:8443/foo",
+        "http://example.com",
+    ):
+        with pytest.raises(HTTPConnectionError):
+            engine(create_request(url))
+
+    assert [(host, port) for host, port, _ in calls] == [
+        ("example.com", 443),
+        ("example.com", 8443),
+        ("example.com", 80),
+    ]
+    assert isinstance(calls[0][2], ssl.SSLContext)
+    assert calls[0][2] is calls[1][2]
+    assert calls[2][2] is None
+
+    # shared context
+    ssl_context = ssl.create_default_context()
+    with pytest.raises(HTTPConnectionError):
+        HTTPEngineStdlib(ssl_context=ssl_context)(create_request("https://example.com"))
+    assert calls[3][2] is ssl_context
+
+
+def test_requests_not_imported() -> None:
+    code = "\n".join(
+        [
+            "import sys",
+            "from sdkite import Client",
+            "from sdkite.http import HTTPAdapterSpec",
+            "from sdkite.http.engine_stdlib import HTTPEngineStdlib",
+            "class Api(Client):",
+            "    _http = HTTPAdapterSpec('http://www.example.com/')",
+            "    _http.set_engine(HTTPEngineStdlib)",
+            "Api()._http.engine",
+            "assert 'requests' not in sys.modules",
+        ]
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
@@ -0,0 +1,73 @@
+import ssl
+
+import urllib3
+
+from sdkite.http import HTTPHeaderDict, HTTPRequest
+from sdkite.http.engine_urllib3 import HTTPEngineUrllib3, HTTPResponseUrllib3
+
+
+def test_urllib3_engine(local_url: str) -> None:
+    engine = HTTPEngineUrllib3(pool_maxsize=3, pool_block=True, max_retries=2)
+    assert engine.pool_manager.connection_pool_kw == {"maxsize": 3, "block": True}
+
+    response = engine(
+        HTTPRequest(
+            method="GET",
+            url=f"{local_url}echo",
+            headers=HTTPHeaderDict({"Accept-Encoding": "identity"}),
+            body=b"",
+            stream_response=False,
+        )
+    )
+    assert isinstance(response, HTTPResponseUrllib3)
+    assert isinstance(response.raw, urllib3.response.HTTPResponse)
+    data: dict = response.data_json  # type: ignore[type-arg, assignment]
+    assert data["headers"]["accept-encoding"] == "identity"
+
+
+def test_urllib3_engine_ssl_context() -> None:
+    ssl_context = ssl.create_default_context()
+    engine = HTTPEngineUrllib3(ssl_context=ssl_context)
+    assert engine.pool_manager.connection_pool_kw["ssl_context"] is ssl_context
+
+
+def test_urllib3_engine_warmup(local_url: str) -> None:
+    engine = HTTPEngineUrllib3(pool_maxsize=3)
+    pool = engine.pool_manager.connection_from_url(local_url)
+
+    engine.warmup(local_url, 2)
+    assert pool.num_connections == 2
+    # idle connections are reused, up to the size of the pool
+    engine.warmup(local_url, 5)
+    assert pool.num_connections == 3
+
+    request = HTTPRequest(
+        method="GET",
+        url=local_url,
+        headers=HTTPHeaderDict(),
+        body=b"",
+        stream_response=False,
+    )
+    assert engine(request).data_bytes == b"ok"
+    assert pool.num_connections == 3
+    assert pool.num_requests == 1
+
+    # connection errors are raised by the requests instead
+    engine.warmup("http://127.0.0.1:1/")
+
+
+def test_urllib3_engine_after_fork(local_url: str) -> None:
+    ssl_context = ssl.create_default_context()
+    engine = HTTPEngineUrllib3(pool_maxsize=3, ssl_context=ssl_context)
+    pool_manager = engine.pool_manager
+    engine.warmup(local_url)
+
+    engine._after_fork()  # pylint: disable=protected-access
+    assert engine.pool_manager is not pool_manager
+    assert not engine.pool_manager.pools
+    assert engine.pool_manager.connection_pool_kw == {
+        "maxsize": 3,
+        "block": False,
+        "ssl_context": ssl_context,
+    }
+    pool_manager.clear()
@@ -0,0 +1,415 @@
+import asyncio
+from dataclasses import replace
+from threading import Event, Thread, current_thread
+from typing import AsyncIterator, List
+
+import pytest
+
+from sdkite.http import (
+    HTTPAsyncResponse,
+    HTTPBulkhead,
+    HTTPConnectionError,
+    HTTPHeaderDict,
+    HTTPHedging,
+    HTTPHedgingStats,
+    HTTPRequest,
+    HTTPResponse,
+)
+from sdkite.http import hedging as hedging_module
+from tests.unit.http.helpers import (
+    TIMEOUT,
+    FakeEngine,
+    FakeResponse,
+    create_client,
+    create_request,
+)
+
+
+class FakeAsyncResponse(HTTPAsyncResponse):
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.closed = Event()
+
+    def _close(self) -> None:
+        self.closed.set()
+
+    raw = None
+    status_code = 200
+    reason = "OK"
+    headers = HTTPHeaderDict()
+
+    @property
+    def data_stream(self) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+
+    async def data_bytes(self) -> bytes:
+        raise NotImplementedError
+
+    async def data_str(self) -> str:
+        raise NotImplementedError
+
+    async def data_json(self) -> object:
+        raise NotImplementedError
+
+
+class HedgedEngine(FakeEngine):
+    # the first request waits until it is hedged (up to 'hedge_timeout' seconds), then
+    # each request waits for its 'release' event
+    def __init__(self, hedge_timeout: float = TIMEOUT) -> None:
+        super().__init__()
+        self.hedge_timeout = hedge_timeout
+        self.hedged = Event()
+        self.release_first = Event()
+        self.release_second = Event()
+        self.fail_first = self.fail_second = False
+        self.thread_names: List[str] = []
+
+    def __call__(self, request: HTTPRequest) -> HTTPResponse:
+        self.requests.append(request)
+        self.thread_names.append(current_thread().name)
+        response = FakeResponse(name=f"{request.method} #{len(self.responses)}")
+        self.responses.append(response)
+        if len(self.responses) == 1:
+            self.hedged.wait(self.hedge_timeout)
+            self.release_first.wait(TIMEOUT)
+            fail = self.fail_first
+        else:
+            self.hedged.set()
+            self.release_second.wait(TIMEOUT)
+            fail = self.fail_second
+        if fail:
+            raise HTTPConnectionError(msg=response.name, request=request)
+        return response
+
+
+def test_not_hedged() -> None:
+    hedging = HTTPHedging()
+    assert hedging.delay == 1
+    assert hedging.percentile is None
+    assert hedging.max_ratio == 0.1
+    assert hedging.methods == {"GET", "HEAD", "OPTIONS"}
+
+    engine = HedgedEngine(hedge_timeout=0)
+    engine.release_first.set()
+    response = hedging.send(engine, create_request())
+    assert response is engine.responses[0]
+    assert len(engine.responses) == 1
+    assert hedging.stats() == HTTPHedgingStats(requests=1, hedges=0, wins=0)
+
+
+def test_hedge_wins() -> None:
+    hedging = HTTPHedging(0)
+    engine = HedgedEngine()
+    engine.release_second.set()
+
+    request = create_request()
+    response = hedging.send(engine, request)
+    assert response is engine.responses[1]
+    assert hedging.stats() == HTTPHedgingStats(requests=1, hedges=1, wins=1)
+    assert all(name.startswith("sdkite-hedging") for name in engine.thread_names)
+    # the hedged request is a copy
+    assert engine.requests[0] is request
+    assert engine.requests[1] == request
+    assert engine.requests[1] is not request
+
+    # the losing response is closed when received
+    assert not engine.responses[0].closed.is_set()
+    engine.release_first.set()
+    assert engine.responses[0].closed.wait(TIMEOUT)
+
+
+def test_first_wins() -> None:
+    hedging = HTTPHedging(0)
+    engine = HedgedEngine()
+    engine.release_first.set()
+
+    response = hedging.send(engine, create_request())
+    assert response is engine.responses[0]
+    assert hedging.stats() == HTTPHedgingStats(requests=1, hedges=1, wins=0)
+
+    # the losing response is closed when received
+    engine.release_second.set()
+    assert engine.responses[1].closed.wait(TIMEOUT)
+
+
+def test_failures() -> None:
+    # the hedged request is used when the first one fails
+    hedging = HTTPHedging(0)
+    engine = HedgedEngine()
+    engine.fail_first = True
+    engine.release_first.set()
+    engine.release_second.set()
+    response = hedging.send(engine, create_request())
+    assert response is engine.responses[1]
+    assert hedging.stats() == HTTPHedgingStats(requests=1, hedges=1, wins=1)
+
+    # the exception of the first request is raised when both fail
+    hedging = HTTPHedging(0)
+    engine = HedgedEngine()
+    engine.fail_first = engine.fail_second = True
+    engine.release_first.set()
+    engine.release_second.set()
+    with pytest.raises(HTTPConnectionError, match="^GET #0$"):
+        hedging.send(engine, create_request())
+    assert hedging.stats() == HTTPHedgingStats(requests=1, hedges=1, wins=0)
+
+
+def test_max_ratio() -> None:
+    hedging = HTTPHedging(0, max_ratio=0.5)
+
+    for _ in range(5):
+        engine = HedgedEngine(hedge_timeout=0.05)
+        engine.release_first.set()
+        engine.release_second.set()
+        hedging.send(engine, create_request())
+    # every other request can be hedged
+    stats = hedging.stats()
+    assert stats.requests == 5
+    assert stats.hedges == 3
+
+
+@pytest.mark.parametrize("method", ["POST", "PUT", "PATCH", "DELETE"])
+def test_methods(method: str) -> None:
+    hedging = HTTPHedging(0)
+    engine = HedgedEngine(hedge_timeout=0)
+    engine.release_first.set()
+
+    response = hedging.send(engine, create_request(method=method))
+    assert response is engine.responses[0]
+    assert engine.thread_names == [current_thread().name]
+    assert hedging.stats().requests == 0
+
+    hedging = HTTPHedging(0, methods=["get", method.lower()])
+    assert hedging.methods == {"GET", method}
+    engine = HedgedEngine()
+    engine.release_first.set()
+    engine.release_second.set()
+    hedging.send(engine, create_request(method=method))
+    assert hedging.stats().hedges == 1
+
+
+def test_no_free_worker() -> None:
+    # the first request takes the only worker, so the second one is sent inline
+    hedging = HTTPHedging(0, max_workers=1)
+    engine = HedgedEngine(hedge_timeout=0)
+    started = Event()
+    responses: List[HTTPResponse] = []
+
+    def send_request(request: HTTPRequest) -> HTTPResponse:
+        started.set()
+        return engine(request)
+
+    def send_first() -> None:
+        responses.append(hedging.send(send_request, create_request()))
+
+    thread = Thread(target=send_first)
+    thread.start()
+    assert started.wait(TIMEOUT)
+    engine.release_second.set()
+    assert hedging.send(engine, create_request()) is engine.responses[1]
+    assert engine.thread_names[1] == current_thread().name
+
+    # the first request is not hedged either, since no worker is free
+    engine.release_first.set()
+    thread.join(TIMEOUT)
+    assert responses == [engine.responses[0]]
+    assert hedging.stats() == HTTPHedgingStats(requests=2, hedges=0, wins=0)
+
+
+def test_no_hedge_allowed() -> None:
+    # the request is sent from the calling thread when it cannot be hedged
+    hedging = HTTPHedging(0, max_ratio=0.5)
+    engine = HedgedEngine()
+    engine.release_second.set()
+    hedging.send(engine, create_request())
+    engine.release_first.set()
+    assert hedging.stats() == HTTPHedgingStats(requests=1, hedges=1, wins=1)
+
+    engine = HedgedEngine(hedge_timeout=0)
+    engine.release_first.set()
+    assert hedging.send(engine, create_request()) is engine.responses[0]
+    assert engine.thread_names == [current_thread().name]
+    assert hedging.stats() == HTTPHedgingStats(requests=2, hedges=1, wins=1)
+
+
+def test_iterator_body() -> None:
+    # a body given as an iterator cannot be sent twice
+    hedging = HTTPHedging(0)
+    engine = HedgedEngine(hedge_timeout=0)
+    engine.release_first.set()
+    request = replace(create_request(), body=iter([b"foo"]))
+    assert hedging.send(engine, request) is engine.responses[0]
+    assert engine.thread_names == [current_thread().name]
+    assert hedging.stats().requests == 0
+
+
+def test_percentile(monkeypatch: pytest.MonkeyPatch) -> None:
+    # requests take 1, 2, ..., 20 seconds
+    times = iter(value for index in range(1, 21) for value in (0, index))
+    monkeypatch.setattr(hedging_module, "monotonic", lambda: next(times))
+    hedging = HTTPHedging(60, percentile=90, window_size=20)
+
+    def send_request(_: HTTPRequest) -> HTTPResponse:
+        return FakeResponse(name="fast")
+
+    # the fixed delay is used until enough latencies are known
+    for _ in range(10):
+        assert hedging.current_delay() == 60
+        hedging.send(send_request, create_request())
+    assert hedging.current_delay() == 9
+    for _ in range(10):
+        hedging.send(send_request, create_request())
+    assert hedging.current_delay() == 18
+    assert hedging.stats() == HTTPHedgingStats(requests=20, hedges=0, wins=0)
+
+
+def test_after_fork() -> None:
+    # pylint: disable=protected-access
+    hedging = HTTPHedging(0)
+    engine = HedgedEngine()
+    engine.release_second.set()
+    hedging.send(engine, create_request())
+    engine.release_first.set()
+    executor = hedging._executor
+    assert executor is not None
+
+    # the threads of the executor do not exist in the child process
+    hedging._after_fork()
+    assert hedging._executor is None
+    assert hedging.stats() == HTTPHedgingStats(requests=1, hedges=1, wins=1)
+    executor.shutdown()
+
+
+def test_invalid() -> None:
+    with pytest.raises(ValueError, match="^Invalid delay: -1$"):
+        HTTPHedging(-1)
+    with pytest.raises(ValueError, match="^Invalid percentile: 0$"):
+        HTTPHedging(percentile=0)
+    with pytest.raises(ValueError, match="^Invalid percentile: 100$"):
+        HTTPHedging(percentile=100)
+    with pytest.raises(ValueError, match="^Invalid max ratio: 0$"):
+        HTTPHedging(max_ratio=0)
+
+
+class FakeAsyncEngine:
+    # the first request waits for 'release_first', which the second request sets if
+    # 'hedge_releases_first' is true
+    def __init__(self) -> None:
+        self.release_first = asyncio.Event()
+        self.hedge_releases_first = True
+        self.fail_first = self.fail_second = False
+        self.responses: List[FakeAsyncResponse] = []
+        self.cancelled: List[FakeAsyncResponse] = []
+
+    async def __call__(self, request: HTTPRequest) -> HTTPAsyncResponse:
+        response = FakeAsyncResponse(f"{request.method} #{len(self.responses)}")
+        self.responses.append(response)
+        if len(self.responses) == 1:
+            try:
+                await self.release_first.wait()
+            except asyncio.CancelledError:
+                self.cancelled.append(response)
+                raise
+            fail = self.fail_first
+        else:
+            if self.hedge_releases_first:
+                self.release_first.set()
+            fail = self.fail_second
+        if fail:
+            raise HTTPConnectionError(msg=response.name, request=request)
+        return response
+
+
+def test_asend() -> None:
+    async def main() -> None:
+        # not hedged: fast request
+        hedging = HTTPHedging(0)
+        engine = FakeAsyncEngine()
+        engine.release_first.set()
+        assert await hedging.asend(engine, create_request()) is engine.responses[0]
+        assert hedging.stats() == HTTPHedgingStats(requests=1, hedges=0, wins=0)
+
+        # not hedged because of the method or of the body
+        engine = FakeAsyncEngine()
+        engine.release_first.set()
+        response = await hedging.asend(engine, create_request(method="POST"))
+        assert response is engine.responses[0]
+        request = replace(create_request(), body=iter([b"foo"]))
+        assert await hedging.asend(engine, request) is engine.responses[1]
+        assert hedging.stats().requests == 1
+
+        # hedged, both responses received: the first one is used
+        hedging = HTTPHedging(0)
+        engine = FakeAsyncEngine()
+        assert await hedging.asend(engine, create_request()) is engine.responses[0]
+        assert engine.responses[1].closed.is_set()
+        assert hedging.stats() == HTTPHedgingStats(requests=1, hedges=1, wins=0)
+
+        # not hedged because of the budget
+        hedging = HTTPHedging(0, max_ratio=0.5)
+        await hedging.asend(FakeAsyncEngine(), create_request())
+        engine = FakeAsyncEngine()
+        engine.release_first.set()
+        assert await hedging.asend(engine, create_request()) is engine.responses[0]
+        assert hedging.stats() == HTTPHedgingStats(requests=2, hedges=1, wins=0)
+
+    asyncio.run(main())
+
+
+def test_asend_hedge_wins() -> None:
+    async def main() -> None:
+        # the first request is cancelled
+        hedging = HTTPHedging(0)
+        engine = FakeAsyncEngine()
+        engine.hedge_releases_first = False
+        assert await hedging.asend(engine, create_request()) is engine.responses[1]
+        await asyncio.sleep(0)
+        assert engine.cancelled == [engine.responses[0]]
+        assert hedging.stats() == HTTPHedgingStats(requests=1, hedges=1, wins=1)
+
+        # the first request failed
+        hedging = HTTPHedging(0)
+        engine = FakeAsyncEngine()
+        engine.fail_first = True
+        assert await hedging.asend(engine, create_request()) is engine.responses[1]
+        assert hedging.stats() == HTTPHedgingStats(requests=1, hedges=1, wins=1)
+
+        # both failed
+        hedging = HTTPHedging(0)
+        engine = FakeAsyncEngine()
+        engine.fail_first = engine.fail_second = True
+        with pytest.raises(HTTPConnectionError, match="^GET #0$"):
+            await hedging.asend(engine, create_request())
+        assert hedging.stats() == HTTPHedgingStats(requests=1, hedges=1, wins=0)
+
+    asyncio.run(main())
+
+
+def test_client() -> None:
+    engine = HedgedEngine()
+    engine.release_second.set()
+    async_engine = FakeAsyncEngine()
+    http = create_client(engine, async_engine, hedging=HTTPHedging(0, max_ratio=1)).http
+
+    response = http.get("foo")
+    engine.release_first.set()
+    assert response is engine.responses[1]
+    assert http.hedging.stats() == HTTPHedgingStats(requests=1, hedges=1, wins=1)
+
+    async def main() -> None:
+        response = await http.aget("foo")
+        assert response is async_engine.responses[0]
+
+    asyncio.run(main())
+    assert http.hedging.stats() == HTTPHedgingStats(requests=2, hedges=2, wins=1)
+
+
+def test_client_bulkhead() -> None:
+    # the hedged request takes its own slot of the bulkhead: none is left for it
+    engine = HedgedEngine(hedge_timeout=0.05)
+    engine.release_first.set()
+    http = create_client(engine, hedging=HTTPHedging(0), bulkhead=HTTPBulkhead(1)).http
+
+    assert http.get("foo") is engine.responses[0]
+    assert len(engine.responses) == 1
+    assert http.hedging.stats() == HTTPHedgingStats(requests=1, hedges=1, wins=0)
@@ -0,0 +1,138 @@
+import json
+import re
+import sys
+from typing import List
+
+import pytest
+
+from sdkite.http import _jsonstream
+from sdkite.http._jsonstream import iter_json_items
+
+if sys.version_info < (3, 9):  # pragma: no cover
+    from typing import Iterator, Sequence
+else:  # pragma: no cover
+    from collections.abc import Iterator, Sequence
+
+
+def split(data: bytes, size: int) -> Iterator[bytes]:
+    yield b""  # empty chunks are ignored
+    for i in range(0, len(data), size):
+        yield data[i : i + size]
+
+
+DOCUMENT = {
+    "count": 4,
+    "skipped": {"nested": ["]", "[", "}", "{", '"\\'], "deep": [[{"a": [1]}]]},
+    "data": {
+        "before": "x",
+        "items": [
+            {"id": 1, "name": 'with "quotes" and \\backslash\\'},
+            [1, 2.5, -3e10],
+            "str æ☃ \\u",
+            None,
+            True,
+            False,
+            42,
+            {},
+            [],
+        ],
+        "after": [1, 2, 3],
+    },
+}
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 1000])
+def test_iter_json_items(indent: int, size: int) -> None:
+    data = json.dumps(DOCUMENT, indent=indent).encode()
+    expected = DOCUMENT["data"]["items"]  # type: ignore[index]
+
+    assert list(iter_json_items(split(data, size), ["data", "items"])) == expected
+    assert list(iter_json_items(split(data, size), ["data", "after"])) == [1, 2, 3]
+
+    data = json.dumps(expected, indent=indent).encode()
+    assert list(iter_json_items(split(data, size), [])) == expected
+
+
+@pytest.mark.parametrize(
+    ["data", "path"],
+    [
+        pytest.param(b"[]", [], id="empty"),
+        pytest.param(b' \n[ \t] \r\n"trailing data is ignored', [], id="whitespaces"),
+        pytest.param(b'{"a": 1, "b": {"c": []}}', ["b", "c"], id="nested"),
+    ],
+)
+def test_iter_json_items_empty(data: bytes, path: Sequence[str]) -> None:
+    assert not list(iter_json_items(split(data, 1), path))
+
+
+def test_iter_json_items_lazy() -> None:
+    chunks: List[bytes] = []
+
+    def stream() -> Iterator[bytes]:
+        for chunk in (b"[1", b"2,", b"34", b"]"):
+            chunks.append(chunk)
+            yield chunk
+
+    items = iter_json_items(stream(), [])
+    assert next(items) == 12
+    assert chunks == [b"[1", b"2,"]
+    assert next(items) == 34
+    assert chunks == [b"[1", b"2,", b"34", b"]"]
+    assert next(items, None) is None
+
+
+def test_iter_json_items_bounded_memory(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(_jsonstream, "_COMPACT_THRESHOLD", 100)
+    reader = _jsonstream._Reader([])  # pylint: disable=protected-access
+    buffer_sizes: List[int] = []
+
+    def stream() -> Iterator[bytes]:
+        yield b"["
+        for i in range(1000):
+            buffer_sizes.append(len(reader._buf))  # pylint: disable=protected-access
+            yield b'{"key": "%d"},' % i
+        yield b"null]"
+
+    reader._chunks = stream()  # pylint: disable=protected-access
+    monkeypatch.setattr(_jsonstream, "_Reader", lambda _: reader)
+
+    items = list(iter_json_items([], []))
+    assert len(items) == 1001
+    assert max(buffer_sizes) < 250
+
+
+@pytest.mark.parametrize(
+    ["data", "path", "error_msg"],
+    [
+        pytest.param(b"", [], "Unexpected end of JSON data", id="empty"),
+        pytest.param(b"[1, 2", [], "Unexpected end of JSON data", id="truncated"),
+        pytest.param(b'["abc', [], "Unexpected end of JSON data", id="truncated-str"),
+        pytest.param(b'["\\', [], "Unexpected end of JSON data", id="truncated-esc"),
+        pytest.param(b"[[1]", [], "Unexpected end of JSON data", id="truncated-list"),
+        pytest.param(b"{}", [], "Expected '[' in JSON data, got '{'", id="not-list"),
+        pytest.param(b"[1 2]", [], "Expected ',' in JSON data, got '2'", id="no-comma"),
+        pytest.param(b"[1,]", [], "Expecting value", id="trailing-comma"),
+        pytest.param(b"[1]", ["a"], "Expected '{' in JSON data, got '['", id="no-obj"),
+        pytest.param(
+            b'{"a": 1}', ["b"], "Key 'b' not found in JSON data", id="missing-key"
+        ),
+        pytest.param(
+            b'{"a": {"b": []}}',
+            ["a", "c"],
+            "Key 'a.c' not found in JSON data",
+            id="missing-nested-key",
+        ),
+        pytest.param(
+            b"{1: []}", ["a"], "Expected object key in JSON data, got '1'", id="key"
+        ),
+        pytest.param(
+            b'{"a": 1 "b": []}', ["b"], "Expected ',' in JSON data, got '\"'", id="obj"
+        ),
+    ],
+)
+def test_iter_json_items_invalid(
+    data: bytes, path: Sequence[str], error_msg: str
+) -> None:
+    with pytest.raises(ValueError, match=re.escape(error_msg)):
+        list(iter_json_items(split(data, 1), path))
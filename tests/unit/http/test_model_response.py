@@ -1,4 +1,5 @@
 import sys
+from typing import List, Tuple
 
 import pytest
 
@@ -79,3 +80,46 @@ def test_response_context_manager(raise_exception: bool) -> None:
             assert not response.is_closed
 
     assert response.is_closed
+
+
+class StreamResponse(FakeResponse):  # pylint: disable=abstract-method
+    def __init__(self, *chunks: bytes) -> None:
+        super().__init__()
+        self.chunks = chunks
+
+    @property
+    def data_stream(self) -> Iterator[bytes]:
+        return iter(self.chunks)
+
+
+@pytest.mark.parametrize(
+    ["chunks", "expected"],
+    [
+        pytest.param((), [], id="empty"),
+        pytest.param((b"abc",), ["abc"], id="no-newline"),
+        pytest.param((b"abc\n",), ["abc"], id="final-newline"),
+        pytest.param((b"a\nb\n\nc",), ["a", "b", "", "c"], id="one-chunk"),
+        pytest.param((b"a", b"b\nc", b"d", b"", b"e\n"), ["ab", "cde"], id="chunks"),
+        pytest.param((b"a\r", b"\nb\r\n", b"c\r"), ["a", "b", "c"], id="crlf"),
+        pytest.param((b"\n", b"\n"), ["", ""], id="newlines"),
+        pytest.param(("æ☃".encode()[:3], "æ☃".encode()[3:]), ["æ☃"], id="utf-8"),
+    ],
+)
+def test_response_iter_lines(chunks: Tuple[bytes, ...], expected: List[str]) -> None:
+    assert list(StreamResponse(*chunks).iter_lines()) == expected
+
+
+def test_response_iter_lines_encoding() -> None:
+    response = StreamResponse("æ\n".encode("latin-1"))
+    assert list(response.iter_lines("latin-1")) == ["æ"]
+
+
+def test_response_iter_ndjson() -> None:
+    response = StreamResponse(b'{"a": 1}\n\n[2', b", 3]\r\n  \n", b'"4"')
+    assert list(response.iter_ndjson()) == [{"a": 1}, [2, 3], "4"]
+
+    response = StreamResponse(b'{"a": 1}\n{"a"\n')
+    items = response.iter_ndjson()
+    assert next(items) == {"a": 1}
+    with pytest.raises(ValueError, match="Expecting ':' delimiter"):
+        next(items)
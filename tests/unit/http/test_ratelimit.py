@@ -0,0 +1,230 @@
+import asyncio
+from typing import Dict
+
+import pytest
+
+from sdkite.http import HTTPRateLimiter, HTTPTimeoutError
+from sdkite.http import ratelimit as ratelimit_module
+from tests.unit.http.helpers import (
+    Clock,
+    FakeEngine,
+    FakeResponse,
+    create_client,
+    create_request,
+)
+
+
+@pytest.fixture(name="clock")
+def fixture_clock(clock: Clock, monkeypatch: pytest.MonkeyPatch) -> Clock:
+    monkeypatch.setattr(ratelimit_module, "time", lambda: 1_700_000_000.0)
+    monkeypatch.setattr(asyncio, "sleep", clock.async_sleep)
+    return clock
+
+
+def test_rate(clock: Clock) -> None:
+    limiter = HTTPRateLimiter(2)
+    assert limiter.rate == 2
+    assert limiter.burst == 1
+    assert not limiter.per_host
+    assert limiter.adapt
+
+    for _ in range(4):
+        limiter.acquire(create_request())
+    assert clock.sleeps == [0.5, 0.5, 0.5]
+
+    # unused capacity is not accumulated above the burst
+    clock.now += 10
+    clock.sleeps.clear()
+    for _ in range(3):
+        limiter.acquire(create_request())
+    assert clock.sleeps == [0.5, 0.5]
+
+
+def test_burst(clock: Clock) -> None:
+    limiter = HTTPRateLimiter(10, burst=3)
+
+    assert [limiter.reserve(create_request()) for _ in range(5)] == pytest.approx(
+        [0, 0, 0, 0.1, 0.2]
+    )
+    clock.now += 0.2
+    assert limiter.reserve(create_request()) == pytest.approx(0.1)
+    clock.now += 10
+    assert [limiter.reserve(create_request()) for _ in range(4)] == pytest.approx(
+        [0, 0, 0, 0.1]
+    )
+
+
+def test_per_host(clock: Clock) -> None:
+    for per_host, expected in ((False, [0, 1, 2]), (True, [0, 1, 0])):
+        limiter = HTTPRateLimiter(1, per_host=per_host)
+        assert [
+            limiter.reserve(create_request(url=url))
+            for url in (
+                "https://www.example.com/foo",
+                "https://www.example.com/bar",
+                "https://api.example.com/foo",
+            )
+        ] == expected
+    assert not clock.sleeps
+
+
+def test_aacquire(clock: Clock) -> None:
+    limiter = HTTPRateLimiter(4)
+
+    async def main() -> None:
+        for _ in range(3):
+            await limiter.aacquire(create_request())
+
+    asyncio.run(main())
+    assert clock.sleeps == [0.25, 0.25]
+
+
+def test_max_wait(clock: Clock) -> None:
+    limiter = HTTPRateLimiter(1)
+    assert limiter.acquire(create_request(), max_wait=0)
+    assert not limiter.acquire(create_request(), max_wait=0.5)
+    # nothing was reserved by the failed call
+    assert limiter.acquire(create_request(), max_wait=1)
+    assert not asyncio.run(limiter.aacquire(create_request(), max_wait=0.5))
+    assert asyncio.run(limiter.aacquire(create_request(), max_wait=1))
+    assert clock.sleeps == [1, 1]
+
+
+@pytest.mark.parametrize("prefix", ["RateLimit-", "X-RateLimit-"])
+def test_adapt_remaining(clock: Clock, prefix: str) -> None:
+    limiter = HTTPRateLimiter(10)
+    limiter.update(
+        create_request(),
+        FakeResponse(headers={f"{prefix}Remaining": "5", f"{prefix}Reset": "10"}),
+    )
+    # 5 requests in 10 seconds
+    assert [limiter.reserve(create_request()) for _ in range(3)] == [0, 2, 4]
+
+    # configured rate after the reset
+    clock.now += 20
+    assert [limiter.reserve(create_request()) for _ in range(3)] == pytest.approx(
+        [0, 0.1, 0.2]
+    )
+
+
+def test_adapt_higher_than_configured(clock: Clock) -> None:
+    limiter = HTTPRateLimiter(1)
+    limiter.update(
+        create_request(),
+        FakeResponse(headers={"RateLimit-Remaining": "100", "RateLimit-Reset": "10"}),
+    )
+    assert [limiter.reserve(create_request()) for _ in range(3)] == [0, 1, 2]
+    assert not clock.sleeps
+
+
+@pytest.mark.usefixtures("clock")
+@pytest.mark.parametrize("reset", ["30", "1700000030"], ids=["seconds", "timestamp"])
+def test_adapt_exhausted(reset: str) -> None:
+    limiter = HTTPRateLimiter(10, burst=5)
+    limiter.update(
+        create_request(),
+        FakeResponse(
+            headers={"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}
+        ),
+    )
+    assert limiter.reserve(create_request()) == pytest.approx(30)
+
+
+@pytest.mark.parametrize(
+    "headers",
+    [
+        pytest.param({}, id="none"),
+        pytest.param({"RateLimit-Remaining": "0"}, id="no-reset"),
+        pytest.param(
+            {"RateLimit-Remaining": "zero", "RateLimit-Reset": "10"}, id="invalid"
+        ),
+    ],
+)
+def test_adapt_ignored(clock: Clock, headers: Dict[str, str]) -> None:
+    limiter = HTTPRateLimiter(1)
+    limiter.update(create_request(), FakeResponse(headers=headers))
+    assert [limiter.reserve(create_request()) for _ in range(2)] == [0, 1]
+    assert not clock.sleeps
+
+
+def test_adapt_disabled(clock: Clock) -> None:
+    limiter = HTTPRateLimiter(1, adapt=False)
+    limiter.update(
+        create_request(),
+        FakeResponse(headers={"RateLimit-Remaining": "0", "RateLimit-Reset": "10"}),
+    )
+    assert [limiter.reserve(create_request()) for _ in range(2)] == [0, 1]
+    assert not clock.sleeps
+
+
+def test_after_fork() -> None:
+    # pylint: disable=protected-access
+    limiter = HTTPRateLimiter(1)
+    limiter._lock.acquire()  # pylint: disable=consider-using-with
+    # the lock may have been held by another thread of the parent process
+    limiter._after_fork()
+    assert limiter.reserve(create_request()) == 0
+
+
+def test_invalid() -> None:
+    with pytest.raises(ValueError, match="^Invalid rate: 0$"):
+        HTTPRateLimiter(0)
+    with pytest.raises(ValueError, match="^Invalid burst: 0$"):
+        HTTPRateLimiter(1, burst=0)
+
+
+def test_client(clock: Clock) -> None:
+    engine = FakeEngine()
+    limiter = HTTPRateLimiter(1)
+
+    engine.responses = [
+        FakeResponse(429, {"RateLimit-Remaining": "0", "RateLimit-Reset": "10"})
+    ]
+    create_client(engine, rate_limiter=limiter).http.get("foo")
+    # retries go through the limiter, which adapted to the headers
+    assert clock.sleeps == [10]
+
+    # shared with other clients, and inherited by children
+    client = create_client(engine, rate_limiter=limiter)
+    client.http.get("foo")
+    client.child.http.get("foo")
+    assert clock.sleeps == [10, 1, 1]
+    assert [request.url for request in engine.requests] == [
+        "https://www.example.com/foo",
+        "https://www.example.com/foo",
+        "https://www.example.com/foo",
+        "https://www.example.com/child/foo",
+    ]
+
+
+def test_client_async(clock: Clock) -> None:
+    client = create_client(FakeEngine(), rate_limiter=HTTPRateLimiter(1))
+
+    async def main() -> None:
+        for _ in range(2):
+            await client.http.aget("foo")
+
+    asyncio.run(main())
+    assert clock.sleeps == [1]
+
+
+def test_client_timeout_total(clock: Clock) -> None:
+    engine = FakeEngine()
+    engine.responses = [
+        FakeResponse(headers={"RateLimit-Remaining": "0", "RateLimit-Reset": "3"})
+    ]
+    client = create_client(engine, rate_limiter=HTTPRateLimiter(1))
+    client.http.get("foo")
+
+    # fails without waiting nor retrying if the wait exceeds the total timeout
+    message = r"^Total timeout of 0.5s would be exceeded by the rate limit$"
+    with pytest.raises(HTTPTimeoutError, match=message):
+        client.http.get("foo", timeout_total=0.5)
+    with pytest.raises(HTTPTimeoutError, match=message):
+        asyncio.run(client.http.aget("foo", timeout_total=0.5))
+    assert not clock.sleeps
+    assert len(engine.requests) == 1
+
+    # the failed calls did not delay the next ones
+    client.http.get("foo", timeout_total=5)
+    assert clock.sleeps == [3]
@@ -0,0 +1,124 @@
+import asyncio
+from typing import Any, List, Tuple
+
+import pytest
+
+from sdkite.http import HTTPRequestAttemptInfo, HTTPRetryBudget, HTTPStatusCodeError
+from tests.unit.http.helpers import Clock, FakeEngine, create_client
+
+
+def test_floor(clock: Clock) -> None:
+    budget = HTTPRetryBudget(0, min_retries_per_second=0.5)
+    assert budget.ratio == 0
+    assert budget.min_retries_per_second == 0.5
+    assert budget.ttl == 10
+
+    assert [budget.withdraw() for _ in range(6)] == [True] * 5 + [False]
+
+    # the retries are forgotten after the ttl
+    clock.now += 9.5
+    assert not budget.withdraw()
+    clock.now += 0.5
+    assert [budget.withdraw() for _ in range(6)] == [True] * 5 + [False]
+
+
+def test_ratio(clock: Clock) -> None:
+    budget = HTTPRetryBudget(0.25, min_retries_per_second=0, ttl=5)
+    assert not budget.withdraw()
+
+    for _ in range(8):
+        budget.deposit()
+    assert [budget.withdraw() for _ in range(3)] == [True, True, False]
+
+    # the requests are forgotten after the ttl
+    clock.now += 3
+    for _ in range(4):
+        budget.deposit()
+    assert budget.withdraw()
+    clock.now += 2
+    assert not budget.withdraw()
+
+
+def test_after_fork() -> None:
+    # pylint: disable=protected-access
+    budget = HTTPRetryBudget()
+    budget._lock.acquire()  # pylint: disable=consider-using-with
+    # the lock may have been held by another thread of the parent process
+    budget._after_fork()
+    assert budget.withdraw()
+
+
+def test_invalid() -> None:
+    with pytest.raises(ValueError, match="^Invalid ratio: -1$"):
+        HTTPRetryBudget(-1)
+    with pytest.raises(ValueError, match="^Invalid min retries per second: -1$"):
+        HTTPRetryBudget(min_retries_per_second=-1)
+    with pytest.raises(ValueError, match="^Invalid ttl: 0$"):
+        HTTPRetryBudget(ttl=0)
+
+
+def create_http(
+    engine: FakeEngine, budget: HTTPRetryBudget
+) -> Tuple[Any, List[Tuple[int, bool]]]:
+    attempts: List[Tuple[int, bool]] = []
+
+    def retry_callback(attempt_info: HTTPRequestAttemptInfo) -> None:
+        attempts.append(
+            (attempt_info.attempt_number, attempt_info.retry_budget_exhausted)
+        )
+
+    client = create_client(engine, retry_callback=retry_callback, retry_budget=budget)
+    return client.http, attempts
+
+
+@pytest.mark.usefixtures("clock")
+def test_client() -> None:
+    engine = FakeEngine(503)
+    # one retry for the two requests
+    budget = HTTPRetryBudget(0, min_retries_per_second=0.1)
+    http, attempts = create_http(engine, budget)
+
+    with pytest.raises(HTTPStatusCodeError):
+        http.get()
+    assert len(engine.requests) == 2
+    assert attempts == [(1, False), (2, True)]
+
+    with pytest.raises(HTTPStatusCodeError):
+        http.get()
+    assert len(engine.requests) == 3
+    assert attempts == [(1, False), (2, True), (1, True)]
+
+    # shared with other clients
+    http, attempts = create_http(engine, budget)
+    with pytest.raises(HTTPStatusCodeError):
+        http.get()
+    assert len(engine.requests) == 4
+    assert attempts == [(1, True)]
+
+
+@pytest.mark.usefixtures("clock")
+def test_client_async() -> None:
+    engine = FakeEngine(503)
+    # the requests allow one retry
+    budget = HTTPRetryBudget(0.5, min_retries_per_second=0)
+    http, attempts = create_http(engine, budget)
+
+    async def main() -> None:
+        with pytest.raises(HTTPStatusCodeError):
+            await http.aget()
+        assert len(engine.requests) == 2
+        assert attempts == [(1, False), (2, True)]
+
+    asyncio.run(main())
+
+
+@pytest.mark.usefixtures("clock")
+def test_client_not_exhausted() -> None:
+    engine = FakeEngine(503)
+    http, attempts = create_http(engine, HTTPRetryBudget())
+
+    with pytest.raises(HTTPStatusCodeError):
+        http.get()
+    # the last attempt is not retried because of the number of attempts
+    assert len(engine.requests) == 3
+    assert attempts == [(1, False), (2, False)]
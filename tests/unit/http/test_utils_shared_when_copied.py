@@ -0,0 +1,39 @@
+from copy import deepcopy
+
+import pytest
+
+from sdkite.http import (
+    HTTPBulkhead,
+    HTTPCircuitBreaker,
+    HTTPConcurrencyLimiter,
+    HTTPHedging,
+    HTTPRateLimiter,
+    HTTPRetryBudget,
+)
+from sdkite.http.utils import SharedWhenCopied
+
+
+@pytest.mark.parametrize(
+    "obj",
+    [
+        SharedWhenCopied(),
+        HTTPRateLimiter(1),
+        HTTPRetryBudget(),
+        HTTPCircuitBreaker(),
+        HTTPHedging(),
+        HTTPConcurrencyLimiter(),
+        HTTPBulkhead(),
+    ],
+    ids=[
+        "mixin",
+        "rate_limiter",
+        "retry_budget",
+        "circuit_breaker",
+        "hedging",
+        "concurrency_limiter",
+        "bulkhead",
+    ],
+)
+def test_shared_when_copied(obj: SharedWhenCopied) -> None:
+    assert deepcopy(obj) is obj
+    assert deepcopy({"obj": obj})["obj"] is obj
@@ -1,9 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
 import re
+from threading import Barrier, RLock
 from typing import TYPE_CHECKING, Any, List, Optional, Tuple, cast
 
 import pytest
 
 from sdkite import Adapter, AdapterSpec
+from sdkite import adapter as adapter_module
 
 if TYPE_CHECKING:
     from sdkite import Client
@@ -232,3 +235,38 @@ def test_client_various_adapters() -> None:
         ),
     ):
         client1.adp  # pylint: disable=pointless-statement  # noqa: B018
+
+
+class _BarrierLock:
+    # make all threads wait for each other before trying to get the lock
+    # so that they all see the adapter as not created yet
+    def __init__(self, nb_threads: int) -> None:
+        self.barrier = Barrier(nb_threads)
+        self.lock = RLock()
+
+    def __enter__(self) -> None:
+        self.barrier.wait()
+        self.lock.acquire()
+
+    def __exit__(self, *args: object) -> None:
+        self.lock.release()
+
+
+def test_adapter_spec_threads(monkeypatch: pytest.MonkeyPatch) -> None:
+    AdapterSimple.no_instance = True  # fails if several instances are created
+    nb_threads = 8
+    monkeypatch.setattr(adapter_module, "_adapter_creation", _BarrierLock(nb_threads))
+
+    client0 = ClientSimple0()
+    client1 = ClientSimple1()
+    client1._parent = client0  # pylint: disable=protected-access
+
+    with ThreadPoolExecutor(nb_threads) as executor:
+        futures = [
+            executor.submit(lambda client: client.adp, client)
+            for client in [client0, client1] * (nb_threads // 2)
+        ]
+    adapters = {id(future.result()) for future in futures}
+
+    assert adapters == {id(client0.adp)}
+    assert client1.adp is client0.adp
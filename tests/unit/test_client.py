@@ -1,6 +1,8 @@
+from typing import List, Tuple
+
 import pytest
 
-from sdkite import Client
+from sdkite import Adapter, AdapterSpec, Client
 
 
 class ClientA(Client):
@@ -80,3 +82,39 @@ def test_subclients_recursive() -> None:
 
     with pytest.raises(TypeError):
         ClientRec1()
+
+
+class WarmupAdapter(Adapter):
+    def __init__(self) -> None:
+        self.calls: List[Tuple[str, int]] = []
+
+    def warmup(self, connections: int = 1) -> None:
+        self.calls.append((self._attr_name, connections))
+
+
+class WarmupAdapterSpec(AdapterSpec[WarmupAdapter]):
+    def _create_adapter(self) -> WarmupAdapter:
+        return WarmupAdapter()
+
+
+class NoWarmupAdapterSpec(AdapterSpec[object]):
+    def _create_adapter(self) -> object:
+        return object()
+
+
+class WarmupClientA(Client):
+    adp = WarmupAdapterSpec()
+
+
+class WarmupClientB(Client):
+    adp = WarmupAdapterSpec()
+    other = NoWarmupAdapterSpec()
+    xyz: WarmupClientA
+    uvw: ClientA  # no adapter
+
+
+def test_warmup() -> None:
+    client = WarmupClientB()
+    client.warmup(3)
+    # the sub-clients share the same real adapter
+    assert client.adp.calls == [("adp", 3), ("adp", 3)]
@@ -0,0 +1,67 @@
+import subprocess
+import sys
+
+import pytest
+
+import sdkite
+import sdkite.http
+
+
+def test_unknown_attribute() -> None:
+    with pytest.raises(AttributeError, match="module 'sdkite' has no attribute 'foo'"):
+        sdkite.foo  # pylint: disable=pointless-statement # noqa: B018
+    with pytest.raises(
+        AttributeError, match="module 'sdkite.http' has no attribute 'foo'"
+    ):
+        sdkite.http.foo  # pylint: disable=pointless-statement # noqa: B018
+
+
+def test_lazy_names() -> None:
+    from sdkite.http import (  # pylint: disable=import-outside-toplevel
+        HTTPCircuitBreaker,
+        HTTPHedgingStats,
+    )
+    from sdkite.http.circuit import (  # pylint: disable=import-outside-toplevel
+        HTTPCircuitBreaker as CircuitBreaker,
+    )
+    from sdkite.http.hedging import (  # pylint: disable=import-outside-toplevel
+        HTTPHedgingStats as HedgingStats,
+    )
+
+    assert HTTPCircuitBreaker is CircuitBreaker
+    assert HTTPHedgingStats is HedgingStats
+    for name in sdkite.http.__all__:
+        getattr(sdkite.http, name)
+
+
+def test_lazy_imports() -> None:
+    code = "\n".join(
+        [
+            "import sys",
+            "from sdkite import Client",
+            "from sdkite.http import HTTPAdapterSpec",
+            "class Api(Client):",
+            "    _http = HTTPAdapterSpec('http://www.example.com/')",
+            "Api()",
+            "print(' '.join(sorted(sys.modules)))",
+        ]
+    )
+    modules = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout.split()
+    for module in (
+        "asyncio",
+        "concurrent.futures",
+        "json",
+        "requests",
+        "sdkite.http.circuit",
+        "sdkite.http.concurrency",
+        "sdkite.http.hedging",
+        "sdkite.http.ratelimit",
+        "sdkite.http.retrybudget",
+        "sdkite.pagination",
+        "secrets",
+        "tenacity",
+        "urllib3",
+    ):
+        assert module not in modules
@@ -1,3 +1,4 @@
+import asyncio
 from binascii import crc32
 from inspect import Parameter, signature
 import re
@@ -15,9 +16,9 @@ else:  # pragma: no cover
     from typing import Protocol
 
 if sys.version_info < (3, 9):  # pragma: no cover
-    from typing import Iterable, Iterator
+    from typing import AsyncIterator, Iterable, Iterator
 else:  # pragma: no cover
-    from collections.abc import Iterable, Iterator
+    from collections.abc import AsyncIterator, Iterable, Iterator
 
 if sys.version_info < (3, 11):  # pragma: no cover
     from typing_extensions import assert_type
@@ -542,9 +543,71 @@ def test_paginated_called_with_pagination_param() -> None:
 
 def test_paginated_no_type_hint() -> None:
     @paginated()
-    def fct(pagination):  # type: ignore[no-untyped-def,misc]  # noqa: ANN001,ANN202
+    def fct(pagination):  # type: ignore[no-untyped-def]  # noqa: ANN001,ANN202
         if pagination.page == 4:
             pagination.finish()
         return range(pagination.offset, pagination.offset + 10)
 
-    assert list(fct()) == list(range(50))
+    assert list(fct()) == list(range(50))  # type: ignore[no-untyped-call]
+
+
+def collect(iterator: AsyncIterator[Any]) -> List[Any]:
+    async def main() -> List[Any]:
+        return [item async for item in iterator]
+
+    return asyncio.run(main())
+
+
+def test_paginated_async_generator() -> None:
+    @paginated()
+    async def fct(pagination: Pagination, size: int) -> AsyncIterator[int]:
+        """Foobar"""
+        await asyncio.sleep(0)
+        for _ in range(size):
+            yield pagination.offset
+        if pagination.page == 3:
+            pagination.finish()
+
+    class ExpectedType(Protocol):
+        def __call__(self, size: int) -> AsyncIterator[int]:
+            ...
+
+    assert_type(fct, ExpectedType)
+
+    assert fct.__name__ == "fct", "name"
+    assert fct.__doc__ == "Foobar", "doc"
+    sig = signature(fct)
+    assert list(sig.parameters.values()) == [
+        Parameter("size", Parameter.POSITIONAL_OR_KEYWORD, annotation=int),
+    ], "signature parameters"
+    assert sig.return_annotation == AsyncIterator[Any], "signature return_annotation"
+    assert get_type_hints(fct) == {"size": int, "return": AsyncIterator[Any]}
+
+    assert collect(fct(3)) == list(range(12))
+
+
+@pytest.mark.parametrize("stop_when_empty", [True, False])
+def test_paginated_async_function(stop_when_empty: bool) -> None:
+    sizes = [3, 0, 2]
+
+    class Klass:
+        @paginated(stop_when_empty=stop_when_empty)
+        async def meth(self, pagination: Pagination) -> List[int]:
+            await asyncio.sleep(0)
+            start = pagination.offset
+            stop = start + sizes[pagination.page]
+            if pagination.page == len(sizes) - 1:
+                pagination.finish()
+            return list(range(start, stop))
+
+    class ExpectedType(Protocol):
+        def __call__(self) -> AsyncIterator[int]:
+            ...
+
+    instance = Klass()
+    assert_type(instance.meth, ExpectedType)
+
+    if stop_when_empty:
+        assert collect(instance.meth()) == [0, 1, 2]
+    else:
+        assert collect(instance.meth()) == [0, 1, 2, 3, 4]
@@ -0,0 +1,65 @@
+import gc
+from typing import List
+from weakref import WeakSet
+
+import pytest
+
+from sdkite import adapter as adapter_module
+from sdkite import utils
+from sdkite.utils import LockResetAfterFork, register_after_fork
+
+
+class ForkAware:
+    def __init__(self, calls: List["ForkAware"]) -> None:
+        self.calls = calls
+
+    def _after_fork(self) -> None:
+        self.calls.append(self)
+
+
+def test_after_fork(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(utils, "_fork_aware_objects", WeakSet())
+    calls: List[ForkAware] = []
+    obj = ForkAware(calls)
+    register_after_fork(obj)
+    # objects are not kept alive by the registration
+    register_after_fork(ForkAware(calls))
+    gc.collect()
+
+    utils._after_fork_in_child()  # pylint: disable=protected-access
+    assert calls == [obj]
+
+
+class Locked(LockResetAfterFork):
+    def __init__(self) -> None:
+        self._init_lock()
+
+
+class LockedReentrant(Locked):
+    _lock_reentrant = True
+
+
+def test_lock_reset_after_fork() -> None:
+    # pylint: disable=protected-access,consider-using-with
+    for obj in (Locked(), LockedReentrant()):
+        lock = obj._lock
+        assert lock.acquire(blocking=False)
+        assert lock.acquire(blocking=False) is obj._lock_reentrant
+
+        # held by another thread of the parent: a new lock is used in the child
+        obj._after_fork()
+        assert obj._lock.__class__ is lock.__class__
+        assert obj._lock.acquire(blocking=False)
+        obj._lock.release()
+        assert obj in utils._fork_aware_objects
+
+
+def test_adapter_creation_lock() -> None:
+    # pylint: disable=protected-access
+    assert adapter_module._adapter_creation in utils._fork_aware_objects
+    lock = adapter_module._adapter_creation._lock
+    adapter_module._adapter_creation._after_fork()
+    assert adapter_module._adapter_creation._lock is not lock
+    # reentrant: the adapters can be created by other ones
+    with adapter_module._adapter_creation, adapter_module._adapter_creation:
+        pass